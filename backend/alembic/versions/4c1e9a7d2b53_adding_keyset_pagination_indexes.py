@@ -0,0 +1,34 @@
+"""adding keyset pagination indexes on gifts and recipients
+
+Revision ID: 4c1e9a7d2b53
+Revises: d53d26fba49d
+Create Date: 2026-10-17 09:12:41.502318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e9a7d2b53'
+down_revision: Union[str, Sequence[str], None] = 'd53d26fba49d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_gifts_user_name_id', 'gifts', ['user_id', 'name', 'id'], unique=False)
+    op.create_index('idx_gifts_user_created_at_id', 'gifts', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('idx_recipients_user_name_id', 'recipients', ['user_id', 'name', 'id'], unique=False)
+    op.create_index('idx_recipients_user_created_at_id', 'recipients', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_recipients_user_created_at_id', table_name='recipients')
+    op.drop_index('idx_recipients_user_name_id', table_name='recipients')
+    op.drop_index('idx_gifts_user_created_at_id', table_name='gifts')
+    op.drop_index('idx_gifts_user_name_id', table_name='gifts')
@@ -0,0 +1,44 @@
+"""per-user composite indexes, partial index for the spent amount, dropping redundant indexes
+
+Revision ID: 7a2f5c8e1d94
+Revises: 4c1e9a7d2b53
+Create Date: 2026-10-17 11:03:27.918244
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2f5c8e1d94'
+down_revision: Union[str, Sequence[str], None] = '4c1e9a7d2b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_gifts_user_spent',
+        'gifts',
+        ['user_id'],
+        unique=False,
+        postgresql_include=['price', 'quantity'],
+        postgresql_where=sa.text("status <> 'idee' AND price IS NOT NULL"),
+    )
+    # Prefixes of the (user_id, sort key, id) indexes, or global indexes no query filters on alone
+    op.drop_index('idx_gifts_user', table_name='gifts')
+    op.drop_index('idx_gifts_status', table_name='gifts')
+    op.drop_index('idx_recipients_user', table_name='recipients')
+    op.drop_index('idx_recipients_name', table_name='recipients')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_recipients_name', 'recipients', ['name'], unique=False)
+    op.create_index('idx_recipients_user', 'recipients', ['user_id'], unique=False)
+    op.create_index('idx_gifts_status', 'gifts', ['status'], unique=False)
+    op.create_index('idx_gifts_user', 'gifts', ['user_id'], unique=False)
+    op.drop_index('idx_gifts_user_spent', table_name='gifts')
@@ -0,0 +1,40 @@
+"""adding denormalized spent column to users table
+
+Revision ID: b3e8d41f6a27
+Revises: 7a2f5c8e1d94
+Create Date: 2026-10-17 14:26:05.117390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d41f6a27'
+down_revision: Union[str, Sequence[str], None] = '7a2f5c8e1d94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('spent', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE users SET spent = totals.spent
+        FROM (
+            SELECT user_id, SUM(price * quantity) AS spent
+            FROM gifts
+            WHERE status <> 'idee' AND price IS NOT NULL
+            GROUP BY user_id
+        ) AS totals
+        WHERE users.id = totals.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'spent')
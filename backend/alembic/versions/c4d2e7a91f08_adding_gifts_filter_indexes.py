@@ -0,0 +1,35 @@
+"""adding indexes for the gifts list filters (status, price range)
+
+Revision ID: c4d2e7a91f08
+Revises: b3e8d41f6a27
+Create Date: 2026-10-17 15:02:41.208519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e7a91f08'
+down_revision: Union[str, Sequence[str], None] = 'b3e8d41f6a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_gifts_user_status_created_at_id',
+        'gifts',
+        ['user_id', 'status', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index('idx_gifts_user_price', 'gifts', ['user_id', 'price'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_gifts_user_price', table_name='gifts')
+    op.drop_index('idx_gifts_user_status_created_at_id', table_name='gifts')
@@ -0,0 +1,55 @@
+"""adding pg_trgm and the text search indexes on gifts and recipients
+
+Revision ID: d81f3b6c2a47
+Revises: c4d2e7a91f08
+Create Date: 2026-10-17 16:41:09.732805
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f3b6c2a47'
+down_revision: Union[str, Sequence[str], None] = 'c4d2e7a91f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = [
+    ('idx_gifts_name_trgm', 'gifts', 'name'),
+    ('idx_gifts_url_trgm', 'gifts', 'url'),
+    ('idx_recipients_name_trgm', 'recipients', 'name'),
+    ('idx_recipients_notes_trgm', 'recipients', 'notes'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+    op.create_index(
+        'idx_recipients_notes_fts',
+        'recipients',
+        [sa.text("to_tsvector('simple'::regconfig, coalesce(notes, ''))")],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_recipients_notes_fts', table_name='recipients')
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table)
+    # pg_trgm is left installed: other objects of the database may rely on it
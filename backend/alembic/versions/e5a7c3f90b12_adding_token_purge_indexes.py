@@ -0,0 +1,36 @@
+"""adding the indexes used by the token purge
+
+Revision ID: e5a7c3f90b12
+Revises: d81f3b6c2a47
+Create Date: 2026-10-17 18:02:44.118306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3f90b12'
+down_revision: Union[str, Sequence[str], None] = 'd81f3b6c2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at'], unique=False)
+    # Deleting a token checks the replaced_by_id foreign key of the other rows
+    op.create_index(
+        'idx_refresh_tokens_replaced_by_id', 'refresh_tokens', ['replaced_by_id'], unique=False,
+        postgresql_where=sa.text('replaced_by_id IS NOT NULL'),
+    )
+    op.create_index('idx_password_reset_tokens_expires_at', 'password_reset_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_password_reset_tokens_expires_at', table_name='password_reset_tokens')
+    op.drop_index('idx_refresh_tokens_replaced_by_id', table_name='refresh_tokens')
+    op.drop_index('idx_refresh_tokens_expires_at', table_name='refresh_tokens')
@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks, run by hand (not part of the test suite):
+    python -m benchmarks.<name>      (or: make benchmark name=<name>)
+They need the application settings (same environment as the API) but default to an in-memory SQLite
+database; set BENCHMARK_DATABASE_URL to measure against PostgreSQL.
+"""
@@ -0,0 +1,39 @@
+"""
+Argon2 cost per parameter set: latency of one hash and hashes per second per core.
+
+    python -m benchmarks.password_hashing [--rounds 5]
+
+Measures the current ARGON2_* settings, pwdlib's defaults (what PasswordHash.recommended() used)
+and the OWASP minimums, on this host. The per-core figure is derived from CPU time, so it also
+tells how many logins per second one PASSWORD_HASH_WORKERS process sustains.
+"""
+import argparse
+import os
+
+from src.commands.calibrate_argon2 import format_report, measure_argon2
+from src.config.settings import get_settings
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="hashes per parameter set (default: 5)")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    parameter_sets = {
+        "settings": (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST_KIB, settings.ARGON2_PARALLELISM),
+        "pwdlib default": (3, 65536, 4),
+        "OWASP t=2 19 MiB": (2, 19456, 1),
+        "OWASP t=1 46 MiB": (1, 47104, 1),
+    }
+    measures = [measure_argon2(*parameters, rounds=args.rounds) for parameters in parameter_sets.values()]
+
+    print(f"{os.cpu_count()} CPU(s) visible, {args.rounds} hashes per set (medians)\n")
+    report = format_report(measures).splitlines()
+    print(f"{'':<18} {report[0]}")
+    for name, line in zip(parameter_sets, report[1:]):
+        print(f"{name:<18} {line}")
+
+
+if __name__ == "__main__":
+    main()
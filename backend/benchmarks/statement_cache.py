@@ -0,0 +1,118 @@
+"""
+Per-call overhead of the hot repository reads: a select() built on every call (before)
+versus the module-level statements with bound parameters (after).
+
+    python -m benchmarks.statement_cache [--calls 5000]
+
+Two measures:
+- construct: building the statement and computing its compiled-cache key, no database involved.
+  This is the part the prebuilt statements remove (their cache key is memoized on the instance).
+- execute: the whole call through a Session, against BENCHMARK_DATABASE_URL (default: in-memory SQLite
+  seeded with one user, 50 gifts). On PostgreSQL, DATABASE_PREPARE_THRESHOLD also applies.
+"""
+import argparse
+import os
+import statistics
+import timeit
+import uuid
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.infrastructure.database.base import Base
+import src.infrastructure.database.models  # noqa
+from src.domains.auth.models import RefreshToken
+from src.domains.auth.repository import RefreshTokenRepository, _REFRESH_TOKEN_BY_FINGERPRINT
+from src.domains.gifts import repository as gifts
+from src.domains.gifts.models import Gift
+from src.domains.users.models import User
+
+REPEATS = 5
+
+
+def _seed(session: Session) -> tuple[uuid.UUID, uuid.UUID]:
+    user = User(email="bench@example.com", password_hash="hash", is_verified=True)
+    session.add(user)
+    session.flush()
+    session.add_all(Gift(user_id=user.id, name=f"Gift {n}", status="idee", quantity=1) for n in range(50))
+    session.add(RefreshToken(user_id=user.id, token_hash="hash", token_fingerprint="f" * 64, expires_at=func.now()))
+    session.commit()
+    gift_id = session.execute(select(Gift.id).limit(1)).scalar_one()
+    return user.id, gift_id
+
+
+def _per_call_us(fn, calls: int) -> float:
+    """Best-of-REPEATS mean duration of one call, in microseconds."""
+    return min(timeit.repeat(fn, number=calls, repeat=REPEATS)) / calls * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000, help="calls per measure (default: 5000)")
+    args = parser.parse_args(argv)
+
+    url = os.environ.get("BENCHMARK_DATABASE_URL", "sqlite://")
+    options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}} if url.startswith("sqlite") else {}
+    engine = create_engine(url, **options)
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    user_id, gift_id = _seed(session)
+    pagination = {"sort": "default", "page": 1, "limit": 10, "count": "none"}
+
+    # Before: the constructs the repositories used to build on each call
+    def fresh_by_id():
+        return select(Gift).where(Gift.user_id == user_id, Gift.id == gift_id).options(gifts.WITH_RECIPIENT_IDS)
+
+    def fresh_page():
+        return (
+            select(Gift).where(Gift.user_id == user_id)
+            .order_by(Gift.created_at.desc(), Gift.id.desc())
+            .offset(0).options(gifts.WITH_RECIPIENT_IDS).limit(11)
+        )
+
+    def fresh_fingerprint():
+        return select(RefreshToken).where(RefreshToken.token_fingerprint == "f" * 64)
+
+    gift_repo = gifts.GiftRepository(session)
+    token_repo = RefreshTokenRepository(session)
+    cases = [
+        (
+            "GiftRepository.get_by_id",
+            lambda: fresh_by_id()._generate_cache_key(),
+            lambda: gifts._BY_ID._generate_cache_key(),
+            lambda: session.execute(fresh_by_id()).scalar_one_or_none(),
+            lambda: gift_repo.get_by_id(user_id, gift_id),
+        ),
+        (
+            "GiftRepository.get (page)",
+            lambda: fresh_page()._generate_cache_key(),
+            lambda: gifts._PAGES["default", False]._generate_cache_key(),
+            lambda: session.execute(fresh_page()).scalars().all(),
+            lambda: gift_repo.get(pagination, user_id),
+        ),
+        (
+            "RefreshTokenRepository.get_by_fingerprint",
+            lambda: fresh_fingerprint()._generate_cache_key(),
+            lambda: _REFRESH_TOKEN_BY_FINGERPRINT._generate_cache_key(),
+            lambda: session.execute(fresh_fingerprint()).scalar_one_or_none(),
+            lambda: token_repo.get_by_fingerprint("f" * 64),
+        ),
+    ]
+
+    print(f"{engine.dialect.name}, {args.calls} calls x {REPEATS} repeats, best mean per call (µs)\n")
+    print(f"{'query':<42} {'construct before':>17} {'after':>8} {'execute before':>15} {'after':>8} {'saved':>7}")
+    savings = []
+    for name, construct_before, construct_after, execute_before, execute_after in cases:
+        results = [_per_call_us(fn, args.calls) for fn in (construct_before, construct_after, execute_before, execute_after)]
+        saved = 1 - results[3] / results[2]
+        savings.append(saved)
+        print(f"{name:<42} {results[0]:>17.1f} {results[1]:>8.1f} {results[2]:>15.1f} {results[3]:>8.1f} {saved:>7.0%}")
+    print(f"\nmedian execute saving: {statistics.median(savings):.0%}")
+
+    session.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
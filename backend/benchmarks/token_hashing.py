@@ -0,0 +1,87 @@
+"""
+Refresh throughput with the tokens hashed by Argon2 (before) versus HMAC-SHA256 (after).
+
+    python -m benchmarks.token_hashing [--refreshes 20]
+
+Two measures:
+- primitives: hashing one token and verifying it, what every refresh pays once each.
+- refresh: AuthService.rotate() end to end (token + user lookup, verify, new token, revoke, commit),
+  chaining the refreshes, against BENCHMARK_DATABASE_URL (default: in-memory SQLite).
+  "before" swaps the HMAC hash for pwdlib's recommended Argon2 hash, as the handlers used to.
+"""
+import argparse
+import os
+import time
+import uuid
+from unittest import mock
+
+from pwdlib import PasswordHash
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.infrastructure.database.base import Base
+import src.infrastructure.database.models  # noqa
+from src.domains.auth import service as auth_service
+from src.domains.auth.repository import RefreshTokenRepository, ResetPasswordRepository
+from src.domains.auth.token_hash_handler import hash_token, verify_token
+from src.domains.users.models import User
+from src.domains.users.repository import UserRepository
+
+argon2 = PasswordHash.recommended()
+
+
+def _per_call_ms(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e3
+
+
+def _refreshes_per_second(service: auth_service.AuthService, session: Session, user_id: uuid.UUID, refreshes: int) -> float:
+    raw_token = service._AuthService__create_refresh_token_for_user(user_id)
+    session.commit()
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        _, raw_token = service.rotate(raw_token)
+        session.commit()
+    return refreshes / (time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--refreshes", type=int, default=20, help="refreshes per measure (default: 20)")
+    args = parser.parse_args(argv)
+
+    url = os.environ.get("BENCHMARK_DATABASE_URL", "sqlite://")
+    options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}} if url.startswith("sqlite") else {}
+    engine = create_engine(url, **options)
+    Base.metadata.create_all(engine)
+    session = Session(engine, expire_on_commit=False)
+    user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password_hash="hash", is_verified=True)
+    session.add(user)
+    session.commit()
+    service = auth_service.AuthService(UserRepository(session), RefreshTokenRepository(session), ResetPasswordRepository(session))
+
+    token = uuid.uuid4().hex
+    argon2_hash, hmac_hash = argon2.hash(token), hash_token(token)
+    calls = max(args.refreshes, 10)
+    print(f"{engine.dialect.name}, {args.refreshes} chained refreshes\n")
+    print(f"{'':<22} {'before (Argon2)':>16} {'after (HMAC)':>14}")
+    print(f"{'hash (ms)':<22} {_per_call_ms(lambda: argon2.hash(token), calls):>16.3f} "
+          f"{_per_call_ms(lambda: hash_token(token), calls * 100):>14.4f}")
+    print(f"{'verify (ms)':<22} {_per_call_ms(lambda: verify_token(token, argon2_hash), calls):>16.3f} "
+          f"{_per_call_ms(lambda: verify_token(token, hmac_hash), calls * 100):>14.4f}")
+
+    with mock.patch.object(auth_service, "hash_token", argon2.hash):
+        before = _refreshes_per_second(service, session, user.id, args.refreshes)
+    after = _refreshes_per_second(service, session, user.id, args.refreshes)
+    print(f"{'refresh (per second)':<22} {before:>16.0f} {after:>14.0f}")
+    print(f"\nrefresh throughput: x{after / before:.0f}")
+
+    session.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+#!/bin/bash
+# Entrypoint of db-replica: clone the primary on first start, then run as a hot standby streaming from it.
+# To re-clone from scratch: docker compose ... down, then remove the postgres_replica_data_dev volume.
+set -euo pipefail
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    echo "Cloning the primary into $PGDATA"
+    # --write-recovery-conf: standby.signal + primary_conninfo, so the server starts as a streaming standby
+    PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup \
+        --host=db \
+        --username="$POSTGRES_USER" \
+        --pgdata="$PGDATA" \
+        --wal-method=stream \
+        --write-recovery-conf \
+        --checkpoint=fast
+    chmod 0700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on
@@ -0,0 +1,106 @@
+"""
+Measure Argon2 on this host and derive the parameters that fit a latency budget.
+
+    python -m src.commands.calibrate_argon2                       # 250 ms per hash
+    python -m src.commands.calibrate_argon2 --target-ms 400 --parallelism 1
+
+Run it in the production container (same CPU quota): the result depends on the host.
+For each memory cost (largest first), the time cost is raised while one hash stays within the target;
+the first memory cost that fits at least MIN_TIME_COST passes is kept (memory is what slows down GPU attacks).
+Prints every measured set and the ARGON2_* settings to put in the environment.
+Passwords hashed with the previous settings are rehashed at their next login.
+"""
+import argparse
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+# Memory costs tried, in MiB (OWASP's minimum is 19 MiB with t=2, 46 MiB with t=1)
+MEMORY_CANDIDATES_MIB = (256, 128, 64, 46, 19)
+MIN_TIME_COST = 2
+MAX_TIME_COST = 10
+SAMPLE_PASSWORD = "calibration-sample-password"
+
+
+@dataclass
+class Measure:
+    time_cost: int
+    memory_cost_kib: int
+    parallelism: int
+    latency_ms: float  # median wall time of one hash
+    cpu_ms: float  # median CPU time of one hash, all lanes included
+
+    @property
+    def hashes_per_second_per_core(self) -> float:
+        return 1000 / self.cpu_ms
+
+
+def measure_argon2(time_cost: int, memory_cost_kib: int, parallelism: int, rounds: int = 5) -> Measure:
+    """Hash SAMPLE_PASSWORD `rounds` times (after one warm-up hash) and keep the medians."""
+    hasher = Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost_kib, parallelism=parallelism)
+    hasher.hash(SAMPLE_PASSWORD)
+    walls, cpus = [], []
+    for _ in range(rounds):
+        wall, cpu = time.perf_counter(), time.process_time()
+        hasher.hash(SAMPLE_PASSWORD)
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+    return Measure(
+        time_cost=time_cost,
+        memory_cost_kib=memory_cost_kib,
+        parallelism=parallelism,
+        latency_ms=statistics.median(walls) * 1000,
+        cpu_ms=statistics.median(cpus) * 1000,
+    )
+
+
+def calibrate(target_ms: float, parallelism: int, rounds: int = 5) -> tuple[Measure | None, list[Measure]]:
+    """Return (chosen parameters or None if even the cheapest set is over the target, every measure)."""
+    measures = []
+    for memory_mib in MEMORY_CANDIDATES_MIB:
+        best = None
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            measure = measure_argon2(time_cost, memory_mib * 1024, parallelism, rounds)
+            measures.append(measure)
+            if measure.latency_ms > target_ms:
+                break
+            best = measure
+        if best is not None and best.time_cost >= MIN_TIME_COST:
+            return best, measures
+    return None, measures
+
+
+def format_report(measures: list[Measure]) -> str:
+    lines = [f"{'t':>3} {'memory':>9} {'p':>3} {'latency ms':>11} {'cpu ms':>8} {'hashes/s/core':>14}"]
+    for m in measures:
+        lines.append(
+            f"{m.time_cost:>3} {m.memory_cost_kib // 1024:>5} MiB {m.parallelism:>3} "
+            f"{m.latency_ms:>11.1f} {m.cpu_ms:>8.1f} {m.hashes_per_second_per_core:>14.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Derive Argon2 parameters for a latency budget on this host.")
+    parser.add_argument("--target-ms", type=float, default=250, help="latency budget of one hash (default: 250)")
+    parser.add_argument("--parallelism", type=int, default=1, help="Argon2 lanes (default: 1, one core per hash)")
+    parser.add_argument("--rounds", type=int, default=5, help="hashes measured per parameter set (default: 5)")
+    args = parser.parse_args(argv)
+
+    chosen, measures = calibrate(args.target_ms, args.parallelism, args.rounds)
+    print(format_report(measures))
+    if chosen is None:
+        print(f"\nNo parameter set hashes within {args.target_ms:g} ms with t >= {MIN_TIME_COST}: raise the target.")
+        return 1
+    print(f"\n{chosen.latency_ms:.0f} ms per hash, {chosen.hashes_per_second_per_core:.1f} hashes/s per core:")
+    print(f"ARGON2_TIME_COST={chosen.time_cost}")
+    print(f"ARGON2_MEMORY_COST_KIB={chosen.memory_cost_kib}")
+    print(f"ARGON2_PARALLELISM={chosen.parallelism}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
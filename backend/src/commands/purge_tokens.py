@@ -0,0 +1,97 @@
+"""
+Delete the expired and used auth tokens, in short batches.
+
+    python -m src.commands.purge_tokens                  # print the rows deleted per table
+    python -m src.commands.purge_tokens --batch-size 200
+
+- refresh_tokens: expired for TOKEN_PURGE_GRACE_HOURS. Revoked tokens are kept until then:
+  presenting one again is how a stolen token is detected.
+- password_reset_tokens: used, or expired for TOKEN_PURGE_GRACE_HOURS.
+- users.verification_token_*: cleared once expired for TOKEN_PURGE_GRACE_HOURS.
+
+Also run by the API every TOKEN_PURGE_INTERVAL_MINUTES when set (see purge_tokens_periodically).
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+import src.infrastructure.database.models  # noqa: F401  (registers every mapper)
+from src.config.database import SessionLocal
+from src.config.settings import get_settings
+from src.domains.auth.repository import RefreshTokenRepository, ResetPasswordRepository
+from src.domains.users.repository import UserRepository
+
+settings = get_settings()
+logger = logging.getLogger("api.maintenance")
+
+
+def purge_tokens(db: Session, batch_size: int | None = None, now: datetime | None = None) -> dict[str, int]:
+    """
+    Purge every table batch by batch, one transaction per batch so row locks stay short.
+    Returns the number of rows deleted (or cleared, for users) per table.
+    """
+    batch_size = batch_size or settings.TOKEN_PURGE_BATCH_SIZE
+    now = now or datetime.now(timezone.utc)
+    expired_before = now - timedelta(hours=settings.TOKEN_PURGE_GRACE_HOURS)
+
+    refresh_repo = RefreshTokenRepository(db)
+    reset_repo = ResetPasswordRepository(db)
+    user_repo = UserRepository(db)
+    batches = {
+        "refresh_tokens": lambda: refresh_repo.purge_batch(expired_before, batch_size),
+        "password_reset_tokens": lambda: reset_repo.purge_batch(expired_before, batch_size),
+        "verification_tokens": lambda: user_repo.clear_expired_verification_tokens(expired_before, batch_size),
+    }
+
+    report = {}
+    for table, purge_batch in batches.items():
+        total = 0
+        while True:
+            count = purge_batch()
+            db.commit()
+            total += count
+            if count < batch_size:
+                break
+        report[table] = total
+    return report
+
+
+def _purge_once() -> dict[str, int]:
+    with SessionLocal() as db:
+        return purge_tokens(db)
+
+
+async def purge_tokens_periodically(interval_seconds: float) -> None:
+    """Run the purge every `interval_seconds` until cancelled. A failed run is logged and retried next time."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            report = await run_in_threadpool(_purge_once)
+        except Exception:
+            logger.exception("Token purge failed")
+            continue
+        logger.info("Token purge done", extra={"extra_data": report})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Delete the expired auth tokens (revoked ones are kept until they expire, for reuse detection).")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.TOKEN_PURGE_BATCH_SIZE, help="rows deleted per transaction"
+    )
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        report = purge_tokens(db, batch_size=args.batch_size)
+
+    for table, count in report.items():
+        print(f"{table}: {count} deleted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Check the denormalized users.spent against the SUM over each user's gifts.
+
+    python -m src.commands.reconcile_spent          # report the drift, exit code 1 if any
+    python -m src.commands.reconcile_spent --fix    # also rewrite users.spent for the drifting users
+"""
+import argparse
+import sys
+import uuid
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+import src.infrastructure.database.models  # noqa: F401  (registers every mapper)
+from src.config.database import SessionLocal
+from src.domains.users.repository import UserRepository
+
+
+def reconcile_spent(db: Session, fix: bool = False) -> list[tuple[uuid.UUID, Decimal, Decimal]]:
+    """Return the drifting users as (user_id, stored, actual); with fix=True, correct them."""
+    repo = UserRepository(db)
+    drift = repo.get_spent_drift()
+    if drift and fix:
+        repo.reconcile_spent([user_id for user_id, _, _ in drift])
+        db.commit()
+    return drift
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check users.spent against the gifts it is derived from.")
+    parser.add_argument("--fix", action="store_true", help="rewrite users.spent for the users that drifted")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        drift = reconcile_spent(db, fix=args.fix)
+
+    for user_id, stored, actual in drift:
+        print(f"{user_id}: stored {stored}, actual {actual}")
+    if not drift:
+        print("users.spent is consistent")
+        return 0
+    print(f"{len(drift)} user(s) drifted" + (", fixed" if args.fix else ""))
+    return 0 if args.fix else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
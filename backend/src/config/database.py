@@ -2,11 +2,49 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.config.settings import get_settings
+from src.infrastructure.database.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
 # IMPORTANT: force ORM model registration
 import src.infrastructure.database.models  # noqa
 
 settings = get_settings()
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=settings.DEBUG)
-SessionLocal = sessionmaker(bind=engine, autoflush=False)
+REPLICA_DATABASE_URLS = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+ENGINE_OPTIONS = {
+    "echo": settings.DEBUG,
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    "connect_args": {
+        # None disables server-side prepared statements in psycopg
+        "prepare_threshold": settings.DATABASE_PREPARE_THRESHOLD if settings.DATABASE_PREPARE_THRESHOLD >= 0 else None,
+    },
+}
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=InstrumentedQueuePool, **ENGINE_OPTIONS)
+# One pool per replica, same options as the primary. Sessions are bound to one of them per request (see get_db).
+replica_engines = [
+    create_engine(url, poolclass=InstrumentedQueuePool, **ENGINE_OPTIONS) for url in REPLICA_DATABASE_URLS
+]
+# expire_on_commit=False: the request commits once at the end (see get_db), objects stay usable afterwards
+# without a SELECT per attribute.
+SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+# Async mode: same psycopg URL, SQLAlchemy picks the psycopg async dialect for create_async_engine.
+# Only built when enabled, so the sync path does not require greenlet.
+async_engine = None
+async_replica_engines = []
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL, poolclass=InstrumentedAsyncAdaptedQueuePool, **ENGINE_OPTIONS)
+    async_replica_engines = [
+        create_async_engine(url, poolclass=InstrumentedAsyncAdaptedQueuePool, **ENGINE_OPTIONS)
+        for url in REPLICA_DATABASE_URLS
+    ]
+    # expire_on_commit=False: attributes read after a commit must not trigger implicit IO.
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
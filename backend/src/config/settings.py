@@ -16,6 +16,25 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Run the ORM on an AsyncEngine (psycopg async) instead of the sync engine + threadpool.
+    DATABASE_ASYNC: bool = False
+    # Connection pool (applies to both the sync and the async engine)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    # Number of connections opened at startup (0 = no warm-up)
+    DATABASE_POOL_WARMUP_CONNECTIONS: int = 0
+    # psycopg: executions before a query is prepared server-side. -1 disables it (required behind PgBouncer in transaction mode)
+    DATABASE_PREPARE_THRESHOLD: int = 5
+    # Read replicas (comma-separated URLs, same driver as DATABASE_URL). Empty = everything goes to the primary.
+    # GET/HEAD/OPTIONS requests read from a replica, other methods use the primary.
+    DATABASE_REPLICA_URLS: str = ""
+    # Read-your-writes: after a write, the client's reads stay on the primary this long (replication lag budget)
+    DATABASE_READ_YOUR_WRITES_SECONDS: int = 5
+    # Expose live pool statistics on /internal/db-pool (and the access token cache counters on /internal/token-cache)
+    ENABLE_POOL_STATS: bool = False
 
     # Environment
     ENV: Literal["production", "development"] = 'production'
@@ -37,6 +56,9 @@ class Settings(BaseSettings):
     def OPENAPI_URL(self) -> str:
         return "/openapi.json" if self.ENABLE_DOCS else None
 
+    # Pagination: lifetime of totals served by the `cached` count strategy
+    PAGINATION_COUNT_CACHE_TTL_SECONDS: int = 60
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
@@ -46,7 +68,40 @@ class Settings(BaseSettings):
     # Security
     SECRET_KEY: str
     REFRESH_TOKEN_TTL_DAYS: int = 30
+    # A refresh token rotated less than this many seconds ago answers with its successor instead of
+    # counting as reuse (tabs refreshing at the same time). 0 = every second presentation is reuse.
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10
     ACCESS_TOKEN_LIFESPAN_IN_MINUTES: int = 15
+    # Verified access tokens cached per process, so repeated requests skip the JWT decode.
+    # An entry never outlives the token's exp. ACCESS_TOKEN_CACHE_ENABLED=false turns it off.
+    ACCESS_TOKEN_CACHE_ENABLED: bool = True
+    ACCESS_TOKEN_CACHE_TTL_SECONDS: int = 300
+    ACCESS_TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    # Authenticated user (id, email, name, budget, spent) cached per process, invalidated by the user writes
+    # of this process. Other workers may serve a stale budget / spent for up to the TTL. 0 = disabled.
+    USER_PRINCIPAL_CACHE_TTL_SECONDS: int = 10
+    USER_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+    # Argon2 parameters of the password hashes (defaults: argon2-cffi's). Calibrate them for the host with
+    # python -m src.commands.calibrate_argon2; passwords hashed with other values are rehashed at login.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Argon2 password hashing runs in this many worker processes, off the request threads (0 = inline)
+    PASSWORD_HASH_WORKERS: int = 2
+    # Password hashes / checks queued or running at once; further ones get a 503 (credential stuffing bursts)
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # HMAC keys of the refresh / reset / verification token hashes, "<id>:<secret>" comma-separated.
+    # The first key hashes, all of them verify (rotation: prepend the new key, drop the old one after
+    # REFRESH_TOKEN_TTL_DAYS). Empty = one key derived from SECRET_KEY.
+    TOKEN_HASH_KEYS: str = ""
+
+    # Token purge (python -m src.commands.purge_tokens, or in-process every TOKEN_PURGE_INTERVAL_MINUTES)
+    # Expired tokens are kept this long, so a late click on an email link still gets "expired" instead of "invalid"
+    TOKEN_PURGE_GRACE_HOURS: int = 24
+    # Rows deleted per transaction
+    TOKEN_PURGE_BATCH_SIZE: int = 1000
+    # 0 = no in-process purge (run the command from cron instead)
+    TOKEN_PURGE_INTERVAL_MINUTES: int = 0
 
     # Used to send emails via Mailjet
     PASSWORD_RESET_TOKEN_LIFESPAN_IN_MINUTES: int = 30
@@ -0,0 +1,93 @@
+import uuid
+from typing import Generic, Literal, TypeVar
+
+from fastapi import status
+from pydantic import BaseModel
+
+# - atomic:      every operation is applied or none is (default)
+# - best_effort: invalid operations are reported and skipped, the others are applied
+BatchMode = Literal["atomic", "best_effort"]
+BatchOp = Literal["create", "update", "delete"]
+
+MAX_BATCH_OPERATIONS = 200
+
+# Per-item status of an applied operation, mirroring the single-item endpoints.
+OP_SUCCESS_STATUS = {
+    "create": status.HTTP_201_CREATED,
+    "update": status.HTTP_200_OK,
+    "delete": status.HTTP_204_NO_CONTENT,
+}
+
+ItemT = TypeVar("ItemT")
+
+
+class BatchItemError(Exception):
+    """An operation of a batch that cannot be applied. Reported in its result instead of failing the request."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class BatchItemResult(BaseModel, Generic[ItemT]):
+    """Outcome of one operation, `index` being its position in the request."""
+    index: int
+    op: BatchOp
+    status: int
+    id: uuid.UUID | None = None
+    item: ItemT | None = None
+    error: str | None = None
+
+
+class BatchResponse(BaseModel, Generic[ItemT]):
+    """Per-item results. `committed` is false when an atomic batch was rolled back."""
+    mode: BatchMode
+    committed: bool
+    succeeded: int
+    failed: int
+    results: list[BatchItemResult[ItemT]]
+
+
+def batch_response(
+    mode: BatchMode,
+    operations: list,
+    errors: dict[int, BatchItemError],
+    ids: dict[int, uuid.UUID],
+    items: dict[uuid.UUID, object],
+) -> dict:
+    """
+    Assemble the response of a batch.
+    `errors` maps operation indexes to their failure, `ids` maps the applied operations to the row they touched
+    and `items` holds the serialized rows (created and updated ones).
+    An atomic batch with errors was not applied: its valid operations are reported as 424 Failed Dependency.
+    """
+    committed = not (errors and mode == "atomic")
+    results = []
+    for index, operation in enumerate(operations):
+        target = getattr(operation, "id", None)
+        if index in errors:
+            results.append({
+                "index": index, "op": operation.op, "status": errors[index].status_code, "id": target,
+                "error": errors[index].detail,
+            })
+        elif not committed:
+            results.append({
+                "index": index, "op": operation.op, "status": status.HTTP_424_FAILED_DEPENDENCY, "id": target,
+                "error": "Not applied: another operation of the batch failed",
+            })
+        else:
+            row_id = ids.get(index, target)
+            results.append({
+                "index": index, "op": operation.op, "status": OP_SUCCESS_STATUS[operation.op], "id": row_id,
+                "item": items.get(row_id),
+            })
+
+    failed = sum(1 for result in results if "error" in result)
+    return {
+        "mode": mode,
+        "committed": committed,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
@@ -0,0 +1,109 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.config.settings import get_settings
+from src.infrastructure.database.routing import is_replica_session
+
+settings = get_settings()
+
+# Key of Session.info: the count keys bumped by the transaction, bumped again once it commits
+_BUMPED_KEY = "bumped_count_keys"
+
+
+class CountCache:
+    """
+    Per-process cache of list totals, keyed by e.g. ("gifts", user_id).
+
+    Each key carries a version. The repositories bump it on every write that changes the total
+    (create/delete), through bump_count(). bump_count() bumps it again once the transaction commits.
+    A count is stored with the version read *before* it was computed.
+    So a count racing with a write is never served afterwards.
+    Versions come from one process-wide counter and live in the same bounded LRU as the totals.
+    A key evicted from it reads as the highest evicted version, so eviction never takes a version back.
+    Other workers only see the write once their entry expires: totals may lag by the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation = itertools.count(1)
+        self._evicted_version = 0
+        # key -> (version, total, expires_at); a bumped key keeps its version with no total (expires_at 0)
+        self._entries: OrderedDict[Hashable, tuple[int, int | None, float]] = OrderedDict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], int], store: bool = True) -> int:
+        """The cached total of `key`, or compute(). store=False serves the cache but never fills it."""
+        now = time.monotonic()
+        with self._lock:
+            version = self._version(key)
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        value = compute()
+
+        if store:
+            with self._lock:
+                if self._version(key) == version:
+                    self._put(key, (version, value, now + self.ttl_seconds))
+        return value
+
+    def bump(self, key: Hashable) -> None:
+        """Invalidate the cached total of `key` (call after a write that changes it)."""
+        with self._lock:
+            self._put(key, (next(self._generation), None, 0.0))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._evicted_version = next(self._generation)
+
+    def _version(self, key: Hashable) -> int:
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else self._evicted_version
+
+    def _put(self, key: Hashable, entry: tuple[int, int | None, float]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            _, (version, _, _) = self._entries.popitem(last=False)
+            self._evicted_version = max(self._evicted_version, version)
+
+
+count_cache = CountCache(ttl_seconds=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS)
+
+
+def cached_count(db: Session, key: Hashable, compute: Callable[[], int]) -> int:
+    """
+    The total of `key` from the count cache. A session bound to a replica may read a total that
+    lags behind the last write: it is served, never stored.
+    """
+    return count_cache.get_or_compute(key, compute, store=not is_replica_session(db))
+
+
+def bump_count(db: Session, key: Hashable) -> None:
+    """
+    Call on every write that changes the total of `key`. The cached total is dropped now, and again once the
+    transaction commits: a concurrent count between the flush and the commit still sees the old total.
+    """
+    db.info.setdefault(_BUMPED_KEY, set()).add(key)
+    count_cache.bump(key)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session: Session) -> None:
+    for key in session.info.pop(_BUMPED_KEY, ()):
+        count_cache.bump(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_BUMPED_KEY, None)
@@ -0,0 +1,19 @@
+import hashlib
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag of a response body: equal bodies, equal tags, whatever produced them."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Whether an If-None-Match header lets the server answer 304 Not Modified.
+    Uses the weak comparison RFC 9110 requires for If-None-Match (W/ prefixes are ignored).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from src.infrastructure.database.session import get_pool_status
+from src.domains.auth.access_token_cache import access_token_cache
+
+# Operational endpoints. Only mounted when explicitly enabled in settings (see main.py).
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/db-pool")
+def db_pool_stats() -> dict:
+    """Live connection pool statistics: checked out, overflow and checkout wait time histogram."""
+    return get_pool_status()
+
+
+@router.get("/token-cache")
+def token_cache_stats() -> dict:
+    """Access token cache of this worker: size, hits, misses and hit rate since startup."""
+    return access_token_cache.stats()
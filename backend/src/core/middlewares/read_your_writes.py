@@ -0,0 +1,32 @@
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from fastapi import Request, Response
+
+from src.config.settings import get_settings
+from src.infrastructure.database.routing import PRIMARY_UNTIL_COOKIE, SAFE_METHODS
+
+settings = get_settings()
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Only installed with read replicas. After a successful write, sets a short-lived cookie
+    that keeps the client's reads on the primary until the replicas have caught up,
+    so a client never reads a state older than its own last write.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response = await call_next(request)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            window = settings.DATABASE_READ_YOUR_WRITES_SECONDS
+            response.set_cookie(
+                key=PRIMARY_UNTIL_COOKIE,
+                value=f"{time.time() + window:.3f}",
+                max_age=window,
+                httponly=True,
+                secure=(settings.ENV == "production"),
+                samesite="strict",
+            )
+        return response
@@ -1,29 +1,193 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
 from typing import Annotated, Literal
+from uuid import UUID
 
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query, status
 from pydantic import BaseModel
+from sqlalchemy import Select, literal, tuple_
+
+# How offset pages get their total:
+# - exact:  separate COUNT query (default)
+# - none:   no total, fetch limit + 1 rows to derive hasNext
+# - window: count(*) OVER () on the page query itself, single round trip
+# - cached: COUNT cached per user, invalidated by the repositories on create/delete
+CountStrategy = Literal["exact", "none", "window", "cached"]
+
+# Keyset ordering for each `sort` value: (sort column, descending). `id` is always the tie-breaker,
+# so (sort column, id) is unique and rows can neither be skipped nor repeated between pages.
+KEYSET_ORDERINGS = {
+    "asc": ("name", False),
+    "desc": ("name", True),
+    "default": ("created_at", True),
+}
+
+
+def encode_cursor(sort: str, key, row_id: UUID, direction: Literal["next", "prev"]) -> str:
+    """Build an opaque cursor pointing right after (next) or right before (prev) the given row."""
+    payload = {
+        "s": sort,
+        "k": key.isoformat() if isinstance(key, datetime) else key,
+        "i": str(row_id),
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> dict:
+    """
+    Decode a cursor produced by encode_cursor().
+    An empty cursor starts a keyset scroll from the first row.
+    Raises 400 if the cursor is malformed or was issued for another sort order.
+    """
+    if cursor == "":
+        return {}
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        column, _ = KEYSET_ORDERINGS[sort]
+        decoded = {
+            "key": datetime.fromisoformat(payload["k"]) if column == "created_at" else str(payload["k"]),
+            "id": UUID(payload["i"]),
+            "direction": payload["d"],
+        }
+        if payload["s"] != sort or decoded["direction"] not in ("next", "prev"):
+            raise ValueError("cursor does not match the request")
+    except (ValueError, KeyError, TypeError, binascii.Error, json.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return decoded
 
 
 def pagination_parameters(
     sort: Literal["asc", "desc", "default"] = Query(default="default", description="Sort order by name"),
     page: int = Query(default=1, ge=1, description="Page number"),
     limit: int = Query(default=10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset pagination: send an empty value for the first page, then meta.nextCursor / meta.prevCursor. `page` is ignored.",
+    ),
+    count: CountStrategy = Query(
+        default="exact",
+        description="How the total is computed: exact, none (no total, infinite scroll), window (same query) or cached",
+    ),
 ):
     """
     Dependency for pagination parameters.
-    Returns dict with sort, page, and limit.
+    Returns dict with sort, page, limit, cursor (None in offset mode, decoded dict in keyset mode) and count strategy.
     """
-    return {"sort": sort, "page": page, "limit": limit}
+    return {
+        "sort": sort,
+        "page": page,
+        "limit": limit,
+        "cursor": decode_cursor(cursor, sort) if cursor is not None else None,
+        "count": count,
+    }
 
 
 PaginationDeps = Annotated[dict, Depends(pagination_parameters)]
 
 
 class PaginationMeta(BaseModel):
-    """Pagination metadata."""
+    """Pagination metadata. total/totalPages are null with the `none` count strategy."""
     page: int
     limit: int
-    total: int
-    totalPages: int
+    total: int | None
+    totalPages: int | None
     hasPrev: bool
     hasNext: bool
+
+
+def offset_page(items: list, total: int | None, pagination: dict) -> tuple[list, PaginationMeta]:
+    """
+    Build the meta of an offset page.
+    Without a total (`none` strategy) the repository fetched limit + 1 rows: the extra one gives hasNext.
+    """
+    page = pagination["page"]
+    limit = pagination["limit"]
+
+    if total is None:
+        has_next = len(items) > limit
+        return items[:limit], PaginationMeta(
+            page=page,
+            limit=limit,
+            total=None,
+            totalPages=None,
+            hasPrev=page > 1,
+            hasNext=has_next,
+        )
+
+    total_pages = math.ceil(total / limit) if total > 0 else 0
+    return items, PaginationMeta(
+        page=page,
+        limit=limit,
+        total=total,
+        totalPages=total_pages,
+        hasPrev=page > 1,
+        hasNext=page < total_pages,
+    )
+
+
+class CursorPaginationMeta(BaseModel):
+    """Keyset pagination metadata (no total: computing it would cost a count on every page)."""
+    limit: int
+    hasPrev: bool
+    hasNext: bool
+    prevCursor: str | None
+    nextCursor: str | None
+
+
+def apply_keyset(stmt: Select, model, pagination: dict) -> Select:
+    """
+    Add the keyset predicate, ordering and limit to a select on `model`.
+    Fetches limit + 1 rows: the extra row only tells whether another page exists.
+    """
+    column_name, descending = KEYSET_ORDERINGS[pagination["sort"]]
+    sort_column = getattr(model, column_name)
+    cursor = pagination["cursor"]
+
+    # Walking backward reads the reversed ordering; keyset_page() flips the rows back.
+    reverse = descending != (cursor.get("direction") == "prev")
+
+    if cursor:
+        position = tuple_(sort_column, model.id)
+        bound = tuple_(
+            literal(cursor["key"], type_=sort_column.type),
+            literal(cursor["id"], type_=model.id.type),
+        )
+        stmt = stmt.where(position < bound if reverse else position > bound)
+
+    if reverse:
+        stmt = stmt.order_by(sort_column.desc(), model.id.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), model.id.asc())
+    return stmt.limit(pagination["limit"] + 1)
+
+
+def keyset_page(rows: list, pagination: dict) -> tuple[list, CursorPaginationMeta]:
+    """Turn the rows fetched with apply_keyset() into the page items and its cursors."""
+    sort = pagination["sort"]
+    limit = pagination["limit"]
+    cursor = pagination["cursor"]
+    backward = cursor.get("direction") == "prev"
+    column_name, _ = KEYSET_ORDERINGS[sort]
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+
+    # Coming from a cursor means there are rows on the side we came from.
+    has_next = bool(rows) and (has_more if not backward else True)
+    has_prev = bool(rows) and (has_more if backward else bool(cursor))
+
+    meta = CursorPaginationMeta(
+        limit=limit,
+        hasPrev=has_prev,
+        hasNext=has_next,
+        prevCursor=encode_cursor(sort, getattr(rows[0], column_name), rows[0].id, "prev") if has_prev else None,
+        nextCursor=encode_cursor(sort, getattr(rows[-1], column_name), rows[-1].id, "next") if has_next else None,
+    )
+    return rows, meta
@@ -0,0 +1,115 @@
+import html
+import re
+
+from sqlalchemy import Float, case, cast, func, literal_column, or_
+from sqlalchemy.sql import ColumnElement
+
+# Text matching shared by /search and the `q` parameter of the list endpoints.
+# - postgresql: ILIKE '%q%' is served by the pg_trgm GIN indexes (gin_trgm_ops), long texts (recipient notes)
+#   also match word by word through a tsvector GIN index, and hits are ranked with word_similarity / ts_rank.
+# - other dialects (sqlite in tests): the same LIKE matching, ranked by the coarse CASE score only.
+
+SEARCH_MAX_LENGTH = 100
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# Regconfig and empty string are inlined, not bound: the expression has to be identical
+# to the one of the GIN index (see idx_recipients_notes_fts) for the planner to use it.
+_SIMPLE = literal_column("'simple'::regconfig")
+
+
+def like_pattern(q: str, prefix: bool = False) -> str:
+    """LIKE pattern matching q anywhere (or at the start), with %, _ and \\ taken literally."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
+def contains(column, q: str) -> ColumnElement[bool]:
+    return column.ilike(like_pattern(q), escape="\\")
+
+
+def fulltext_document(column) -> ColumnElement:
+    return func.to_tsvector(_SIMPLE, func.coalesce(column, literal_column("''")))
+
+
+def fulltext_query(q: str) -> ColumnElement:
+    return func.plainto_tsquery(_SIMPLE, q)
+
+
+def text_match(q: str, columns: list, fulltext_columns: list = (), dialect: str | None = None) -> ColumnElement[bool]:
+    """
+    True when q appears in one of `columns` or `fulltext_columns`.
+    On postgresql the fulltext columns also match when all the words of q appear, in any order.
+    """
+    clauses = [contains(column, q) for column in (*columns, *fulltext_columns)]
+    if dialect == "postgresql":
+        clauses += [fulltext_document(column).op("@@")(fulltext_query(q)) for column in fulltext_columns]
+    return or_(*clauses)
+
+
+def text_rank(
+    q: str,
+    name_column,
+    other_columns: list = (),
+    fulltext_columns: list = (),
+    dialect: str | None = None,
+) -> ColumnElement[float]:
+    """
+    Relevance of a hit, higher first: the name equal to q (3), starting with it (2), containing it (1),
+    then 0.5 when only another column matches. Postgresql adds trigram word similarity and ts_rank,
+    so hits within one tier are ordered by closeness.
+    """
+    lowered = func.lower(name_column)
+    tiers = [
+        (lowered == q.lower(), 3.0),
+        (lowered.like(like_pattern(q.lower(), prefix=True), escape="\\"), 2.0),
+        (contains(name_column, q), 1.0),
+    ]
+    others = [*other_columns, *fulltext_columns]
+    if others:
+        tiers.append((or_(*(contains(column, q) for column in others)), 0.5))
+    score = cast(case(*tiers, else_=0.0), Float)
+    if dialect == "postgresql":
+        score = score + func.word_similarity(q, name_column)
+        for column in other_columns:
+            score = score + 0.5 * func.word_similarity(q, func.coalesce(column, literal_column("''")))
+        for column in fulltext_columns:
+            score = score + func.ts_rank(fulltext_document(column), fulltext_query(q))
+    return score
+
+
+def highlight(text: str | None, q: str, context: int | None = None) -> str | None:
+    """
+    HTML-escaped `text` with every word of q wrapped in <mark>, or None if none appears.
+    With `context`, only a snippet of about that many characters around the first match is kept.
+    """
+    if not text:
+        return None
+    words = [re.escape(word) for word in q.split() if word]
+    if not words:
+        return None
+    pattern = re.compile("|".join(sorted(words, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        return None
+
+    start, end = 0, len(text)
+    if context is not None and len(text) > context:
+        start = max(0, first.start() - context // 2)
+        end = min(len(text), start + context)
+        start = max(0, end - context)
+
+    parts = []
+    position = start
+    for match in pattern.finditer(text, start, end):
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"{HIGHLIGHT_START}{html.escape(match.group())}{HIGHLIGHT_END}")
+        position = match.end()
+    parts.append(html.escape(text[position:end]))
+
+    snippet = "".join(parts)
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(text):
+        snippet = snippet + "…"
+    return snippet
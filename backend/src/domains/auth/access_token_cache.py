@@ -0,0 +1,89 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from src.config.settings import get_settings
+
+settings = get_settings()
+
+
+class AccessTokenCache:
+    """
+    Per-process LRU cache of verified access tokens: digest of the token -> user id.
+
+    SPA clients send the same token on every request until it expires, so the JWT decode
+    (signature check, claims, UUID parsing) only has to run once per token and process.
+    An entry lives ttl_seconds at most and never past the token's own `exp`; tokens without
+    `exp` and rejected tokens are not cached. The token itself is never stored, only its digest.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, tuple[uuid.UUID, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, token: str) -> uuid.UUID | None:
+        """The user id of an already verified, unexpired token, or None (decode it)."""
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user_id, expires_at = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return user_id
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def put(self, token: str, user_id: uuid.UUID, exp: int | float | None) -> None:
+        """Remember a token that was just verified; `exp` is its expiry claim (epoch seconds)."""
+        if not self.enabled or not isinstance(exp, (int, float)):
+            return
+        expires_at = min(time.time() + self.ttl_seconds, exp)
+        if expires_at <= time.time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+access_token_cache = AccessTokenCache(
+    ttl_seconds=settings.ACCESS_TOKEN_CACHE_TTL_SECONDS,
+    max_entries=settings.ACCESS_TOKEN_CACHE_MAX_ENTRIES,
+    enabled=settings.ACCESS_TOKEN_CACHE_ENABLED,
+)
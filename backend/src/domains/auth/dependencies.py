@@ -7,7 +7,8 @@ from fastapi.security import OAuth2PasswordBearer
 
 from src.config.settings import get_settings
 from src.domains.users.repository import UserRepository
-from src.domains.users.models import User
+from src.domains.users.principal_cache import UserPrincipal
+from .access_token_cache import access_token_cache
 
 settings = get_settings()
 
@@ -30,18 +31,23 @@ def _unauthorized() -> HTTPException:
 
 
 def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> uuid.UUID:
+    user_id = access_token_cache.get(token)
+    if user_id is not None:
+        return user_id
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         sub = payload.get("sub")
         if not sub:
             raise ValueError("Missing sub")
-        return uuid.UUID(sub)
+        user_id = uuid.UUID(sub)
     except Exception:
         raise _unauthorized()
+    access_token_cache.put(token, user_id, payload.get("exp"))
+    return user_id
 
 
-def get_current_user(user_id: Annotated[uuid.UUID, Depends(get_current_user_id)], user_repo: Annotated[UserRepository, Depends()]) -> User:
-    user = user_repo.get_by_id(user_id)
+def get_current_user(user_id: Annotated[uuid.UUID, Depends(get_current_user_id)], user_repo: Annotated[UserRepository, Depends()]) -> UserPrincipal:
+    user = user_repo.get_principal(user_id)
     if user is None:
         raise _unauthorized()
     return user
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -66,6 +66,13 @@ class RefreshToken(Base):
         uselist=False,
     )
 
+    __table_args__ = (
+        # Purge (RefreshTokenRepository.purge_batch): expired rows
+        Index("idx_refresh_tokens_expires_at", "expires_at"),
+        # Deleting a token checks the self-referencing FK: without this index, one scan of the table per deleted row
+        Index("idx_refresh_tokens_replaced_by_id", "replaced_by_id", postgresql_where=text("replaced_by_id IS NOT NULL")),
+    )
+
 
 
 class PasswordResetToken(Base):
@@ -96,4 +103,9 @@ class PasswordResetToken(Base):
 
     used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+    __table_args__ = (
+        # Purge (ResetPasswordRepository.purge_batch)
+        Index("idx_password_reset_tokens_expires_at", "expires_at"),
+    )
\ No newline at end of file
@@ -1,9 +1,150 @@
+"""
+Argon2 password hashing, run in a process pool.
+
+Argon2 is CPU-bound by design: run inline, each call holds a request thread and the GIL for tens of
+milliseconds, and a burst of login attempts stalls every other request. The hashes are computed by
+PASSWORD_HASH_WORKERS processes instead, the caller only waits for the result:
+- from a thread (sync mode through run_db, CLI, tests): blocking on the future, which releases the GIL;
+- from the greenlet of run_db() in async mode: the future is awaited, the event loop keeps serving.
+At most PASSWORD_HASH_MAX_PENDING operations are queued or running; past that, 503 with Retry-After.
+PASSWORD_HASH_WORKERS=0 hashes inline, in the calling thread.
+The pool lives as long as the process (concurrent.futures joins it at interpreter exit).
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException, status
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy.util.concurrency import await_only, in_greenlet
 
-password_hash = PasswordHash.recommended() #.recommended uses the latest recommended hashing algorithm.
+from src.config.settings import get_settings
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+settings = get_settings()
+
+# Parameters from Settings (python -m src.commands.calibrate_argon2 measures them for the host).
+# Hashes made with other parameters still verify, and are rehashed at the next login.
+password_hash = PasswordHash((
+    Argon2Hasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+))
+
+# Verified against when the email is unknown, so that answer takes as long as a wrong password
+DUMMY_PASSWORD = "dummy_password_for_timing_attack_prevention"
+
+_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_pending = 0
+_dummy_hash: str | None = None
+
+
+def _hash(password: str) -> str:
+    return password_hash.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return password_hash.verify(plain_password, hashed_password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return password_hash.verify_and_update(plain_password, hashed_password)
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    # spawn, not fork: forking a process that runs threads (event loop, connection pools) is unsafe
+    return ProcessPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _submit(fn, *args) -> Future:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = _new_pool()
+        pool = _pool
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        # A worker died (killed by the OOM killer, ...): replace the pool once
+        with _lock:
+            if _pool is pool:
+                _pool = _new_pool()
+            pool = _pool
+        return pool.submit(fn, *args)
+
+
+def _release(_future: Future) -> None:
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+def _run(fn, *args):
+    global _pending
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+
+    with _lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password checks in progress, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    try:
+        future = _submit(fn, *args)
+    except BaseException:
+        _release(None)
+        raise
+    future.add_done_callback(_release)
+
+    if in_greenlet():
+        return await_only(asyncio.wrap_future(future))
+    return future.result()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _run(_verify, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """(valid, new hash) where the new hash is set when the stored one uses other Argon2 parameters."""
+    return _run(_verify_and_update, plain_password, hashed_password)
 		
 def get_password_hash(password: str) -> str:
-    return password_hash.hash(password)
\ No newline at end of file
+    return _run(_hash, password)
+
+
+def get_dummy_password_hash() -> str:
+    """Hash of DUMMY_PASSWORD, computed once (at startup by warm_up_password_hasher)."""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = get_password_hash(DUMMY_PASSWORD)
+    return _dummy_hash
+
+
+def warm_up_password_hasher() -> None:
+    """
+    Start every worker process and compute the dummy hash, so the first logins don't pay for either.
+    Does nothing once done (the app lifespan can run several times in one process, e.g. in tests).
+    """
+    global _dummy_hash
+    if _dummy_hash is not None:
+        return
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        get_dummy_password_hash()
+        return
+    # Each submission that finds no idle worker starts one
+    futures = [_submit(_hash, DUMMY_PASSWORD) for _ in range(settings.PASSWORD_HASH_WORKERS)]
+    _dummy_hash = futures[0].result()
+    for future in futures[1:]:
+        future.result()
+
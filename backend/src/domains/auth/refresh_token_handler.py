@@ -1,15 +1,17 @@
 import hashlib
 
-from pwdlib import PasswordHash
+from . import token_hash_handler
 
 
-refresh_token_hasher = PasswordHash.recommended() #.recommended uses the latest recommended hashing algorithm.
-		
 def hash_token(raw_token: str) -> str:
-    return refresh_token_hasher.hash(raw_token)
+    return token_hash_handler.hash_token(raw_token)
 
 def verify_refresh_token(raw_token: str, token_hash: str) -> bool:
-    return refresh_token_hasher.verify(raw_token, token_hash)
+    return token_hash_handler.verify_token(raw_token, token_hash)
+
+def derive_successor_token(raw_token: str) -> str:
+    """The token that replaces raw_token at rotation: the same for every refresh presenting raw_token."""
+    return token_hash_handler.derive_token(raw_token, "refresh-successor")
 
 def get_refresh_token_fingerprint(raw_token: str) -> str:
-    return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
\ No newline at end of file
+    return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
@@ -1,58 +1,161 @@
-from typing import Annotated
 from datetime import datetime, timezone
 import uuid
 
-from fastapi import Depends
-from sqlalchemy import select, update, delete
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, or_, select, update, delete, insert
 
-from src.infrastructure.database.session import get_db
+from src.infrastructure.database.session import DbSession
+from src.domains.users.models import User
+from src.domains.users.principal_cache import UserPrincipal
 from .models import RefreshToken, PasswordResetToken
 
+# Fingerprint lookups run on every refresh / reset: built once, only the fingerprint is bound per call
+_REFRESH_TOKEN_BY_FINGERPRINT = select(RefreshToken).where(RefreshToken.token_fingerprint == bindparam("fingerprint"))
+# The refresh endpoint needs the token and the user it answers with: one joined read,
+# locking the token row only (FOR UPDATE OF refresh_tokens) so concurrent rotations of it queue up
+_REFRESH_TOKEN_WITH_USER_BY_FINGERPRINT_FOR_UPDATE = (
+    select(RefreshToken, User.id, User.email, User.name, User.budget, User.spent, User.is_verified)
+    .join(User, User.id == RefreshToken.user_id)
+    .where(RefreshToken.token_fingerprint == bindparam("fingerprint"))
+    .with_for_update(of=RefreshToken)
+)
+_RESET_TOKEN_BY_FINGERPRINT = select(PasswordResetToken).where(
+    PasswordResetToken.token_fingerprint == bindparam("fingerprint")
+)
+
 
 class RefreshTokenRepository:
-    def __init__(self, db: Annotated[Session, Depends(get_db)]):
+    def __init__(self, db: DbSession):
         self.db = db
 
     def create(self, token: RefreshToken) -> RefreshToken:
         self.db.add(token)
-        self.db.commit()
-        self.db.refresh(token)
+        self.db.flush()
         return token
 
     def get_by_fingerprint(self, fingerprint: str) -> RefreshToken | None:
-        stmt = select(RefreshToken).where(RefreshToken.token_fingerprint == fingerprint)
-        return self.db.execute(stmt).scalar_one_or_none()
+        return self.db.execute(_REFRESH_TOKEN_BY_FINGERPRINT, {"fingerprint": fingerprint}).scalar_one_or_none()
     
+    def lock_with_principal_by_fingerprint(self, fingerprint: str) -> tuple[RefreshToken, UserPrincipal] | None:
+        """
+        The token and its user (as UserPrincipal) in a single statement, the token row locked until commit.
+        A concurrent call for the same token waits, then reads the token as the first transaction left it.
+        populate_existing: the row is re-read after the wait, not taken from the identity map.
+        """
+        row = self.db.execute(
+            _REFRESH_TOKEN_WITH_USER_BY_FINGERPRINT_FOR_UPDATE,
+            {"fingerprint": fingerprint},
+            execution_options={"populate_existing": True},
+        ).one_or_none()
+        if row is None:
+            return None
+        token, *user_columns = row
+        return token, UserPrincipal(*user_columns)
+
+    def insert(self, user_id: uuid.UUID, fingerprint: str, token_hash: str, expires_at: datetime) -> uuid.UUID:
+        """INSERT ... RETURNING id, without going through the session's unit of work."""
+        stmt = (
+            insert(RefreshToken)
+            .values(user_id=user_id, token_fingerprint=fingerprint, token_hash=token_hash, expires_at=expires_at)
+            .returning(RefreshToken.id)
+        )
+        return self.db.execute(stmt).scalar_one()
+
+    def revoke_if_active(self, token_id: uuid.UUID, *, replaced_by_id: uuid.UUID) -> uuid.UUID | None:
+        """
+        Revoke the token unless it already is, and return its user_id.
+        Returns None when another request revoked it first (a safety net: rotations lock the row beforehand).
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc), replaced_by_id=replaced_by_id)
+            .returning(RefreshToken.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
     def revoke(self, token_id, *, replaced_by_id=None) -> None:
         now = datetime.now(timezone.utc)
         stmt = update(RefreshToken).where(RefreshToken.id == token_id).values(revoked_at=now, replaced_by_id=replaced_by_id)
         self.db.execute(stmt)
-        self.db.commit()
     
     def delete_all_tokens_for_user(self, user_id: uuid.UUID) -> None:
         stmt = delete(RefreshToken).where(RefreshToken.user_id == user_id)
         self.db.execute(stmt)
+
+    def purge_batch(self, expired_before: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` tokens that expired before `expired_before`.
+        Revoked tokens are kept until they expire: presenting one again is how a stolen token is detected,
+        and that works for as long as the token would otherwise have been valid.
+        Rows locked by a concurrent refresh are skipped (next batch or run).
+        Tokens whose replaced_by_id points into the batch are unlinked first, so a rotation chain can be
+        deleted across batches in any order without breaking the self-referencing foreign key;
+        they stay revoked, so reuse detection still applies to them.
+        Returns the number of rows deleted.
+        """
+        ids = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < expired_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        batch = list(self.db.execute(ids).scalars().all())
+        if not batch:
+            return 0
+        self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.replaced_by_id.in_(batch))
+            .values(replaced_by_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = self.db.execute(
+            delete(RefreshToken).where(RefreshToken.id.in_(batch)).execution_options(synchronize_session=False)
+        )
+        return deleted.rowcount
+
+    def commit(self) -> None:
+        """
+        Commit right away instead of at the end of the request.
+        Only for writes that must survive the error response that follows them (the request would roll back).
+        """
         self.db.commit()
 
 
 class ResetPasswordRepository:
-    def __init__(self, db: Annotated[Session, Depends(get_db)]):
+    def __init__(self, db: DbSession):
         self.db = db
 
     def get_by_fingerprint(self, token_fingerprint: str) -> PasswordResetToken | None:
-        stmt = select(PasswordResetToken).where(PasswordResetToken.token_fingerprint == token_fingerprint)
-        password_reset_token = self.db.execute(stmt).scalar_one_or_none()
-        return password_reset_token
+        return self.db.execute(_RESET_TOKEN_BY_FINGERPRINT, {"fingerprint": token_fingerprint}).scalar_one_or_none()
 
     def create(self, password_reset_token: PasswordResetToken) -> PasswordResetToken:
         self.db.add(password_reset_token)
-        self.db.commit()
-        self.db.refresh(password_reset_token)
+        self.db.flush()
         return password_reset_token
     
     def mark_used(self, token_id: uuid.UUID) -> None:
         now = datetime.now(timezone.utc)
         stmt = update(PasswordResetToken).where(PasswordResetToken.id == token_id).values(used_at=now)
         self.db.execute(stmt)
-        self.db.commit()
+
+    def purge_batch(self, expired_before: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` tokens that are used or expired before `expired_before`.
+        Returns the number of rows deleted.
+        """
+        ids = (
+            select(PasswordResetToken.id)
+            .where(or_(PasswordResetToken.used_at.is_not(None), PasswordResetToken.expires_at < expired_before))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        batch = list(self.db.execute(ids).scalars().all())
+        if not batch:
+            return 0
+        deleted = self.db.execute(
+            delete(PasswordResetToken)
+            .where(PasswordResetToken.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return deleted.rowcount
@@ -6,6 +6,7 @@ from pydantic import EmailStr
 
 from src.config.settings import get_settings
 from src.core.rate_limit import limiter
+from src.infrastructure.database.session import run_db
 from .service import AuthService
 from .schemas import LoginData, UserCreate, UserUpdatePartial, ForgotPasswordRequest
 from .router_examples import REGISTER_EXAMPLES, RESET_PASSWORD_EXAMPLE
@@ -19,13 +20,13 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 @limiter.limit("3/minute")
-def signup_user(
+async def signup_user(
   request: Request, 
   service: Annotated[AuthService, Depends()], 
   user_create: Annotated[UserCreate, Body(openapi_examples=REGISTER_EXAMPLES)],
   background_tasks: BackgroundTasks
 ):
-    email_job = service.register_user(user_create, getattr(user_create, 'locale', None))
+    email_job = await run_db(service.register_user, user_create, getattr(user_create, 'locale', None))
     
     if email_job:
         mailjet_client = MailJetClient(settings.MAILJET_API_KEY, settings.MAILJET_API_SECRET_KEY)
@@ -49,11 +50,11 @@ def signup_user(
 
 @router.post("/login", response_model=LoginData)
 @limiter.limit("5/minute")
-def login(request: Request, response: Response, auth_service: Annotated[AuthService, Depends()], form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+async def login(request: Request, response: Response, auth_service: Annotated[AuthService, Depends()], form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
     email = form_data.username # clarification because OAuth2PasswordRequestForm requires 'username'
     password = form_data.password
 
-    access_token, refresh_token_raw, expires_in, user = auth_service.login(email, password)
+    access_token, refresh_token_raw, expires_in, user = await run_db(auth_service.login, email, password)
 
     # Cookie refresh token (HttpOnly)
     response.set_cookie(
@@ -66,19 +67,19 @@ def login(request: Request, response: Response, auth_service: Annotated[AuthServ
         max_age=settings.REFRESH_TOKEN_TTL_DAYS * 86400,
     )
 
-    user_response = auth_service._build_user_response(user.id)
+    user_response = auth_service._build_user_response(user)
     return LoginData(access_token=access_token, expires_in=expires_in, user=user_response)
 
 
 @router.post("/refresh", response_model=LoginData)
 @limiter.limit("10/minute")
-def refresh(request: Request, response: Response, auth_service: Annotated[AuthService, Depends()]):
+async def refresh(request: Request, response: Response, auth_service: Annotated[AuthService, Depends()]):
     old_raw_refresh_token = request.cookies.get("refresh_token")
     if not old_raw_refresh_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
     try:
-        user_id, new_refresh_raw = auth_service.rotate(old_raw_refresh_token)
+        user, new_refresh_raw = await run_db(auth_service.rotate, old_raw_refresh_token)
     except ValueError as e:
         # Deleting the cookie from client side eitherway.
         response.delete_cookie(key="refresh_token", path="/auth")
@@ -86,13 +87,8 @@ def refresh(request: Request, response: Response, auth_service: Annotated[AuthSe
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
         raise
 
-    user = auth_service.user_repo.get_by_id(user_id)
-    if not user:
-        response.delete_cookie(key="refresh_token", path="/auth")
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-
     access_token_lifespan_in_minutes = settings.ACCESS_TOKEN_LIFESPAN_IN_MINUTES
-    new_access_token = create_access_token(subject=str(user_id), expires_minutes=access_token_lifespan_in_minutes)
+    new_access_token = create_access_token(subject=str(user.id), expires_minutes=access_token_lifespan_in_minutes)
 
     response.set_cookie(
         key="refresh_token",
@@ -104,7 +100,7 @@ def refresh(request: Request, response: Response, auth_service: Annotated[AuthSe
         max_age=settings.REFRESH_TOKEN_TTL_DAYS * 86400,
     )
 
-    user_response = auth_service._build_user_response(user_id)
+    user_response = auth_service._build_user_response(user)
     return LoginData(
         access_token=new_access_token,
         expires_in=access_token_lifespan_in_minutes * 60,
@@ -114,7 +110,7 @@ def refresh(request: Request, response: Response, auth_service: Annotated[AuthSe
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("10/minute")
-def logout(request: Request, response: Response, auth_service: Annotated[AuthService, Depends()]):
+async def logout(request: Request, response: Response, auth_service: Annotated[AuthService, Depends()]):
     raw_refresh_token = request.cookies.get("refresh_token")
     
     # always delete the cookie on client side, even when absent/invalid.
@@ -123,19 +119,19 @@ def logout(request: Request, response: Response, auth_service: Annotated[AuthSer
     if not raw_refresh_token:
         return
     
-    auth_service.global_logout(raw_refresh_token)
+    await run_db(auth_service.global_logout, raw_refresh_token)
     return
 
 
 @router.post("/forgot-password")
 @limiter.limit("3/minute")
-def send_email_for_forgot_password(
+async def send_email_for_forgot_password(
   request: Request, 
   forgot_password_request: Annotated[ForgotPasswordRequest, Body()],
   auth_service: Annotated[AuthService, Depends()], 
   background_tasks: BackgroundTasks
 ):
-    email_job = auth_service.request_reset(forgot_password_request.email, getattr(forgot_password_request, 'locale', None))
+    email_job = await run_db(auth_service.request_reset, forgot_password_request.email, getattr(forgot_password_request, 'locale', None))
 
     if email_job:
         mailjet_client = MailJetClient(settings.MAILJET_API_KEY, settings.MAILJET_API_SECRET_KEY)
@@ -159,9 +155,9 @@ def send_email_for_forgot_password(
 
 @router.post("/reset-password")
 @limiter.limit("5/minute")
-def reset_password(request: Request, reset_password_token: Annotated[str, Query(alias="token")], body: Annotated[UserUpdatePartial, Body(openapi_examples=RESET_PASSWORD_EXAMPLE)], auth_service: Annotated[AuthService, Depends()]):
+async def reset_password(request: Request, reset_password_token: Annotated[str, Query(alias="token")], body: Annotated[UserUpdatePartial, Body(openapi_examples=RESET_PASSWORD_EXAMPLE)], auth_service: Annotated[AuthService, Depends()]):
     try:
-        auth_service.reset_password(reset_password_token, body.password)
+        await run_db(auth_service.reset_password, reset_password_token, body.password)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
     
@@ -170,9 +166,9 @@ def reset_password(request: Request, reset_password_token: Annotated[str, Query(
 
 @router.post("/verify-email")
 @limiter.limit("5/minute")
-def verify_email(request: Request, verification_token: Annotated[str, Query(alias="token")], auth_service: Annotated[AuthService, Depends()]):
+async def verify_email(request: Request, verification_token: Annotated[str, Query(alias="token")], auth_service: Annotated[AuthService, Depends()]):
     try:
-        auth_service.verify_email(verification_token)
+        await run_db(auth_service.verify_email, verification_token)
     except ValueError as e:
         error_msg = str(e)
         if error_msg == "already_verified":
@@ -8,14 +8,15 @@ from fastapi import Depends, HTTPException, status
 from src.config.settings import get_settings
 from src.domains.users.repository import UserRepository
 from src.domains.users.models import User
+from src.domains.users.principal_cache import UserPrincipal
 from .repository import RefreshTokenRepository, ResetPasswordRepository
 from .models import RefreshToken, PasswordResetToken
 from .schemas import UserCreate, UserResponse
-from .password_handler import get_password_hash, verify_password
+from .password_handler import get_dummy_password_hash, get_password_hash, verify_and_update_password, verify_password
 from .access_token_handler import create_access_token
-from .refresh_token_handler import hash_token, get_refresh_token_fingerprint, verify_refresh_token
+from .refresh_token_handler import derive_successor_token, hash_token, get_refresh_token_fingerprint, verify_refresh_token
 from .reset_password_token_handler import get_reset_password_token_fingerprint, hash_token as hash_reset_password_token, verify_reset_password_token
-from .verification_token_handler import get_verification_token_fingerprint, hash_verification_token, verify_verification_token
+from .verification_token_handler import get_verification_token_fingerprint, hash_verification_token
 from src.infrastructure.external_services.email_templates import get_email_template
 
 logger = logging.getLogger("api.auth")
@@ -37,13 +38,9 @@ class AuthService:
         self.refresh_token_repo = refresh_token_repo
         self.reset_password_repo = reset_password_repo
 
-    def _build_user_response(self, user_id: uuid.UUID) -> UserResponse | None:
-        """Build UserResponse with computed spent and remaining."""
-        user = self.user_repo.get_by_id(user_id)
-        if not user:
-            return None
-        
-        spent = self.user_repo.get_spent_amount(user_id)
+    def _build_user_response(self, user: User | UserPrincipal) -> UserResponse:
+        """Build UserResponse from an already loaded user, with spent (maintained on users.spent) and remaining."""
+        spent = user.spent
         remaining = user.budget - spent if user.budget is not None else None
         
         return UserResponse(
@@ -58,10 +55,17 @@ class AuthService:
     def _generate_dummy_token_for_timing(self) -> None:
         """
         Generate and hash a dummy token to prevent timing attacks.
-        This ensures constant timing across different code paths.
+        Only matches paths whose real branch hashes a token (HMAC, microseconds), like the reset request.
         """
         dummy_token = uuid.uuid4().hex
         hash_verification_token(dummy_token)
+
+    def _spend_password_hash_time(self, password: str) -> None:
+        """
+        Pay one Argon2 computation, like hashing the password of a new account.
+        Registering an existing email must take as long as creating the account, or the timing tells it apart.
+        """
+        verify_password(password, get_dummy_password_hash())
         
     # ===================
     # Register/Login
@@ -78,8 +82,8 @@ class AuthService:
         if existing:
             if existing.is_verified:
                 # Email already exists and is verified - don't send email to prevent enumeration
-                # Generate dummy token hash to prevent timing attacks
-                self._generate_dummy_token_for_timing()
+                # Same Argon2 cost as a new registration to prevent timing attacks
+                self._spend_password_hash_time(user_create.password)
                 logger.warning("Registration attempt with existing verified email: %s", user_create.email)
                 return None
             else:
@@ -108,14 +112,15 @@ class AuthService:
                 
                 if not can_resend:
                     # Cooldown period not over - don't send email to prevent bombing
-                    # Generate dummy token hash to prevent timing attacks
-                    self._generate_dummy_token_for_timing()
+                    # Same Argon2 cost as a new registration to prevent timing attacks
+                    self._spend_password_hash_time(user_create.password)
                     remaining_seconds = int((cooldown_ends_at - now).total_seconds())
                     logger.info("Verification email cooldown for %s. %d seconds remaining.", user_create.email, remaining_seconds)
                     return None
                 
                 # Cooldown over - generate new verification token and invalidate old one
                 logger.info("Resending verification email for unverified account: %s", user_create.email)
+                self._spend_password_hash_time(user_create.password)
                 
                 raw_token = uuid.uuid4().hex
                 token_fingerprint = get_verification_token_fingerprint(raw_token)
@@ -193,9 +198,8 @@ class AuthService:
         # Prevent enumeration by raising the same error if user is absent or password is false.
         # To prevent timing attacks, always verify password (even with dummy hash if user doesn't exist)
         if not user:
-            # Use a dummy hash to maintain constant timing
-            dummy_hash = get_password_hash("dummy_password_for_timing_attack_prevention")
-            verify_password(password, dummy_hash)
+            # Verify against a dummy hash (computed once) to maintain constant timing
+            verify_password(password, get_dummy_password_hash())
             logger.warning("Failed login attempt for email: %s", normalized_email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -203,7 +207,8 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        if not verify_password(password, user.password_hash):
+        valid, updated_password_hash = verify_and_update_password(password, user.password_hash)
+        if not valid:
             logger.warning("Failed login attempt for email: %s", normalized_email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -217,6 +222,11 @@ class AuthService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Please verify your email address before logging in.",
             )
+        # Stored with other Argon2 parameters (before a calibration): store the hash made with the current ones
+        if updated_password_hash is not None:
+            self.user_repo.set_password_hash(user.id, updated_password_hash)
+            logger.info("Password rehashed with the current Argon2 parameters for user: %s", user.id)
+
         access_token_lifespan_in_minutes = settings.ACCESS_TOKEN_LIFESPAN_IN_MINUTES
         access_token = create_access_token(
             subject=str(user.id),
@@ -238,7 +248,7 @@ class AuthService:
         if refresh_token is None:
             return
 
-        # Optionnal: check argon2 before deleting to avoid
+        # Optionnal: check the token hash before deleting to avoid
         # a logout if an attacker spam random values and collide with fingerprint.
         if not verify_refresh_token(raw_token, refresh_token.token_hash):
             return
@@ -247,26 +257,35 @@ class AuthService:
         self.refresh_token_repo.delete_all_tokens_for_user(refresh_token.user_id)
 
 
-    def rotate(self, old_raw_refresh_token: str) -> tuple[uuid.UUID, str]:
+    def rotate(self, old_raw_refresh_token: str) -> tuple[UserPrincipal, str]:
         """
-        Returns (user_id, new_raw_refresh_token)
+        Returns (user, new_raw_refresh_token)
         If a reused token is detected, all the refresh tokens for the user are deleted.
+        Three statements, committed once with the request: the token (locked) joined with its user,
+        INSERT ... RETURNING id of the new token, conditional UPDATE ... RETURNING user_id of the old one.
+
+        Concurrent refreshes with the same token (several tabs) queue up on the token row lock.
+        The new token is derived from the old one, so within REFRESH_TOKEN_REUSE_GRACE_SECONDS
+        of the rotation the later ones get the same successor back instead of a reuse logout.
         """
-        # Getting the old refresh token entity from database
+        # Getting the old refresh token entity and its user from database, locked until the end of the request
         old_refresh_token_fingerprint = get_refresh_token_fingerprint(old_raw_refresh_token)
-        token = self.refresh_token_repo.get_by_fingerprint(old_refresh_token_fingerprint)
+        found = self.refresh_token_repo.lock_with_principal_by_fingerprint(old_refresh_token_fingerprint)
 
-        if token is None:
+        if found is None:
             raise ValueError("invalid_refresh")
+        token, user = found
+        now = datetime.now(timezone.utc)
         
         # If refresh token already revoked => possible reuse => cyberattack or concurent refresh
         if token.revoked_at is not None:
-            logger.warning("Refresh token reuse detected for user: %s — all tokens revoked", token.user_id)
-            self.refresh_token_repo.delete_all_tokens_for_user(token.user_id)
-            raise ValueError("refresh_reuse")
+            successor_raw_refresh_token = self.__successor_within_grace(token, old_raw_refresh_token, now)
+            if successor_raw_refresh_token is None:
+                self.__revoke_all_on_reuse(token.user_id)
+            logger.info("Concurrent refresh for user: %s — successor token returned", token.user_id)
+            return user, successor_raw_refresh_token
         
         # Expired
-        now = datetime.now(timezone.utc)
         expires_at_aware = token.expires_at.replace(tzinfo=timezone.utc) if token.expires_at.tzinfo is None else token.expires_at
         if expires_at_aware <= now:
             raise ValueError("invalid_refresh")
@@ -276,20 +295,47 @@ class AuthService:
         if not verify_refresh_token(old_raw_refresh_token, token.token_hash):
             raise ValueError("invalid_refresh")
         
-        # Rotation: create new token and invalidate former one
-        new_raw_refresh_token = self.__create_refresh_token_for_user(token.user_id)
-
-        # We want to store replaced_by_id, so the new id has to be known.
-        # But since __create_refresh_token_for_user() doesn't return the object,
-        # we lookup for the new refresh token via fingerprint.
-        new_refresh_token_fingerprint = get_refresh_token_fingerprint(new_raw_refresh_token)
-        new_refresh_token = self.refresh_token_repo.get_by_fingerprint(new_refresh_token_fingerprint)
-        if new_refresh_token is None: # unlikely but better to be safe than sorry.
-            raise RuntimeError("refresh_rotation_failed")
-        
-        self.refresh_token_repo.revoke(token.id, replaced_by_id=new_refresh_token.id)
+        # Rotation: create new token (its id comes back from the INSERT) and invalidate former one
+        new_raw_refresh_token = derive_successor_token(old_raw_refresh_token)
+        new_refresh_token_id = self.refresh_token_repo.insert(
+            token.user_id,
+            get_refresh_token_fingerprint(new_raw_refresh_token),
+            hash_token(new_raw_refresh_token),
+            now + timedelta(days=settings.REFRESH_TOKEN_TTL_DAYS),
+        )
+
+        # Revoked by a concurrent refresh between the read and now (not under the row lock, e.g. SQLite): reuse
+        if self.refresh_token_repo.revoke_if_active(token.id, replaced_by_id=new_refresh_token_id) is None:
+            self.__revoke_all_on_reuse(token.user_id)
+
+        return user, new_raw_refresh_token
+
+
+    def __successor_within_grace(self, token: RefreshToken, raw_token: str, now: datetime) -> str | None:
+        """
+        The raw successor of a token rotated less than REFRESH_TOKEN_REUSE_GRACE_SECONDS ago, if it is still active.
+        None (reuse) for a revoked token that was not rotated (logout), rotated earlier, or whose successor
+        was itself rotated or revoked since.
+        """
+        revoked_at = token.revoked_at if token.revoked_at.tzinfo else token.revoked_at.replace(tzinfo=timezone.utc)
+        if token.replaced_by_id is None or now - revoked_at > timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS):
+            return None
+        if not verify_refresh_token(raw_token, token.token_hash):
+            return None
+
+        successor_raw_token = derive_successor_token(raw_token)
+        successor = self.refresh_token_repo.get_by_fingerprint(get_refresh_token_fingerprint(successor_raw_token))
+        if successor is None or successor.id != token.replaced_by_id or successor.revoked_at is not None:
+            return None
+        return successor_raw_token
+
 
-        return token.user_id, new_raw_refresh_token
+    def __revoke_all_on_reuse(self, user_id: uuid.UUID) -> None:
+        logger.warning("Refresh token reuse detected for user: %s — all tokens revoked", user_id)
+        self.refresh_token_repo.delete_all_tokens_for_user(user_id)
+        # The request ends with a 401, which rolls back: the revocation has to be committed now.
+        self.refresh_token_repo.commit()
+        raise ValueError("refresh_reuse")
 
 
     def __create_refresh_token_for_user(self, user_id: uuid.UUID) -> str:
@@ -436,6 +482,6 @@ class AuthService:
                           user.id, expires_at, now)
             raise ValueError("expired_token")
         
-        self.user_repo.verify_email(user.id)
+        verified_user = self.user_repo.verify_email(user.id)
         logger.info("Email verified for user: %s", user.id)
-        return self.user_repo.get_by_id(user.id)
+        return verified_user
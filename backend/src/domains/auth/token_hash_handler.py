@@ -0,0 +1,73 @@
+"""
+Keyed hashing of the random tokens (refresh, reset password and email verification).
+
+These tokens are 128 random bits: nobody can guess one, so a slow hash (Argon2) protects nothing
+and costs tens of milliseconds per refresh. They are stored as HMAC-SHA256(key, token) instead;
+without the key, a leaked hash can't even be checked against a candidate token.
+
+Stored format: "hmac-sha256$<key id>$<hex digest>".
+Keys come from TOKEN_HASH_KEYS ("2:new-secret,1:old-secret"): the first one hashes, all of them verify,
+so a key can be rotated while the tokens hashed with the previous one are still alive.
+Without TOKEN_HASH_KEYS, a key derived from SECRET_KEY is used under the id "0".
+derive_token() turns a token into another one with the current key: a refresh token's successor is
+derived from it, so a concurrent refresh presenting the same token can be handed the same successor.
+Hashes written before (Argon2) still verify. Every token is single-use, so they are replaced as they
+are used: a refresh stores an HMAC-hashed successor, reset and verification tokens are consumed.
+"""
+import hmac
+
+from pwdlib import PasswordHash
+from pwdlib.exceptions import UnknownHashError
+
+from src.config.settings import get_settings
+
+settings = get_settings()
+
+HMAC_SCHEME = "hmac-sha256"
+
+_legacy_hasher = PasswordHash.recommended()
+
+
+def _parse_keys(value: str, secret_key: str) -> dict[str, bytes]:
+    """Key id -> key, in TOKEN_HASH_KEYS order (the first one is current)."""
+    keys = {}
+    for entry in (part.strip() for part in value.split(",")):
+        if not entry:
+            continue
+        key_id, separator, secret = entry.partition(":")
+        if not separator or not key_id or not secret or "$" in key_id:
+            raise ValueError("TOKEN_HASH_KEYS entries must look like <id>:<secret>, ids without '$'")
+        keys[key_id] = secret.encode("utf-8")
+    if not keys:
+        keys["0"] = hmac.digest(secret_key.encode("utf-8"), b"token-hash", "sha256")
+    return keys
+
+
+_KEYS = _parse_keys(settings.TOKEN_HASH_KEYS, settings.SECRET_KEY)
+_CURRENT_KEY_ID = next(iter(_KEYS))
+
+
+def _digest(key: bytes, raw_token: str) -> str:
+    return hmac.digest(key, raw_token.encode("utf-8"), "sha256").hex()
+
+
+def hash_token(raw_token: str) -> str:
+    return f"{HMAC_SCHEME}${_CURRENT_KEY_ID}${_digest(_KEYS[_CURRENT_KEY_ID], raw_token)}"
+
+
+def derive_token(raw_token: str, purpose: str) -> str:
+    """A new 128-bit token (32 hex chars), only computable from raw_token with the key."""
+    return _digest(_KEYS[_CURRENT_KEY_ID], f"{purpose}:{raw_token}")[:32]
+
+
+def verify_token(raw_token: str, token_hash: str) -> bool:
+    """Constant-time check of an HMAC hash; Argon2 hashes from before go through pwdlib."""
+    scheme, _, rest = token_hash.partition("$")
+    if scheme == HMAC_SCHEME:
+        key_id, _, digest = rest.partition("$")
+        key = _KEYS.get(key_id)
+        return key is not None and hmac.compare_digest(_digest(key, raw_token), digest)
+    try:
+        return _legacy_hasher.verify(raw_token, token_hash)
+    except UnknownHashError:
+        return False
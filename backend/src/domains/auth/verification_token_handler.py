@@ -1,15 +1,13 @@
 import hashlib
 
-from pwdlib import PasswordHash
+from . import token_hash_handler
 
 
-password_hash = PasswordHash.recommended() #.recommended uses the latest recommended hashing algorithm.
-
 def get_verification_token_fingerprint(raw_token: str) -> str:
     return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
 
 def hash_verification_token(raw_token: str) -> str:
-    return password_hash.hash(raw_token)
+    return token_hash_handler.hash_token(raw_token)
 
 def verify_verification_token(raw_token: str, token_hash: str) -> bool:
-    return password_hash.verify(raw_token, token_hash)
+    return token_hash_handler.verify_token(raw_token, token_hash)
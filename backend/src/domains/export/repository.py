@@ -0,0 +1,67 @@
+from itertools import groupby
+from typing import Iterator
+from uuid import UUID
+
+from sqlalchemy import select
+
+from src.infrastructure.database.session import StreamingDbSession
+from src.domains.gifts.models import Gift
+from src.domains.recipients.models import Recipient, GiftRecipient
+
+# Rows fetched per round trip from the server-side cursor, and records per yielded batch
+EXPORT_BATCH_SIZE = 500
+
+
+class ExportRepository:
+    """
+    Streamed reads for the export: plain column rows (no ORM identity map to grow) fetched in
+    batches from a server-side cursor (yield_per implies stream_results), so memory stays flat.
+    The generators run their query on the first next(): call them through iterate_db().
+    """
+
+    def __init__(self, db: StreamingDbSession):
+        self.db = db
+
+    def stream_recipients(self, user_id: UUID) -> Iterator[list]:
+        """Batches of (id, name, notes, created_at) rows, oldest first."""
+        stmt = (
+            select(Recipient.id, Recipient.name, Recipient.notes, Recipient.created_at)
+            .where(Recipient.user_id == user_id)
+            .order_by(Recipient.created_at, Recipient.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        yield from self.db.execute(stmt).partitions()
+
+    def stream_gifts(self, user_id: UUID) -> Iterator[list[tuple]]:
+        """
+        Batches of (gift row, sorted recipient names), oldest first.
+        A single query, gifts LEFT JOIN their recipients: the rows of a gift are consecutive
+        (ordered by created_at, id, as idx_gifts_user_created_at_id) and folded here.
+        """
+        stmt = (
+            select(
+                Gift.id,
+                Gift.name,
+                Gift.url,
+                Gift.price,
+                Gift.status,
+                Gift.quantity,
+                Gift.created_at,
+                Recipient.name.label("recipient_name"),
+            )
+            .outerjoin(GiftRecipient, GiftRecipient.gift_id == Gift.id)
+            .outerjoin(Recipient, Recipient.id == GiftRecipient.recipient_id)
+            .where(Gift.user_id == user_id)
+            .order_by(Gift.created_at, Gift.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        batch = []
+        for _, rows in groupby(self.db.execute(stmt), key=lambda row: row.id):
+            rows = list(rows)
+            names = sorted(row.recipient_name for row in rows if row.recipient_name is not None)
+            batch.append((rows[0], names))
+            if len(batch) == EXPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
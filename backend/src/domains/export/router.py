@@ -0,0 +1,33 @@
+from typing import Annotated
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from src.infrastructure.database.session import iterate_db
+from src.domains.auth.dependencies import get_current_user_id
+from .service import ExportFormat, ExportService
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get("", response_class=StreamingResponse)
+async def export(
+    export_service: Annotated[ExportService, Depends()],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    export_format: Annotated[ExportFormat, Query(alias="format", description="ndjson (one JSON object per line) or csv")] = "ndjson",
+):
+    """
+    Download all the recipients and gifts of the authenticated user (with their recipient names).
+    The file is streamed while the rows are read: nothing is buffered server-side.
+    """
+    return StreamingResponse(
+        iterate_db(export_service.stream(user_id, export_format)),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="gift-planner-export.{export_format}"'},
+    )
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from typing import Annotated, Iterator, Literal
+import uuid
+
+from fastapi import Depends
+
+from .repository import ExportRepository
+
+ExportFormat = Literal["ndjson", "csv"]
+
+CSV_COLUMNS = ["type", "id", "name", "notes", "url", "price", "status", "quantity", "recipients", "created_at"]
+
+# Spreadsheet apps evaluate cells starting with these characters as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_text(value: str | None) -> str | None:
+    if value and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class ExportService:
+    def __init__(self, repo: Annotated[ExportRepository, Depends()]):
+        self.repo = repo
+
+    def _records(self, user_id: uuid.UUID) -> Iterator[list[dict]]:
+        """Batches of export records: the recipients, then the gifts with their recipient names."""
+        for rows in self.repo.stream_recipients(user_id):
+            yield [
+                {
+                    "type": "recipient",
+                    "id": str(row.id),
+                    "name": row.name,
+                    "notes": row.notes,
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in rows
+            ]
+        for gifts in self.repo.stream_gifts(user_id):
+            yield [
+                {
+                    "type": "gift",
+                    "id": str(row.id),
+                    "name": row.name,
+                    "url": row.url,
+                    "price": str(row.price) if row.price is not None else None,
+                    "status": row.status.value,
+                    "quantity": row.quantity,
+                    "recipients": names,
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row, names in gifts
+            ]
+
+    def stream(self, user_id: uuid.UUID, export_format: ExportFormat) -> Iterator[str]:
+        """Chunks of the export file, one per batch of rows (with the header first for CSV)."""
+        if export_format == "ndjson":
+            for records in self._records(user_id):
+                yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+            return
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        yield buffer.getvalue()
+        for records in self._records(user_id):
+            buffer.seek(0)
+            buffer.truncate()
+            for record in records:
+                writer.writerow({
+                    **record,
+                    "name": _csv_text(record["name"]),
+                    "notes": _csv_text(record.get("notes")),
+                    "url": _csv_text(record.get("url")),
+                    "recipients": "; ".join(_csv_text(name) for name in record.get("recipients", ())),
+                })
+            yield buffer.getvalue()
@@ -0,0 +1,88 @@
+import uuid
+from decimal import Decimal
+from typing import Annotated, Literal
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy import Select, exists
+
+from src.core.search import SEARCH_MAX_LENGTH, text_match
+from src.domains.recipients.models import GiftRecipient
+from .enums import GiftStatusEnum
+from .models import Gift
+
+
+def gift_filter_parameters(
+    status_values: list[GiftStatusEnum] | None = Query(
+        default=None, alias="status", description="Only these statuses (repeat the parameter for several)"
+    ),
+    min_price: Decimal | None = Query(default=None, ge=0, description="Minimum unit price (inclusive)"),
+    max_price: Decimal | None = Query(default=None, ge=0, description="Maximum unit price (inclusive)"),
+    recipient_id: uuid.UUID | None = Query(default=None, description="Only gifts linked to this recipient"),
+    has_url: bool | None = Query(default=None, description="true: only gifts with a URL, false: only gifts without"),
+    q: str | None = Query(
+        default=None, min_length=1, max_length=SEARCH_MAX_LENGTH, description="Text search over the name and URL"
+    ),
+    facets: Literal["status"] | None = Query(
+        default=None, description="status: also return the number of gifts per status for the other filters"
+    ),
+):
+    """
+    Dependency for the gifts list filters.
+    Returns dict with status (list or None), min_price, max_price, recipient_id, has_url, q and facets.
+    Raises 422 if min_price is greater than max_price.
+    """
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="min_price cannot be greater than max_price",
+        )
+    return {
+        "status": list(dict.fromkeys(status_values)) if status_values else None,
+        "min_price": min_price,
+        "max_price": max_price,
+        "recipient_id": recipient_id,
+        "has_url": has_url,
+        "q": (q.strip() or None) if q else None,
+        "facets": facets,
+    }
+
+
+GiftFilterDeps = Annotated[dict, Depends(gift_filter_parameters)]
+
+FILTER_KEYS = ("status", "min_price", "max_price", "recipient_id", "has_url", "q")
+
+
+def has_filters(filters: dict | None) -> bool:
+    return bool(filters) and any(filters.get(key) is not None for key in FILTER_KEYS)
+
+
+def apply_gift_filters(stmt: Select, filters: dict | None, exclude: tuple[str, ...] = ()) -> Select:
+    """
+    Add the WHERE clauses of `filters` to a select on gifts. Keys in `exclude` are skipped
+    (facet counts ignore their own filter, so every value keeps its count while one is selected).
+    A price range leaves out gifts without a price.
+    """
+    if not filters:
+        return stmt
+
+    def active(key: str) -> bool:
+        return key not in exclude and filters.get(key) is not None
+
+    if active("status"):
+        stmt = stmt.where(Gift.status.in_(filters["status"]))
+    if active("min_price"):
+        stmt = stmt.where(Gift.price >= filters["min_price"])
+    if active("max_price"):
+        stmt = stmt.where(Gift.price <= filters["max_price"])
+    if active("recipient_id"):
+        # Semi-join on the link table's primary key (gift_id, recipient_id): no duplicate rows, no DISTINCT
+        stmt = stmt.where(exists().where(
+            GiftRecipient.gift_id == Gift.id,
+            GiftRecipient.recipient_id == filters["recipient_id"],
+        ))
+    if active("has_url"):
+        stmt = stmt.where(Gift.url.is_not(None) if filters["has_url"] else Gift.url.is_(None))
+    if active("q"):
+        # ILIKE, served by the trigram indexes on postgresql
+        stmt = stmt.where(text_match(filters["q"], [Gift.name, Gift.url]))
+    return stmt
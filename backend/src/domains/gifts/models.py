@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     CheckConstraint,
     Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -70,6 +71,26 @@ class Gift(Base):
     __table_args__ = (
         CheckConstraint("quantity >= 1", name="ck_gifts_quantity"),
         CheckConstraint("price >= 0", name="ck_gifts_price"),
-        Index("idx_gifts_user", "user_id"),
-        Index("idx_gifts_status", "status"),
+        # Every query is scoped to a user: (user_id, sort key, id) serves the filter, the ORDER BY
+        # (scanned backward for descending orders) and the keyset seek. Also covers the user_id FK.
+        Index("idx_gifts_user_name_id", "user_id", "name", "id"),
+        Index("idx_gifts_user_created_at_id", "user_id", "created_at", "id"),
+        # List filters (see filters.py): status with the default order, and price ranges.
+        # The status index also serves the per-status facet counts.
+        Index("idx_gifts_user_status_created_at_id", "user_id", "status", "created_at", "id"),
+        Index("idx_gifts_user_price", "user_id", "price"),
+        # Spent amount (UserRepository.get_spent_amount): index-only scan over the gifts that count
+        Index(
+            "idx_gifts_user_spent",
+            "user_id",
+            postgresql_include=["price", "quantity"],
+            postgresql_where=text("status <> 'idee' AND price IS NOT NULL"),
+        ),
+        # Text search (src/core/search.py): trigram GIN indexes serve ILIKE '%q%' (needs pg_trgm)
+        Index(
+            "idx_gifts_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_gifts_url_trgm", "url", postgresql_using="gin", postgresql_ops={"url": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
     )
@@ -1,63 +1,241 @@
-from typing import Annotated
+from decimal import Decimal
+from typing import Iterable
 from uuid import UUID
 
-from fastapi import Depends
-from sqlalchemy import select, delete, func
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, bindparam, select, delete, func, insert, update, tuple_
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
 
-from src.infrastructure.database.session import get_db
+from src.core.count_cache import bump_count, cached_count
+from src.core.pagination import apply_keyset
+from src.infrastructure.database.session import DbSession
+from src.domains.recipients.models import Recipient, GiftRecipient
+from src.domains.users.models import User
+from src.domains.users.principal_cache import invalidate_principal
+from .enums import GiftStatusEnum
+from .filters import apply_gift_filters, has_filters
 from .models import Gift
 
+# Responses only need the linked recipient ids: load them for a whole page in one
+# extra SELECT (gift_recipients JOIN recipients, ids only) instead of one lazy load per gift.
+WITH_RECIPIENT_IDS = selectinload(Gift.recipients).load_only(Recipient.id)
+
+SPENT_COLUMNS = ("status", "price", "quantity")
+
+# Hot read statements are built once, with bound parameters: a call only binds values, instead of building a
+# new construct that SQLAlchemy has to walk again to compute its compiled-cache key (memoized on the instance).
+# The SQL text is identical on every call, which also lets psycopg prepare it server-side (DATABASE_PREPARE_THRESHOLD).
+# id breaks ties so pages are stable; the orders match idx_gifts_user_*_id (no sort step)
+_PAGE_ORDERINGS = {
+    "asc": (Gift.name.asc(), Gift.id.asc()),
+    "desc": (Gift.name.desc(), Gift.id.desc()),
+    "default": (Gift.created_at.desc(), Gift.id.desc()),
+}
+_BY_USER = select(Gift).where(Gift.user_id == bindparam("user_id"))
+# (sort, with the window total) -> offset page; binds user_id, offset and limit
+_PAGES = {
+    (sort, with_total): (
+        (_BY_USER.add_columns(func.count().over().label("total")) if with_total else _BY_USER)
+        .order_by(*ordering)
+        .offset(bindparam("offset", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+        .options(WITH_RECIPIENT_IDS)
+    )
+    for sort, ordering in _PAGE_ORDERINGS.items()
+    for with_total in (False, True)
+}
+_BY_ID = select(Gift).where(Gift.user_id == bindparam("user_id"), Gift.id == bindparam("gift_id")).options(WITH_RECIPIENT_IDS)
+# Update path: the row stays locked until commit, so the spent delta is computed from the values it replaces
+# (two concurrent updates would otherwise subtract the same old amount). populate_existing: re-read after the wait.
+_BY_ID_FOR_UPDATE = _BY_ID.with_for_update(of=Gift).execution_options(populate_existing=True)
+_COUNT = select(func.count(Gift.id)).where(Gift.user_id == bindparam("user_id"))
+
+
+def _spent_amount(status, price, quantity) -> Decimal:
+    """What a gift adds to users.spent: price * quantity once it is no longer an idea."""
+    if status in (None, GiftStatusEnum.idee) or price is None:
+        return Decimal("0")
+    return Decimal(price) * quantity
+
+
+def _loaded_value(gift: Gift, key: str):
+    """Value of an attribute as loaded from the database, ignoring pending changes."""
+    history = inspect(gift).attrs[key].history
+    return (history.deleted or history.unchanged or (None,))[0]
+
 
 class GiftRepository:
-    def __init__(self, db: Annotated[Session, Depends(get_db)]):
+    def __init__(self, db: DbSession):
         self.db = db
 
-    def create(self, new_gift: Gift) -> Gift:
+    def _reload(self, gift: Gift) -> Gift:
+        """Refresh a gift after a write, together with its recipient ids."""
+        stmt = (
+            select(Gift)
+            .where(Gift.id == gift.id)
+            .options(WITH_RECIPIENT_IDS)
+            .execution_options(populate_existing=True)
+        )
+        return self.db.execute(stmt).scalar_one()
+
+    def create(self, new_gift: Gift, recipient_ids: Iterable[UUID] = ()) -> Gift:
+        """
+        Insert a gift and its links to the given (already validated) recipient ids.
+        The flush is a single INSERT ... RETURNING created_at, so the gift is complete without a re-fetch;
+        its recipients collection is not loaded (the caller knows the ids it linked).
+        """
         self.db.add(new_gift)
-        self.db.commit()
-        self.db.refresh(new_gift)
+        self.db.flush()
+        if recipient_ids:
+            self._insert_links(new_gift.id, recipient_ids)
+        self._add_spent(new_gift.user_id, _spent_amount(new_gift.status, new_gift.price, new_gift.quantity))
+        bump_count(self.db, ("gifts", new_gift.user_id))
         return new_gift
 
-    def get(self, pagination: dict, gift_user_id: UUID) -> tuple[list[Gift], int]:
+    def count(self, gift_user_id: UUID, filters: dict | None = None) -> int:
+        # Count query - optimized to only count IDs
+        count_stmt = apply_gift_filters(_COUNT, filters)
+        return self.db.execute(count_stmt, {"user_id": gift_user_id}).scalar() or 0
+
+    def count_by_status(self, gift_user_id: UUID, filters: dict | None = None) -> dict[GiftStatusEnum, int]:
+        """
+        Number of gifts per status under every filter but the status one (see apply_gift_filters).
+        One GROUP BY served by idx_gifts_user_status_created_at_id; absent statuses count 0.
+        """
+        stmt = select(Gift.status, func.count()).where(Gift.user_id == gift_user_id).group_by(Gift.status)
+        stmt = apply_gift_filters(stmt, filters, exclude=("status",))
+        counts = dict.fromkeys(GiftStatusEnum, 0)
+        counts.update({GiftStatusEnum(value): total for value, total in self.db.execute(stmt)})
+        return counts
+
+    def get(self, pagination: dict, gift_user_id: UUID, filters: dict | None = None) -> tuple[list[Gift], int | None]:
+        """
+        Offset page. The total depends on pagination["count"] (see CountStrategy):
+        with "none" it is None and up to limit + 1 rows are returned to derive hasNext.
+        The cached total is per user only: with filters, "cached" counts exactly.
+        """
         sort = pagination["sort"]
         page = pagination["page"]
         limit = pagination["limit"]
+        strategy = pagination.get("count", "exact")
+        if strategy == "cached" and has_filters(filters):
+            strategy = "exact"
 
-        # Base query with filter
-        base_stmt = select(Gift).where(Gift.user_id == gift_user_id)
+        offset = (page - 1) * limit
 
-        # Count query - optimized to only count IDs
-        count_stmt = select(func.count(Gift.id)).where(Gift.user_id == gift_user_id)
-        total = self.db.execute(count_stmt).scalar() or 0
-
-        # Items query with sorting and pagination
-        stmt = base_stmt
-        if sort == "asc":
-            stmt = stmt.order_by(Gift.name.asc())
-        elif sort == "desc":
-            stmt = stmt.order_by(Gift.name.desc())
+        if strategy == "none":
+            return self._page(sort, gift_user_id, filters, offset, limit + 1), None
+
+        if strategy == "window":
+            # The window is evaluated before OFFSET/LIMIT: every row carries the full total.
+            rows = self._page(sort, gift_user_id, filters, offset, limit, with_total=True)
+            if rows:
+                return [row[0] for row in rows], rows[0].total
+            # Past the last page there is no row to read the total from.
+            return [], self.count(gift_user_id, filters) if page > 1 else 0
+
+        if strategy == "cached":
+            total = cached_count(self.db, ("gifts", gift_user_id), lambda: self.count(gift_user_id))
         else:
-            stmt = stmt.order_by(Gift.created_at.desc())
+            total = self.count(gift_user_id, filters)
+
+        return self._page(sort, gift_user_id, filters, offset, limit), total
 
-        stmt = stmt.offset((page - 1) * limit).limit(limit)
+    def _page(
+        self, sort: str, gift_user_id: UUID, filters: dict | None, offset: int, limit: int, with_total: bool = False,
+    ) -> list:
+        """Rows of a prebuilt page statement; filters add their WHERE clauses to it (only then is a new construct built)."""
+        stmt = apply_gift_filters(_PAGES[sort, with_total], filters)
+        result = self.db.execute(stmt, {"user_id": gift_user_id, "offset": offset, "limit": limit})
+        return result.all() if with_total else list(result.scalars().all())
 
-        gifts = self.db.execute(stmt).scalars().all()
-        return list(gifts), total
+    def get_keyset(self, pagination: dict, gift_user_id: UUID, filters: dict | None = None) -> list[Gift]:
+        """
+        Keyset page: seeks on (gifts.user_id, sort key, id) instead of skipping OFFSET rows,
+        so deep pages cost the same as the first one. Returns up to limit + 1 rows (see apply_keyset).
+        """
+        stmt = apply_gift_filters(select(Gift).where(Gift.user_id == gift_user_id), filters)
+        stmt = apply_keyset(stmt, Gift, pagination).options(WITH_RECIPIENT_IDS)
+        return list(self.db.execute(stmt).scalars().all())
 
     def get_by_id(self, gift_user_id: UUID, gift_id: UUID) -> Gift | None:
-        stmt = select(Gift).where(
-            Gift.user_id == gift_user_id,
-            Gift.id == gift_id
-        )
-        gift = self.db.execute(stmt).scalar_one_or_none()
-        return gift
+        return self.db.execute(_BY_ID, {"user_id": gift_user_id, "gift_id": gift_id}).scalar_one_or_none()
+
+    def get_by_id_for_update(self, gift_user_id: UUID, gift_id: UUID) -> Gift | None:
+        """get_by_id(), locking the gift row until the end of the transaction. Load the gift to update() with it."""
+        return self.db.execute(_BY_ID_FOR_UPDATE, {"user_id": gift_user_id, "gift_id": gift_id}).scalar_one_or_none()
+
+    def update(self, gift: Gift, recipient_ids: Iterable[UUID] | None = None) -> Gift:
+        """
+        Update existing gift in database. The gift must come from get_by_id_for_update(): users.spent moves by
+        the difference with the loaded values, which only are the stored ones while the row is locked.
+        When recipient_ids is given, the links are replaced by writing only the difference.
+        """
+        if recipient_ids is not None:
+            self._replace_links({gift.id: set(recipient_ids)})
+        spent_before = _spent_amount(*(_loaded_value(gift, key) for key in SPENT_COLUMNS))
+        self._add_spent(gift.user_id, _spent_amount(gift.status, gift.price, gift.quantity) - spent_before)
+        self.db.flush()
+        return self._reload(gift)
+
+    def add_recipients(self, gift: Gift, recipient_ids: Iterable[UUID]) -> Gift:
+        """Link recipients to a gift. Already linked ids are ignored."""
+        self._insert_links(gift.id, set(recipient_ids) - self._linked_ids(gift.id))
+        return self._reload(gift)
+
+    def remove_recipients(self, gift: Gift, recipient_ids: Iterable[UUID]) -> Gift:
+        """Unlink recipients from a gift. Ids that are not linked are ignored."""
+        self._delete_links(gift.id, set(recipient_ids))
+        return self._reload(gift)
 
-    def update(self, gift: Gift) -> Gift:
-        """Update existing gift in database."""
-        self.db.commit()
-        self.db.refresh(gift)
-        return gift
+    def get_owned_ids(self, gift_user_id: UUID, gift_ids: Iterable[UUID]) -> set[UUID]:
+        """Return the subset of gift_ids that exist and belong to the user, in a single IN query."""
+        gift_ids = set(gift_ids)
+        if not gift_ids:
+            return set()
+        stmt = select(Gift.id).where(Gift.user_id == gift_user_id, Gift.id.in_(gift_ids))
+        return set(self.db.execute(stmt).scalars().all())
+
+    # gift_recipients rows are written directly: assigning the ORM collection would
+    # delete and re-insert every link of the gift.
+
+    def _replace_links(self, links: dict[UUID, set[UUID]]) -> None:
+        """Make the links of each gift in `links` exactly the given recipient ids, writing only the difference."""
+        if not links:
+            return
+        stmt = select(GiftRecipient.gift_id, GiftRecipient.recipient_id).where(GiftRecipient.gift_id.in_(links))
+        current = set(map(tuple, self.db.execute(stmt)))
+        wanted = {(gift_id, recipient_id) for gift_id, recipient_ids in links.items() for recipient_id in recipient_ids}
+        stale = current - wanted
+        if stale:
+            self.db.execute(
+                delete(GiftRecipient).where(tuple_(GiftRecipient.gift_id, GiftRecipient.recipient_id).in_(stale))
+            )
+        added = wanted - current
+        if added:
+            self.db.execute(
+                insert(GiftRecipient),
+                [{"gift_id": gift_id, "recipient_id": recipient_id} for gift_id, recipient_id in added],
+            )
+
+    def _linked_ids(self, gift_id: UUID) -> set[UUID]:
+        stmt = select(GiftRecipient.recipient_id).where(GiftRecipient.gift_id == gift_id)
+        return set(self.db.execute(stmt).scalars().all())
+
+    def _insert_links(self, gift_id: UUID, recipient_ids: Iterable[UUID]) -> None:
+        rows = [{"gift_id": gift_id, "recipient_id": recipient_id} for recipient_id in set(recipient_ids)]
+        if rows:
+            self.db.execute(insert(GiftRecipient), rows)
+
+    def _delete_links(self, gift_id: UUID, recipient_ids: Iterable[UUID]) -> None:
+        recipient_ids = set(recipient_ids)
+        if recipient_ids:
+            self.db.execute(
+                delete(GiftRecipient).where(
+                    GiftRecipient.gift_id == gift_id,
+                    GiftRecipient.recipient_id.in_(recipient_ids),
+                )
+            )
 
     def delete(self, gift_user_id: UUID, gift_id: UUID) -> bool:
         """
@@ -67,7 +245,102 @@ class GiftRepository:
         stmt = delete(Gift).where(
             Gift.user_id == gift_user_id,
             Gift.id == gift_id
+        ).returning(Gift.status, Gift.price, Gift.quantity)
+        deleted = self.db.execute(stmt).all()
+        self._add_spent(gift_user_id, -sum((_spent_amount(*row) for row in deleted), Decimal("0")))
+        if deleted:
+            bump_count(self.db, ("gifts", gift_user_id))
+        return bool(deleted)
+
+    def bulk_create(self, gift_user_id: UUID, rows: list[dict], recipient_ids: list[list[UUID]]) -> list[UUID]:
+        """
+        Insert many gifts with a single INSERT ... RETURNING (batched by insertmanyvalues), then all their links.
+        recipient_ids[i] are the links of rows[i]. Returns the new ids in the order of rows.
+        """
+        stmt = insert(Gift).returning(Gift.id, sort_by_parameter_order=True)
+        gift_ids = list(self.db.scalars(stmt, [{**row, "user_id": gift_user_id} for row in rows]))
+        self._replace_links({gift_id: set(links) for gift_id, links in zip(gift_ids, recipient_ids) if links})
+        self._add_spent(gift_user_id, sum(
+            (_spent_amount(*(row.get(key) for key in SPENT_COLUMNS)) for row in rows), Decimal("0")
+        ))
+        bump_count(self.db, ("gifts", gift_user_id))
+        return gift_ids
+
+    def bulk_update(
+        self,
+        gift_user_id: UUID,
+        changes: dict[UUID, dict],
+        recipient_ids: dict[UUID, Iterable[UUID]],
+    ) -> None:
+        """
+        Apply column changes per gift id with executemany UPDATEs (one per distinct set of columns),
+        then replace the links of the gifts listed in recipient_ids.
+        """
+        rows = [{"id": gift_id, **values} for gift_id, values in changes.items() if values]
+        if rows:
+            # Read (and lock until commit, see update()) the previous spent-related values of the gifts
+            # whose contribution may change
+            touched = [row["id"] for row in rows if row.keys() & set(SPENT_COLUMNS)]
+            before = {}
+            if touched:
+                stmt = (
+                    select(Gift.id, *(getattr(Gift, key) for key in SPENT_COLUMNS))
+                    .where(Gift.user_id == gift_user_id, Gift.id.in_(touched))
+                    .with_for_update(of=Gift)
+                )
+                before = {row.id: row._asdict() for row in self.db.execute(stmt)}
+            delta = sum(
+                (
+                    _spent_amount(*({**before[row["id"]], **row}[key] for key in SPENT_COLUMNS))
+                    - _spent_amount(*(before[row["id"]][key] for key in SPENT_COLUMNS))
+                    for row in rows if row["id"] in before
+                ),
+                Decimal("0"),
+            )
+
+            # get_many() reloads the rows with populate_existing, no need to sync the identity map here
+            stmt = update(Gift).where(Gift.user_id == gift_user_id).execution_options(synchronize_session=None)
+            self.db.execute(stmt, rows)
+            self._add_spent(gift_user_id, delta)
+        self._replace_links({gift_id: set(links) for gift_id, links in recipient_ids.items()})
+
+    def bulk_delete(self, gift_user_id: UUID, gift_ids: Iterable[UUID]) -> int:
+        """Delete many gifts in one statement. Returns the number of deleted rows."""
+        gift_ids = set(gift_ids)
+        if not gift_ids:
+            return 0
+        stmt = (
+            delete(Gift)
+            .where(Gift.user_id == gift_user_id, Gift.id.in_(gift_ids))
+            .returning(Gift.status, Gift.price, Gift.quantity)
+        )
+        deleted = self.db.execute(stmt).all()
+        self._add_spent(gift_user_id, -sum((_spent_amount(*row) for row in deleted), Decimal("0")))
+        bump_count(self.db, ("gifts", gift_user_id))
+        return len(deleted)
+
+    def get_many(self, gift_user_id: UUID, gift_ids: Iterable[UUID]) -> list[Gift]:
+        """Load several gifts and their recipient ids, bypassing stale identity-map state."""
+        gift_ids = set(gift_ids)
+        if not gift_ids:
+            return []
+        stmt = (
+            select(Gift)
+            .where(Gift.user_id == gift_user_id, Gift.id.in_(gift_ids))
+            .options(WITH_RECIPIENT_IDS)
+            .execution_options(populate_existing=True)
         )
-        result = self.db.execute(stmt)
-        self.db.commit()
-        return result.rowcount > 0
+        return list(self.db.execute(stmt).scalars().all())
+
+    def _add_spent(self, gift_user_id: UUID, delta: Decimal) -> None:
+        """Shift users.spent by delta within the current transaction (atomic increment, no read)."""
+        if delta:
+            self.db.execute(update(User).where(User.id == gift_user_id).values(spent=User.spent + delta))
+            invalidate_principal(self.db, gift_user_id)
+
+    def savepoint(self):
+        """Context manager running the enclosed writes in a SAVEPOINT."""
+        return self.db.begin_nested()
+
+    def rollback(self) -> None:
+        self.db.rollback()
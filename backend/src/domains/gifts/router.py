@@ -1,25 +1,28 @@
 from typing import Annotated
 import uuid
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status
 
 from src.core.pagination import PaginationDeps
+from src.infrastructure.database.session import run_db
 from src.domains.auth.dependencies import get_current_user_id
+from .filters import GiftFilterDeps
 from .service import GiftService
-from .schemas import GiftCreate, GiftUpdate, GiftResponse, PaginatedGiftsResponse
+from .schemas import GiftBatchRequest, GiftBatchResponse, GiftCreate, GiftUpdate, GiftRecipientsLink, GiftResponse, PaginatedGiftsResponse
 from .router_examples import CREATE_GIFT_EXAMPLE, UPDATE_GIFT_EXAMPLE
 
 router = APIRouter(prefix="/gifts", tags=["gifts"])
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=GiftResponse)
-def create_gift(
+async def create_gift(
     new_gift: Annotated[GiftCreate, Body(openapi_examples=CREATE_GIFT_EXAMPLE)],
     gift_service: Annotated[GiftService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Create a new gift."""
-    return gift_service.create(
+    return await run_db(
+        gift_service.create,
         user_id=user_id,
         name=new_gift.name,
         url=new_gift.url,
@@ -30,42 +33,75 @@ def create_gift(
     )
 
 
+@router.post("/batch", response_model=GiftBatchResponse)
+async def batch_gifts(
+    batch: GiftBatchRequest,
+    gift_service: Annotated[GiftService, Depends()],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+):
+    """Create, update and delete gifts in a single transaction, with a result per operation."""
+    return await run_db(gift_service.batch, user_id, batch)
+
+
 @router.get("", response_model=PaginatedGiftsResponse)
-def get_gifts(
+async def get_gifts(
     pagination: PaginationDeps,
+    filters: GiftFilterDeps,
     gift_service: Annotated[GiftService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
-    """Get all gifts for the authenticated user with pagination."""
-    return gift_service.get(pagination, user_id)
+    """Get the gifts of the authenticated user with pagination, optional filters and status facets."""
+    return await run_db(gift_service.get, pagination, user_id, filters)
 
 
 @router.get("/{gift_id}", response_model=GiftResponse)
-def get_gift(
+async def get_gift(
     gift_id: uuid.UUID,
     gift_service: Annotated[GiftService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Get a specific gift by ID."""
-    return gift_service.get_by_id(user_id, gift_id)
+    return await run_db(gift_service.get_by_id, user_id, gift_id)
 
 
 @router.patch("/{gift_id}", response_model=GiftResponse)
-def update_gift(
+async def update_gift(
     gift_id: uuid.UUID,
     update_data: Annotated[GiftUpdate, Body(openapi_examples=UPDATE_GIFT_EXAMPLE)],
     gift_service: Annotated[GiftService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Update a gift (partial update)."""
-    return gift_service.update(user_id, gift_id, update_data)
+    return await run_db(gift_service.update, user_id, gift_id, update_data)
+
+
+@router.post("/{gift_id}/recipients", response_model=GiftResponse)
+async def add_gift_recipients(
+    gift_id: uuid.UUID,
+    link: GiftRecipientsLink,
+    gift_service: Annotated[GiftService, Depends()],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+):
+    """Link recipients to a gift, keeping the existing links."""
+    return await run_db(gift_service.add_recipients, user_id, gift_id, link.recipient_ids)
+
+
+@router.delete("/{gift_id}/recipients", response_model=GiftResponse)
+async def remove_gift_recipients(
+    gift_id: uuid.UUID,
+    recipient_ids: Annotated[list[uuid.UUID], Query(min_length=1, description="Recipient IDs to unlink")],
+    gift_service: Annotated[GiftService, Depends()],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+):
+    """Unlink recipients from a gift."""
+    return await run_db(gift_service.remove_recipients, user_id, gift_id, recipient_ids)
 
 
 @router.delete("/{gift_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_gift(
+async def delete_gift(
     gift_id: uuid.UUID,
     gift_service: Annotated[GiftService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Delete a gift."""
-    gift_service.delete(user_id, gift_id)
+    await run_db(gift_service.delete, user_id, gift_id)
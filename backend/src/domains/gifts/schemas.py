@@ -1,10 +1,12 @@
 import uuid
+from typing import Annotated, Literal
 from decimal import Decimal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from src.domains.gifts.enums import GiftStatusEnum
-from src.core.pagination import PaginationMeta
+from src.core.batch import BatchMode, BatchResponse, MAX_BATCH_OPERATIONS
+from src.core.pagination import PaginationMeta, CursorPaginationMeta
 
 class GiftCreate(BaseModel):
     """Model for gift creation."""
@@ -60,6 +62,11 @@ class GiftUpdate(BaseModel):
         return value if value else None
 
 
+class GiftRecipientsLink(BaseModel):
+    """Model for adding recipients to a gift without resending the full list."""
+    recipient_ids: list[uuid.UUID] = Field(min_length=1, description="Recipient IDs to link")
+
+
 class GiftResponse(BaseModel):
     """Model for gift response."""
     id: uuid.UUID
@@ -74,7 +81,45 @@ class GiftResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class GiftFacets(BaseModel):
+    """Facet counts of a gifts list. `status` counts every status, ignoring the status filter itself."""
+    status: dict[GiftStatusEnum, int]
+
+
 class PaginatedGiftsResponse(BaseModel):
-    """Paginated response for gifts list."""
+    """Paginated response for gifts list. `facets` is only set when requested (facets=status)."""
     items: list[GiftResponse]
-    meta: PaginationMeta
+    meta: PaginationMeta | CursorPaginationMeta
+    facets: GiftFacets | None = None
+
+
+class GiftBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: GiftCreate
+
+
+class GiftBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: uuid.UUID
+    data: GiftUpdate
+
+
+class GiftBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+GiftBatchOperation = Annotated[
+    GiftBatchCreate | GiftBatchUpdate | GiftBatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class GiftBatchRequest(BaseModel):
+    """Model for a batch of gifts operations, applied in a single transaction."""
+    mode: BatchMode = Field(default="atomic", description="atomic: all or nothing, best_effort: skip failing operations")
+    operations: list[GiftBatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class GiftBatchResponse(BatchResponse[GiftResponse]):
+    """Per-operation results of a gifts batch."""
@@ -1,14 +1,15 @@
 from typing import Annotated
 import uuid
-import math
 from decimal import Decimal
 
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.exc import DBAPIError
 
-from src.core.pagination import PaginationMeta
+from src.core.batch import BatchItemError, batch_response
+from src.core.pagination import keyset_page, offset_page
 from .models import Gift
 from .repository import GiftRepository
-from .schemas import GiftUpdate, PaginatedGiftsResponse, GiftResponse
+from .schemas import GiftBatchRequest, GiftBatchResponse, GiftFacets, GiftUpdate, PaginatedGiftsResponse, GiftResponse
 from src.domains.recipients.repository import RecipientRepository
 
 
@@ -21,21 +22,38 @@ class GiftService:
         self.repo = repo
         self.recipient_repo = recipient_repo
 
-    def _resolve_recipients(self, user_id: uuid.UUID, recipient_ids: list[uuid.UUID]) -> list:
-        """Resolve recipient IDs to Recipient objects, validating ownership."""
-        recipients = []
-        for recipient_id in recipient_ids:
-            recipient = self.recipient_repo.get_by_id(user_id, recipient_id)
-            if not recipient:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Recipient {recipient_id} not found"
-                )
-            recipients.append(recipient)
-        return recipients
+    def _check_recipients(self, user_id: uuid.UUID, recipient_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+        """
+        Validate ownership of all recipient IDs in a single query.
+        Raises 404 listing every missing recipient. Returns the de-duplicated IDs.
+        """
+        recipient_ids = list(dict.fromkeys(recipient_ids))
+        owned = self.recipient_repo.get_owned_ids(user_id, recipient_ids)
+        missing = [str(recipient_id) for recipient_id in recipient_ids if recipient_id not in owned]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Recipients not found: {', '.join(missing)}"
+            )
+        return recipient_ids
+
+    def _get_gift_or_404(self, user_id: uuid.UUID, gift_id: uuid.UUID, for_update: bool = False) -> Gift:
+        if for_update:
+            gift = self.repo.get_by_id_for_update(user_id, gift_id)
+        else:
+            gift = self.repo.get_by_id(user_id, gift_id)
+        if not gift:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Gift not found"
+            )
+        return gift
 
-    def _gift_to_response(self, gift: Gift) -> GiftResponse:
-        """Convert a Gift model to a GiftResponse with recipient_ids."""
+    def _gift_to_response(self, gift: Gift, recipient_ids: list[uuid.UUID] | None = None) -> GiftResponse:
+        """
+        Convert a Gift model to a GiftResponse with recipient_ids.
+        Pass recipient_ids when they are known and gift.recipients is not loaded (right after create).
+        """
         return GiftResponse(
             id=gift.id,
             user_id=gift.user_id,
@@ -44,7 +62,7 @@ class GiftService:
             price=gift.price,
             status=gift.status,
             quantity=gift.quantity,
-            recipient_ids=[recipient.id for recipient in gift.recipients],
+            recipient_ids=[recipient.id for recipient in gift.recipients] if recipient_ids is None else recipient_ids,
         )
 
     def create(
@@ -57,7 +75,7 @@ class GiftService:
         quantity: int,
         recipient_ids: list[uuid.UUID],
     ) -> GiftResponse:
-        recipients = self._resolve_recipients(user_id, recipient_ids)
+        recipient_ids = self._check_recipients(user_id, recipient_ids)
 
         new_gift = Gift(
             user_id=user_id,
@@ -67,68 +85,76 @@ class GiftService:
             status=status_val,
             quantity=quantity,
         )
-        new_gift.recipients = recipients
-
-        created = self.repo.create(new_gift)
-        return self._gift_to_response(created)
 
-    def get(self, pagination: dict, user_id: uuid.UUID) -> PaginatedGiftsResponse:
-        page = pagination["page"]
-        limit = pagination["limit"]
+        created = self.repo.create(new_gift, recipient_ids)
+        return self._gift_to_response(created, recipient_ids)
 
-        gifts, total = self.repo.get(pagination, user_id)
+    def get(self, pagination: dict, user_id: uuid.UUID, filters: dict | None = None) -> PaginatedGiftsResponse:
+        facets = None
+        if filters and filters.get("facets") == "status":
+            facets = GiftFacets(status=self.repo.count_by_status(user_id, filters))
 
-        total_pages = math.ceil(total / limit) if total > 0 else 0
+        if pagination.get("cursor") is not None:
+            gifts, cursor_meta = keyset_page(self.repo.get_keyset(pagination, user_id, filters), pagination)
+            return PaginatedGiftsResponse(
+                items=[self._gift_to_response(g) for g in gifts],
+                meta=cursor_meta,
+                facets=facets,
+            )
 
-        meta = PaginationMeta(
-            page=page,
-            limit=limit,
-            total=total,
-            totalPages=total_pages,
-            hasPrev=page > 1,
-            hasNext=page < total_pages
-        )
+        gifts, total = self.repo.get(pagination, user_id, filters)
+        gifts, meta = offset_page(gifts, total, pagination)
 
         return PaginatedGiftsResponse(
             items=[self._gift_to_response(g) for g in gifts],
-            meta=meta
+            meta=meta,
+            facets=facets,
         )
 
     def get_by_id(self, user_id: uuid.UUID, gift_id: uuid.UUID) -> GiftResponse:
         """
         Get gift by ID. Raises 404 if not found or doesn't belong to user.
         """
-        gift = self.repo.get_by_id(user_id, gift_id)
-        if not gift:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Gift not found"
-            )
+        gift = self._get_gift_or_404(user_id, gift_id)
         return self._gift_to_response(gift)
 
     def update(self, user_id: uuid.UUID, gift_id: uuid.UUID, update_data: GiftUpdate) -> GiftResponse:
         """
         Update gift. Raises 404 if not found or doesn't belong to user.
         """
-        gift = self.repo.get_by_id(user_id, gift_id)
-        if not gift:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Gift not found"
-            )
+        gift = self._get_gift_or_404(user_id, gift_id, for_update=True)
 
         update_dict = update_data.model_dump(exclude_unset=True)
 
         # Handle recipient_ids separately
         recipient_ids = update_dict.pop("recipient_ids", None)
         if recipient_ids is not None:
-            gift.recipients = self._resolve_recipients(user_id, recipient_ids)
+            recipient_ids = self._check_recipients(user_id, recipient_ids)
 
         # Update only provided fields
         for field, value in update_dict.items():
             setattr(gift, field, value)
 
-        updated = self.repo.update(gift)
+        updated = self.repo.update(gift, recipient_ids)
+        return self._gift_to_response(updated)
+
+    def add_recipients(self, user_id: uuid.UUID, gift_id: uuid.UUID, recipient_ids: list[uuid.UUID]) -> GiftResponse:
+        """
+        Link recipients to a gift, keeping the existing links.
+        Raises 404 if the gift or any recipient is not found or doesn't belong to user.
+        """
+        gift = self._get_gift_or_404(user_id, gift_id)
+        recipient_ids = self._check_recipients(user_id, recipient_ids)
+        updated = self.repo.add_recipients(gift, recipient_ids)
+        return self._gift_to_response(updated)
+
+    def remove_recipients(self, user_id: uuid.UUID, gift_id: uuid.UUID, recipient_ids: list[uuid.UUID]) -> GiftResponse:
+        """
+        Unlink recipients from a gift. Recipients that are not linked are ignored.
+        Raises 404 if the gift is not found or doesn't belong to user.
+        """
+        gift = self._get_gift_or_404(user_id, gift_id)
+        updated = self.repo.remove_recipients(gift, recipient_ids)
         return self._gift_to_response(updated)
 
     def delete(self, user_id: uuid.UUID, gift_id: uuid.UUID) -> None:
@@ -141,3 +167,103 @@ class GiftService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Gift not found"
             )
+
+    def batch(self, user_id: uuid.UUID, batch: GiftBatchRequest) -> GiftBatchResponse:
+        """
+        Apply create/update/delete operations in one transaction.
+        Every gift and recipient referenced by the batch is validated up front with one IN query each;
+        the writes are then grouped into bulk statements (see GiftRepository.bulk_*).
+        In atomic mode any failing operation rolls the whole batch back; in best_effort mode it is skipped.
+        """
+        operations = batch.operations
+        errors = self._check_batch(user_id, operations)
+        if errors and batch.mode == "atomic":
+            return GiftBatchResponse(**batch_response(batch.mode, operations, errors, {}, {}))
+
+        pending = [(index, operation) for index, operation in enumerate(operations) if index not in errors]
+        try:
+            ids = self._apply_batch(user_id, pending)
+        except DBAPIError:
+            # Something slipped past validation (e.g. a recipient deleted concurrently):
+            # replay the operations one by one to find the offending ones.
+            self.repo.rollback()
+            ids = {}
+            for index, operation in pending:
+                try:
+                    with self.repo.savepoint():
+                        ids.update(self._apply_batch(user_id, [(index, operation)]))
+                except DBAPIError:
+                    errors[index] = BatchItemError(status.HTTP_409_CONFLICT, "Rejected by the database")
+            if errors and batch.mode == "atomic":
+                self.repo.rollback()
+                return GiftBatchResponse(**batch_response(batch.mode, operations, errors, {}, {}))
+
+        written = [ids[index] for index, operation in pending if operation.op != "delete" and index not in errors]
+        items = {gift.id: self._gift_to_response(gift) for gift in self.repo.get_many(user_id, written)}
+        return GiftBatchResponse(**batch_response(batch.mode, operations, errors, ids, items))
+
+    def _check_batch(self, user_id: uuid.UUID, operations: list) -> dict[int, BatchItemError]:
+        """Validate every operation of a batch. Returns the failing ones by index."""
+        errors = {}
+
+        targeted = set()
+        for index, operation in enumerate(operations):
+            if operation.op == "create":
+                continue
+            if operation.id in targeted:
+                errors[index] = BatchItemError(
+                    status.HTTP_409_CONFLICT, f"Gift {operation.id} is targeted by another operation of the batch"
+                )
+            targeted.add(operation.id)
+        owned_gifts = self.repo.get_owned_ids(user_id, targeted)
+
+        linked = {
+            recipient_id
+            for operation in operations if operation.op != "delete"
+            for recipient_id in operation.data.recipient_ids or ()
+        }
+        owned_recipients = self.recipient_repo.get_owned_ids(user_id, linked)
+
+        for index, operation in enumerate(operations):
+            if index in errors:
+                continue
+            if operation.op != "create" and operation.id not in owned_gifts:
+                errors[index] = BatchItemError(status.HTTP_404_NOT_FOUND, "Gift not found")
+                continue
+            if operation.op != "delete":
+                missing = [str(r) for r in dict.fromkeys(operation.data.recipient_ids or ()) if r not in owned_recipients]
+                if missing:
+                    errors[index] = BatchItemError(
+                        status.HTTP_404_NOT_FOUND, f"Recipients not found: {', '.join(missing)}"
+                    )
+        return errors
+
+    def _apply_batch(self, user_id: uuid.UUID, operations: list[tuple[int, object]]) -> dict[int, uuid.UUID]:
+        """Write validated operations with bulk statements. Returns the gift id of each operation by index."""
+        creates = [(index, operation) for index, operation in operations if operation.op == "create"]
+        updates = [(index, operation) for index, operation in operations if operation.op == "update"]
+        deletes = [(index, operation) for index, operation in operations if operation.op == "delete"]
+
+        ids = {}
+        if creates:
+            created_ids = self.repo.bulk_create(
+                user_id,
+                [operation.data.model_dump(exclude={"recipient_ids"}) for _, operation in creates],
+                [operation.data.recipient_ids for _, operation in creates],
+            )
+            ids.update(zip([index for index, _ in creates], created_ids))
+        if updates:
+            changes = {}
+            recipient_ids = {}
+            for index, operation in updates:
+                values = operation.data.model_dump(exclude_unset=True)
+                links = values.pop("recipient_ids", None)
+                if links is not None:
+                    recipient_ids[operation.id] = links
+                changes[operation.id] = values
+                ids[index] = operation.id
+            self.repo.bulk_update(user_id, changes, recipient_ids)
+        if deletes:
+            self.repo.bulk_delete(user_id, [operation.id for _, operation in deletes])
+            ids.update((index, operation.id) for index, operation in deletes)
+        return ids
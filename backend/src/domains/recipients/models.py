@@ -2,6 +2,7 @@ from __future__ import annotations
 import uuid
 
 from sqlalchemy import (
+    text,
     String,
     Text,
     ForeignKey,
@@ -55,8 +56,23 @@ class Recipient(Base):
     )
 
     __table_args__ = (
-        Index("idx_recipients_user", "user_id"),
-        Index("idx_recipients_name", "name"),
+        # Every query is scoped to a user: (user_id, sort key, id) serves the filter, the ORDER BY
+        # (scanned backward for descending orders) and the keyset seek. Also covers the user_id FK.
+        Index("idx_recipients_user_name_id", "user_id", "name", "id"),
+        Index("idx_recipients_user_created_at_id", "user_id", "created_at", "id"),
+        # Text search (src/core/search.py): trigram GIN indexes serve ILIKE '%q%' (needs pg_trgm),
+        # the tsvector one matches the words of long notes. Same expression as fulltext_document().
+        Index(
+            "idx_recipients_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_recipients_notes_trgm", "notes", postgresql_using="gin", postgresql_ops={"notes": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_recipients_notes_fts",
+            text("to_tsvector('simple'::regconfig, coalesce(notes, ''))"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
     )
 
 class GroupMember(Base):
@@ -1,63 +1,210 @@
-from typing import Annotated
+from typing import Iterable
 from uuid import UUID
 
-from fastapi import Depends
-from sqlalchemy import select, delete, func
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, bindparam, select, delete, func, insert, update, tuple_
+from sqlalchemy.orm import selectinload
 
-from src.infrastructure.database.session import get_db
-from .models import Recipient
+from src.core.count_cache import bump_count, cached_count
+from src.core.pagination import apply_keyset
+from src.core.search import text_match
+from src.infrastructure.database.session import DbSession
+from src.domains.gifts.models import Gift
+from .models import Recipient, GiftRecipient
+
+# Responses only need the linked gift ids: load them for a whole page in one
+# extra SELECT (gift_recipients JOIN gifts, ids only) instead of one lazy load per recipient.
+WITH_GIFT_IDS = selectinload(Recipient.gifts).load_only(Gift.id)
+
+# Hot read statements built once with bound parameters (see the gifts repository).
+# id breaks ties so pages are stable; the orders match idx_recipients_user_*_id (no sort step)
+_PAGE_ORDERINGS = {
+    "asc": (Recipient.name.asc(), Recipient.id.asc()),
+    "desc": (Recipient.name.desc(), Recipient.id.desc()),
+    "default": (Recipient.created_at.desc(), Recipient.id.desc()),
+}
+_BY_USER = select(Recipient).where(Recipient.user_id == bindparam("user_id"))
+# (sort, with the window total) -> offset page; binds user_id, offset and limit
+_PAGES = {
+    (sort, with_total): (
+        (_BY_USER.add_columns(func.count().over().label("total")) if with_total else _BY_USER)
+        .order_by(*ordering)
+        .offset(bindparam("offset", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+        .options(WITH_GIFT_IDS)
+    )
+    for sort, ordering in _PAGE_ORDERINGS.items()
+    for with_total in (False, True)
+}
+_BY_ID = (
+    select(Recipient)
+    .where(Recipient.user_id == bindparam("user_id"), Recipient.id == bindparam("recipient_id"))
+    .options(WITH_GIFT_IDS)
+)
+_COUNT = select(func.count(Recipient.id)).where(Recipient.user_id == bindparam("user_id"))
 
 
 class RecipientRepository:
-    def __init__(self, db: Annotated[Session, Depends(get_db)]):
+    def __init__(self, db: DbSession):
         self.db = db
 
-    def create(self, new_recipient: Recipient) -> Recipient:
+    def _reload(self, recipient: Recipient) -> Recipient:
+        """Refresh a recipient after a write, together with its gift ids."""
+        stmt = (
+            select(Recipient)
+            .where(Recipient.id == recipient.id)
+            .options(WITH_GIFT_IDS)
+            .execution_options(populate_existing=True)
+        )
+        return self.db.execute(stmt).scalar_one()
+
+    def create(self, new_recipient: Recipient, gift_ids: Iterable[UUID] = ()) -> Recipient:
+        """
+        Insert a recipient and its links to the given (already validated) gift ids.
+        The flush is a single INSERT ... RETURNING created_at, so the recipient is complete without a re-fetch;
+        its gifts collection is not loaded (the caller knows the ids it linked).
+        """
         self.db.add(new_recipient)
-        self.db.commit()
-        self.db.refresh(new_recipient)
+        self.db.flush()
+        if gift_ids:
+            self._insert_links(new_recipient.id, gift_ids)
+        bump_count(self.db, ("recipients", new_recipient.user_id))
         return new_recipient
 
-    def get(self, pagination: dict, recipient_user_id: UUID) -> tuple[list[Recipient], int]:
+    def _search(self, stmt, q: str | None):
+        """Restrict a select on recipients to the ones whose name or notes match q (see src.core.search)."""
+        if q is None:
+            return stmt
+        dialect = self.db.get_bind().dialect.name
+        return stmt.where(text_match(q, [Recipient.name], [Recipient.notes], dialect=dialect))
+
+    def count(self, recipient_user_id: UUID, q: str | None = None) -> int:
+        # Count query - optimized to only count IDs
+        return self.db.execute(self._search(_COUNT, q), {"user_id": recipient_user_id}).scalar() or 0
+
+    def get(self, pagination: dict, recipient_user_id: UUID, q: str | None = None) -> tuple[list[Recipient], int | None]:
+        """
+        Offset page. The total depends on pagination["count"] (see CountStrategy):
+        with "none" it is None and up to limit + 1 rows are returned to derive hasNext.
+        The cached total is per user only: with a search, "cached" counts exactly.
+        """
         sort = pagination["sort"]
         page = pagination["page"]
         limit = pagination["limit"]
-        
-        # Base query with filter
-        base_stmt = select(Recipient).where(Recipient.user_id == recipient_user_id)
-        
-        # Count query - optimized to only count IDs
-        count_stmt = select(func.count(Recipient.id)).where(Recipient.user_id == recipient_user_id)
-        total = self.db.execute(count_stmt).scalar() or 0
-        
-        # Items query with sorting and pagination
-        stmt = base_stmt
-        if sort == "asc":
-            stmt = stmt.order_by(Recipient.name.asc())
-        elif sort == "desc":
-            stmt = stmt.order_by(Recipient.name.desc())
+        strategy = pagination.get("count", "exact")
+        if strategy == "cached" and q is not None:
+            strategy = "exact"
+
+        offset = (page - 1) * limit
+
+        if strategy == "none":
+            return self._page(sort, recipient_user_id, q, offset, limit + 1), None
+
+        if strategy == "window":
+            # The window is evaluated before OFFSET/LIMIT: every row carries the full total.
+            rows = self._page(sort, recipient_user_id, q, offset, limit, with_total=True)
+            if rows:
+                return [row[0] for row in rows], rows[0].total
+            # Past the last page there is no row to read the total from.
+            return [], self.count(recipient_user_id, q) if page > 1 else 0
+
+        if strategy == "cached":
+            total = cached_count(self.db, ("recipients", recipient_user_id), lambda: self.count(recipient_user_id))
         else:
-            stmt = stmt.order_by(Recipient.created_at.desc())
-        
-        stmt = stmt.offset((page - 1) * limit).limit(limit)
-        
-        recipients = self.db.execute(stmt).scalars().all()
-        return list(recipients), total
-    
+            total = self.count(recipient_user_id, q)
+
+        return self._page(sort, recipient_user_id, q, offset, limit), total
+
+    def _page(
+        self, sort: str, recipient_user_id: UUID, q: str | None, offset: int, limit: int, with_total: bool = False,
+    ) -> list:
+        """Rows of a prebuilt page statement; a search adds its WHERE clause to it (only then is a new construct built)."""
+        stmt = self._search(_PAGES[sort, with_total], q)
+        result = self.db.execute(stmt, {"user_id": recipient_user_id, "offset": offset, "limit": limit})
+        return result.all() if with_total else list(result.scalars().all())
+
+    def get_keyset(self, pagination: dict, recipient_user_id: UUID, q: str | None = None) -> list[Recipient]:
+        """
+        Keyset page: seeks on (recipients.user_id, sort key, id) instead of skipping OFFSET rows,
+        so deep pages cost the same as the first one. Returns up to limit + 1 rows (see apply_keyset).
+        """
+        stmt = self._search(select(Recipient).where(Recipient.user_id == recipient_user_id), q)
+        stmt = apply_keyset(stmt, Recipient, pagination).options(WITH_GIFT_IDS)
+        return list(self.db.execute(stmt).scalars().all())
+
     def get_by_id(self, recipient_user_id: UUID, recipient_id: UUID) -> Recipient | None:
-        stmt = select(Recipient).where(
-            Recipient.user_id == recipient_user_id,
-            Recipient.id == recipient_id
-        )
-        recipient = self.db.execute(stmt).scalar_one_or_none()
+        recipient = self.db.execute(
+            _BY_ID, {"user_id": recipient_user_id, "recipient_id": recipient_id}
+        ).scalar_one_or_none()
         return recipient
     
-    def update(self, recipient: Recipient) -> Recipient:
-        """Update existing recipient in database."""
-        self.db.commit()
-        self.db.refresh(recipient)
-        return recipient
+    def update(self, recipient: Recipient, gift_ids: Iterable[UUID] | None = None) -> Recipient:
+        """
+        Update existing recipient in database.
+        When gift_ids is given, the links are replaced by writing only the difference.
+        """
+        if gift_ids is not None:
+            self._replace_links({recipient.id: set(gift_ids)})
+        self.db.flush()
+        return self._reload(recipient)
+
+    def add_gifts(self, recipient: Recipient, gift_ids: Iterable[UUID]) -> Recipient:
+        """Link gifts to a recipient. Already linked ids are ignored."""
+        self._insert_links(recipient.id, set(gift_ids) - self._linked_ids(recipient.id))
+        return self._reload(recipient)
+
+    def remove_gifts(self, recipient: Recipient, gift_ids: Iterable[UUID]) -> Recipient:
+        """Unlink gifts from a recipient. Ids that are not linked are ignored."""
+        self._delete_links(recipient.id, set(gift_ids))
+        return self._reload(recipient)
+
+    def get_owned_ids(self, recipient_user_id: UUID, recipient_ids: Iterable[UUID]) -> set[UUID]:
+        """Return the subset of recipient_ids that exist and belong to the user, in a single IN query."""
+        recipient_ids = set(recipient_ids)
+        if not recipient_ids:
+            return set()
+        stmt = select(Recipient.id).where(Recipient.user_id == recipient_user_id, Recipient.id.in_(recipient_ids))
+        return set(self.db.execute(stmt).scalars().all())
+
+    # gift_recipients rows are written directly: assigning the ORM collection would
+    # delete and re-insert every link of the recipient.
+
+    def _replace_links(self, links: dict[UUID, set[UUID]]) -> None:
+        """Make the links of each recipient in `links` exactly the given gift ids, writing only the difference."""
+        if not links:
+            return
+        stmt = select(GiftRecipient.recipient_id, GiftRecipient.gift_id).where(GiftRecipient.recipient_id.in_(links))
+        current = set(map(tuple, self.db.execute(stmt)))
+        wanted = {(recipient_id, gift_id) for recipient_id, gift_ids in links.items() for gift_id in gift_ids}
+        stale = current - wanted
+        if stale:
+            self.db.execute(
+                delete(GiftRecipient).where(tuple_(GiftRecipient.recipient_id, GiftRecipient.gift_id).in_(stale))
+            )
+        added = wanted - current
+        if added:
+            self.db.execute(
+                insert(GiftRecipient),
+                [{"recipient_id": recipient_id, "gift_id": gift_id} for recipient_id, gift_id in added],
+            )
+
+    def _linked_ids(self, recipient_id: UUID) -> set[UUID]:
+        stmt = select(GiftRecipient.gift_id).where(GiftRecipient.recipient_id == recipient_id)
+        return set(self.db.execute(stmt).scalars().all())
+
+    def _insert_links(self, recipient_id: UUID, gift_ids: Iterable[UUID]) -> None:
+        rows = [{"recipient_id": recipient_id, "gift_id": gift_id} for gift_id in set(gift_ids)]
+        if rows:
+            self.db.execute(insert(GiftRecipient), rows)
+
+    def _delete_links(self, recipient_id: UUID, gift_ids: Iterable[UUID]) -> None:
+        gift_ids = set(gift_ids)
+        if gift_ids:
+            self.db.execute(
+                delete(GiftRecipient).where(
+                    GiftRecipient.recipient_id == recipient_id,
+                    GiftRecipient.gift_id.in_(gift_ids),
+                )
+            )
     
     def delete(self, recipient_user_id: UUID, recipient_id: UUID) -> bool:
         """
@@ -69,5 +216,63 @@ class RecipientRepository:
             Recipient.id == recipient_id
         )
         result = self.db.execute(stmt)
-        self.db.commit()
+        if result.rowcount > 0:
+            bump_count(self.db, ("recipients", recipient_user_id))
         return result.rowcount > 0
+
+    def bulk_create(self, recipient_user_id: UUID, rows: list[dict], gift_ids: list[list[UUID]]) -> list[UUID]:
+        """
+        Insert many recipients with a single INSERT ... RETURNING (batched by insertmanyvalues), then all their links.
+        gift_ids[i] are the links of rows[i]. Returns the new ids in the order of rows.
+        """
+        stmt = insert(Recipient).returning(Recipient.id, sort_by_parameter_order=True)
+        recipient_ids = list(self.db.scalars(stmt, [{**row, "user_id": recipient_user_id} for row in rows]))
+        self._replace_links({recipient_id: set(links) for recipient_id, links in zip(recipient_ids, gift_ids) if links})
+        bump_count(self.db, ("recipients", recipient_user_id))
+        return recipient_ids
+
+    def bulk_update(
+        self,
+        recipient_user_id: UUID,
+        changes: dict[UUID, dict],
+        gift_ids: dict[UUID, Iterable[UUID]],
+    ) -> None:
+        """
+        Apply column changes per recipient id with executemany UPDATEs (one per distinct set of columns),
+        then replace the links of the recipients listed in gift_ids.
+        """
+        rows = [{"id": recipient_id, **values} for recipient_id, values in changes.items() if values]
+        if rows:
+            # get_many() reloads the rows with populate_existing, no need to sync the identity map here
+            stmt = update(Recipient).where(Recipient.user_id == recipient_user_id).execution_options(synchronize_session=None)
+            self.db.execute(stmt, rows)
+        self._replace_links({recipient_id: set(links) for recipient_id, links in gift_ids.items()})
+
+    def bulk_delete(self, recipient_user_id: UUID, recipient_ids: Iterable[UUID]) -> int:
+        """Delete many recipients in one statement. Returns the number of deleted rows."""
+        recipient_ids = set(recipient_ids)
+        if not recipient_ids:
+            return 0
+        result = self.db.execute(delete(Recipient).where(Recipient.user_id == recipient_user_id, Recipient.id.in_(recipient_ids)))
+        bump_count(self.db, ("recipients", recipient_user_id))
+        return result.rowcount
+
+    def get_many(self, recipient_user_id: UUID, recipient_ids: Iterable[UUID]) -> list[Recipient]:
+        """Load several recipients and their gift ids, bypassing stale identity-map state."""
+        recipient_ids = set(recipient_ids)
+        if not recipient_ids:
+            return []
+        stmt = (
+            select(Recipient)
+            .where(Recipient.user_id == recipient_user_id, Recipient.id.in_(recipient_ids))
+            .options(WITH_GIFT_IDS)
+            .execution_options(populate_existing=True)
+        )
+        return list(self.db.execute(stmt).scalars().all())
+
+    def savepoint(self):
+        """Context manager running the enclosed writes in a SAVEPOINT."""
+        return self.db.begin_nested()
+
+    def rollback(self) -> None:
+        self.db.rollback()
@@ -1,25 +1,28 @@
 from typing import Annotated
 import uuid
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status
 
 from src.core.pagination import PaginationDeps
+from src.core.search import SEARCH_MAX_LENGTH
+from src.infrastructure.database.session import run_db
 from src.domains.auth.dependencies import get_current_user_id
 from .service import RecipientService
-from .schemas import RecipientCreate, RecipientUpdate, RecipientResponse, PaginatedRecipientsResponse
+from .schemas import RecipientBatchRequest, RecipientBatchResponse, RecipientCreate, RecipientUpdate, RecipientResponse, PaginatedRecipientsResponse
 from .router_examples import CREATE_RECIPIENT_EXAMPLE, UPDATE_RECIPIENT_EXAMPLE
 
 router = APIRouter(prefix="/recipients", tags=["recipients"])
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=RecipientResponse)
-def create_recipient(
+async def create_recipient(
     new_recipient: Annotated[RecipientCreate, Body(openapi_examples=CREATE_RECIPIENT_EXAMPLE)],
     recipient_service: Annotated[RecipientService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Create a new recipient."""
-    return recipient_service.create(
+    return await run_db(
+        recipient_service.create,
         user_id=user_id,
         name=new_recipient.name,
         notes=new_recipient.notes,
@@ -27,42 +30,56 @@ def create_recipient(
     )
 
 
+@router.post("/batch", response_model=RecipientBatchResponse)
+async def batch_recipients(
+    batch: RecipientBatchRequest,
+    recipient_service: Annotated[RecipientService, Depends()],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+):
+    """Create, update and delete recipients in a single transaction, with a result per operation."""
+    return await run_db(recipient_service.batch, user_id, batch)
+
+
 @router.get("", response_model=PaginatedRecipientsResponse)
-def get_recipients(
+async def get_recipients(
     pagination: PaginationDeps,
     recipient_service: Annotated[RecipientService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    q: Annotated[
+        str | None,
+        Query(min_length=1, max_length=SEARCH_MAX_LENGTH, description="Text search over the name and notes"),
+    ] = None,
 ):
-    """Get all recipients for the authenticated user with pagination."""
-    return recipient_service.get(pagination, user_id)
+    """Get the recipients of the authenticated user with pagination, optionally matching a text search."""
+    return await run_db(recipient_service.get, pagination, user_id, (q.strip() or None) if q else None)
 
 
 @router.get("/{recipient_id}", response_model=RecipientResponse)
-def get_recipient(
+async def get_recipient(
     recipient_id: uuid.UUID,
     recipient_service: Annotated[RecipientService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Get a specific recipient by ID."""
-    return recipient_service.get_by_id(user_id, recipient_id)
+    return await run_db(recipient_service.get_by_id, user_id, recipient_id)
 
 
 @router.patch("/{recipient_id}", response_model=RecipientResponse)
-def update_recipient(
+async def update_recipient(
     recipient_id: uuid.UUID,
     update_data: Annotated[RecipientUpdate, Body(openapi_examples=UPDATE_RECIPIENT_EXAMPLE)],
     recipient_service: Annotated[RecipientService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Update a recipient (partial update)."""
-    return recipient_service.update(user_id, recipient_id, update_data)
+    return await run_db(recipient_service.update, user_id, recipient_id, update_data)
 
 
 @router.delete("/{recipient_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_recipient(
+async def delete_recipient(
     recipient_id: uuid.UUID,
     recipient_service: Annotated[RecipientService, Depends()],
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
 ):
     """Delete a recipient."""
-    recipient_service.delete(user_id, recipient_id)
\ No newline at end of file
+    await run_db(recipient_service.delete, user_id, recipient_id)
\ No newline at end of file
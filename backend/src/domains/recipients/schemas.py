@@ -1,8 +1,10 @@
 import uuid
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from src.core.pagination import PaginationMeta
+from src.core.batch import BatchMode, BatchResponse, MAX_BATCH_OPERATIONS
+from src.core.pagination import PaginationMeta, CursorPaginationMeta
 
 class RecipientCreate(BaseModel):
     """Model for recipient creation."""
@@ -66,4 +68,36 @@ class RecipientResponse(BaseModel):
 class PaginatedRecipientsResponse(BaseModel):
     """Paginated response for recipients list."""
     items: list[RecipientResponse]
-    meta: PaginationMeta
+    meta: PaginationMeta | CursorPaginationMeta
+
+
+class RecipientBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: RecipientCreate
+
+
+class RecipientBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: uuid.UUID
+    data: RecipientUpdate
+
+
+class RecipientBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+RecipientBatchOperation = Annotated[
+    RecipientBatchCreate | RecipientBatchUpdate | RecipientBatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class RecipientBatchRequest(BaseModel):
+    """Model for a batch of recipients operations, applied in a single transaction."""
+    mode: BatchMode = Field(default="atomic", description="atomic: all or nothing, best_effort: skip failing operations")
+    operations: list[RecipientBatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class RecipientBatchResponse(BatchResponse[RecipientResponse]):
+    """Per-operation results of a recipients batch."""
@@ -1,13 +1,14 @@
 from typing import Annotated
 import uuid
-import math
 
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.exc import DBAPIError
 
-from src.core.pagination import PaginationMeta
+from src.core.batch import BatchItemError, batch_response
+from src.core.pagination import keyset_page, offset_page
 from .models import Recipient
 from .repository import RecipientRepository
-from .schemas import RecipientUpdate, PaginatedRecipientsResponse, RecipientResponse
+from .schemas import RecipientBatchRequest, RecipientBatchResponse, RecipientUpdate, PaginatedRecipientsResponse, RecipientResponse
 from src.domains.gifts.repository import GiftRepository
 
 
@@ -20,27 +21,32 @@ class RecipientService:
         self.repo = repo
         self.gift_repo = gift_repo
 
-    def _resolve_gifts(self, user_id: uuid.UUID, gift_ids: list[uuid.UUID]) -> list:
-        """Resolve gift IDs to Gift objects, validating ownership."""
-        gifts = []
-        for gift_id in gift_ids:
-            gift = self.gift_repo.get_by_id(user_id, gift_id)
-            if not gift:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Gift {gift_id} not found"
-                )
-            gifts.append(gift)
-        return gifts
+    def _check_gifts(self, user_id: uuid.UUID, gift_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+        """
+        Validate ownership of all gift IDs in a single query.
+        Raises 404 listing every missing gift. Returns the de-duplicated IDs.
+        """
+        gift_ids = list(dict.fromkeys(gift_ids))
+        owned = self.gift_repo.get_owned_ids(user_id, gift_ids)
+        missing = [str(gift_id) for gift_id in gift_ids if gift_id not in owned]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Gifts not found: {', '.join(missing)}"
+            )
+        return gift_ids
 
-    def _recipient_to_response(self, recipient: Recipient) -> RecipientResponse:
-        """Convert a Recipient model to a RecipientResponse with gift_ids."""
+    def _recipient_to_response(self, recipient: Recipient, gift_ids: list[uuid.UUID] | None = None) -> RecipientResponse:
+        """
+        Convert a Recipient model to a RecipientResponse with gift_ids.
+        Pass gift_ids when they are known and recipient.gifts is not loaded (right after create).
+        """
         return RecipientResponse(
             id=recipient.id,
             user_id=recipient.user_id,
             name=recipient.name,
             notes=recipient.notes,
-            gift_ids=[gift.id for gift in recipient.gifts],
+            gift_ids=[gift.id for gift in recipient.gifts] if gift_ids is None else gift_ids,
         )
 
     def create(
@@ -50,31 +56,24 @@ class RecipientService:
         notes: str | None,
         gift_ids: list[uuid.UUID],
     ) -> RecipientResponse:
-        gifts = self._resolve_gifts(user_id, gift_ids)
+        gift_ids = self._check_gifts(user_id, gift_ids)
 
         new_recipient = Recipient(user_id=user_id, name=name, notes=notes)
-        new_recipient.gifts = gifts
 
-        created = self.repo.create(new_recipient)
-        return self._recipient_to_response(created)
+        created = self.repo.create(new_recipient, gift_ids)
+        return self._recipient_to_response(created, gift_ids)
+
+    def get(self, pagination: dict, user_id: uuid.UUID, q: str | None = None) -> PaginatedRecipientsResponse:
+        if pagination.get("cursor") is not None:
+            recipients, cursor_meta = keyset_page(self.repo.get_keyset(pagination, user_id, q), pagination)
+            return PaginatedRecipientsResponse(
+                items=[self._recipient_to_response(r) for r in recipients],
+                meta=cursor_meta
+            )
+
+        recipients, total = self.repo.get(pagination, user_id, q)
+        recipients, meta = offset_page(recipients, total, pagination)
 
-    def get(self, pagination: dict, user_id: uuid.UUID) -> PaginatedRecipientsResponse:
-        page = pagination["page"]
-        limit = pagination["limit"]
-        
-        recipients, total = self.repo.get(pagination, user_id)
-        
-        total_pages = math.ceil(total / limit) if total > 0 else 0
-        
-        meta = PaginationMeta(
-            page=page,
-            limit=limit,
-            total=total,
-            totalPages=total_pages,
-            hasPrev=page > 1,
-            hasNext=page < total_pages
-        )
-        
         return PaginatedRecipientsResponse(
             items=[self._recipient_to_response(r) for r in recipients],
             meta=meta
@@ -108,13 +107,13 @@ class RecipientService:
         # Handle gift_ids separately
         gift_ids = update_dict.pop("gift_ids", None)
         if gift_ids is not None:
-            recipient.gifts = self._resolve_gifts(user_id, gift_ids)
+            gift_ids = self._check_gifts(user_id, gift_ids)
 
         # Update only provided fields
         for field, value in update_dict.items():
             setattr(recipient, field, value)
         
-        updated = self.repo.update(recipient)
+        updated = self.repo.update(recipient, gift_ids)
         return self._recipient_to_response(updated)
 
     def delete(self, user_id: uuid.UUID, recipient_id: uuid.UUID) -> None:
@@ -126,4 +125,104 @@ class RecipientService:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Recipient not found"
-            )
\ No newline at end of file
+            )
+
+    def batch(self, user_id: uuid.UUID, batch: RecipientBatchRequest) -> RecipientBatchResponse:
+        """
+        Apply create/update/delete operations in one transaction.
+        Every recipient and gift referenced by the batch is validated up front with one IN query each;
+        the writes are then grouped into bulk statements (see RecipientRepository.bulk_*).
+        In atomic mode any failing operation rolls the whole batch back; in best_effort mode it is skipped.
+        """
+        operations = batch.operations
+        errors = self._check_batch(user_id, operations)
+        if errors and batch.mode == "atomic":
+            return RecipientBatchResponse(**batch_response(batch.mode, operations, errors, {}, {}))
+
+        pending = [(index, operation) for index, operation in enumerate(operations) if index not in errors]
+        try:
+            ids = self._apply_batch(user_id, pending)
+        except DBAPIError:
+            # Something slipped past validation (e.g. a gift deleted concurrently):
+            # replay the operations one by one to find the offending ones.
+            self.repo.rollback()
+            ids = {}
+            for index, operation in pending:
+                try:
+                    with self.repo.savepoint():
+                        ids.update(self._apply_batch(user_id, [(index, operation)]))
+                except DBAPIError:
+                    errors[index] = BatchItemError(status.HTTP_409_CONFLICT, "Rejected by the database")
+            if errors and batch.mode == "atomic":
+                self.repo.rollback()
+                return RecipientBatchResponse(**batch_response(batch.mode, operations, errors, {}, {}))
+
+        written = [ids[index] for index, operation in pending if operation.op != "delete" and index not in errors]
+        items = {r.id: self._recipient_to_response(r) for r in self.repo.get_many(user_id, written)}
+        return RecipientBatchResponse(**batch_response(batch.mode, operations, errors, ids, items))
+
+    def _check_batch(self, user_id: uuid.UUID, operations: list) -> dict[int, BatchItemError]:
+        """Validate every operation of a batch. Returns the failing ones by index."""
+        errors = {}
+
+        targeted = set()
+        for index, operation in enumerate(operations):
+            if operation.op == "create":
+                continue
+            if operation.id in targeted:
+                errors[index] = BatchItemError(
+                    status.HTTP_409_CONFLICT, f"Recipient {operation.id} is targeted by another operation of the batch"
+                )
+            targeted.add(operation.id)
+        owned_recipients = self.repo.get_owned_ids(user_id, targeted)
+
+        linked = {
+            gift_id
+            for operation in operations if operation.op != "delete"
+            for gift_id in operation.data.gift_ids or ()
+        }
+        owned_gifts = self.gift_repo.get_owned_ids(user_id, linked)
+
+        for index, operation in enumerate(operations):
+            if index in errors:
+                continue
+            if operation.op != "create" and operation.id not in owned_recipients:
+                errors[index] = BatchItemError(status.HTTP_404_NOT_FOUND, "Recipient not found")
+                continue
+            if operation.op != "delete":
+                missing = [str(g) for g in dict.fromkeys(operation.data.gift_ids or ()) if g not in owned_gifts]
+                if missing:
+                    errors[index] = BatchItemError(
+                        status.HTTP_404_NOT_FOUND, f"Gifts not found: {', '.join(missing)}"
+                    )
+        return errors
+
+    def _apply_batch(self, user_id: uuid.UUID, operations: list[tuple[int, object]]) -> dict[int, uuid.UUID]:
+        """Write validated operations with bulk statements. Returns the recipient id of each operation by index."""
+        creates = [(index, operation) for index, operation in operations if operation.op == "create"]
+        updates = [(index, operation) for index, operation in operations if operation.op == "update"]
+        deletes = [(index, operation) for index, operation in operations if operation.op == "delete"]
+
+        ids = {}
+        if creates:
+            created_ids = self.repo.bulk_create(
+                user_id,
+                [operation.data.model_dump(exclude={"gift_ids"}) for _, operation in creates],
+                [operation.data.gift_ids for _, operation in creates],
+            )
+            ids.update(zip([index for index, _ in creates], created_ids))
+        if updates:
+            changes = {}
+            gift_ids = {}
+            for index, operation in updates:
+                values = operation.data.model_dump(exclude_unset=True)
+                links = values.pop("gift_ids", None)
+                if links is not None:
+                    gift_ids[operation.id] = links
+                changes[operation.id] = values
+                ids[index] = operation.id
+            self.repo.bulk_update(user_id, changes, gift_ids)
+        if deletes:
+            self.repo.bulk_delete(user_id, [operation.id for _, operation in deletes])
+            ids.update((index, operation.id) for index, operation in deletes)
+        return ids
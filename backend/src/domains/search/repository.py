@@ -0,0 +1,47 @@
+from uuid import UUID
+
+from sqlalchemy import func, literal, select, union_all
+
+from src.core.search import text_match, text_rank
+from src.infrastructure.database.session import DbSession
+from src.domains.gifts.models import Gift
+from src.domains.recipients.models import Recipient
+
+
+class SearchRepository:
+    def __init__(self, db: DbSession):
+        self.db = db
+
+    def search(self, user_id: UUID, q: str, page: int, limit: int) -> tuple[list, int]:
+        """
+        Gifts (name, url) and recipients (name, notes) of the user matching q, best rank first.
+        One UNION ALL for the page and one COUNT over the same union for the total.
+        Rows carry type, id, name, detail (url or notes, for highlighting) and rank.
+        """
+        dialect = self.db.get_bind().dialect.name
+        gifts = select(
+            literal("gift").label("type"),
+            Gift.id.label("id"),
+            Gift.name.label("name"),
+            Gift.url.label("detail"),
+            text_rank(q, Gift.name, [Gift.url], dialect=dialect).label("rank"),
+        ).where(Gift.user_id == user_id, text_match(q, [Gift.name, Gift.url], dialect=dialect))
+        recipients = select(
+            literal("recipient").label("type"),
+            Recipient.id.label("id"),
+            Recipient.name.label("name"),
+            Recipient.notes.label("detail"),
+            text_rank(q, Recipient.name, fulltext_columns=[Recipient.notes], dialect=dialect).label("rank"),
+        ).where(Recipient.user_id == user_id, text_match(q, [Recipient.name], [Recipient.notes], dialect=dialect))
+        hits = union_all(gifts, recipients).subquery("hits")
+
+        total = self.db.execute(select(func.count()).select_from(hits)).scalar_one()
+        if not total:
+            return [], 0
+        stmt = (
+            select(hits)
+            .order_by(hits.c.rank.desc(), hits.c.name, hits.c.id)
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).all()), total
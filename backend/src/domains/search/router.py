@@ -0,0 +1,30 @@
+from typing import Annotated
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from src.core.search import SEARCH_MAX_LENGTH
+from src.infrastructure.database.session import run_db
+from src.domains.auth.dependencies import get_current_user_id
+from .schemas import SearchResponse
+from .service import SearchService
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    search_service: Annotated[SearchService, Depends()],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    q: Annotated[str, Query(min_length=1, max_length=SEARCH_MAX_LENGTH, description="Text to look for")],
+    page: Annotated[int, Query(ge=1, description="Page number")] = 1,
+    limit: Annotated[int, Query(ge=1, le=100, description="Items per page")] = 10,
+):
+    """
+    Search the gifts (name, URL) and recipients (name, notes) of the authenticated user, best matches first.
+    Raises 422 if q is blank (whitespace only would match everything).
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="q cannot be blank")
+    return await run_db(search_service.search, user_id, q, page, limit)
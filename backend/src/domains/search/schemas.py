@@ -0,0 +1,24 @@
+import uuid
+from typing import Literal
+
+from pydantic import BaseModel
+
+from src.core.pagination import PaginationMeta
+
+
+class SearchHit(BaseModel):
+    """
+    One search result. `highlights` maps each matching field to its HTML-escaped text
+    with the matches wrapped in <mark> (a snippet around the first match for notes).
+    """
+    type: Literal["gift", "recipient"]
+    id: uuid.UUID
+    name: str
+    rank: float
+    highlights: dict[str, str]
+
+
+class SearchResponse(BaseModel):
+    """Ranked, paginated hits across gifts and recipients."""
+    items: list[SearchHit]
+    meta: PaginationMeta
@@ -0,0 +1,37 @@
+from typing import Annotated
+import uuid
+
+from fastapi import Depends
+
+from src.core.pagination import offset_page
+from src.core.search import highlight
+from .repository import SearchRepository
+from .schemas import SearchHit, SearchResponse
+
+# Characters kept around the first match of a recipient's notes (up to 6000 characters)
+NOTES_SNIPPET_LENGTH = 160
+
+
+class SearchService:
+    def __init__(self, repo: Annotated[SearchRepository, Depends()]):
+        self.repo = repo
+
+    def search(self, user_id: uuid.UUID, q: str, page: int, limit: int) -> SearchResponse:
+        rows, total = self.repo.search(user_id, q, page, limit)
+        items, meta = offset_page([self._to_hit(row, q) for row in rows], total, {"page": page, "limit": limit})
+        return SearchResponse(items=items, meta=meta)
+
+    def _to_hit(self, row, q: str) -> SearchHit:
+        """Build a hit with the highlighted fields (on postgresql a notes hit may match word by word only)."""
+        detail_field = "url" if row.type == "gift" else "notes"
+        highlights = {
+            "name": highlight(row.name, q),
+            detail_field: highlight(row.detail, q, context=NOTES_SNIPPET_LENGTH if detail_field == "notes" else None),
+        }
+        return SearchHit(
+            type=row.type,
+            id=row.id,
+            name=row.name,
+            rank=round(float(row.rank), 4),
+            highlights={field: text for field, text in highlights.items() if text is not None},
+        )
@@ -0,0 +1,45 @@
+from uuid import UUID
+
+from sqlalchemy import select
+
+from src.infrastructure.database.session import DbSession
+from src.domains.gifts.models import Gift
+from src.domains.recipients.models import Recipient, GiftRecipient
+
+
+class SnapshotRepository:
+    """
+    Flat column reads for the snapshot: plain tuples, no ORM instances, identity map or relationship loads.
+    Each query has a deterministic order so an unchanged dataset always serializes (and hashes) the same.
+    """
+
+    def __init__(self, db: DbSession):
+        self.db = db
+
+    def get_gifts(self, user_id: UUID) -> list[tuple]:
+        """(id, name, url, price, status, quantity) rows, oldest first (idx_gifts_user_created_at_id)."""
+        stmt = (
+            select(Gift.id, Gift.name, Gift.url, Gift.price, Gift.status, Gift.quantity)
+            .where(Gift.user_id == user_id)
+            .order_by(Gift.created_at, Gift.id)
+        )
+        return list(self.db.execute(stmt).all())
+
+    def get_recipients(self, user_id: UUID) -> list[tuple]:
+        """(id, name, notes) rows, oldest first (idx_recipients_user_created_at_id)."""
+        stmt = (
+            select(Recipient.id, Recipient.name, Recipient.notes)
+            .where(Recipient.user_id == user_id)
+            .order_by(Recipient.created_at, Recipient.id)
+        )
+        return list(self.db.execute(stmt).all())
+
+    def get_links(self, user_id: UUID) -> list[tuple[UUID, UUID]]:
+        """(gift_id, recipient_id) pairs of the user's gifts (links never cross users)."""
+        stmt = (
+            select(GiftRecipient.gift_id, GiftRecipient.recipient_id)
+            .join(Gift, Gift.id == GiftRecipient.gift_id)
+            .where(Gift.user_id == user_id)
+            .order_by(GiftRecipient.gift_id, GiftRecipient.recipient_id)
+        )
+        return list(self.db.execute(stmt).all())
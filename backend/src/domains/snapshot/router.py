@@ -0,0 +1,35 @@
+from typing import Annotated
+import uuid
+
+from fastapi import APIRouter, Depends, Header, Response, status
+
+from src.core.http_cache import compute_etag, etag_matches
+from src.infrastructure.database.session import run_db
+from src.domains.auth.dependencies import get_current_user_id
+from .schemas import SnapshotResponse
+from .service import SnapshotService
+
+router = APIRouter(prefix="/snapshot", tags=["snapshot"])
+
+
+@router.get(
+    "",
+    response_model=SnapshotResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "The snapshot matching If-None-Match is still current"}},
+)
+async def get_snapshot(
+    snapshot_service: Annotated[SnapshotService, Depends()],
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    """
+    All the gifts, recipients and gift-recipient links of the authenticated user in one response.
+    Sends an ETag: revalidate with If-None-Match to get an empty 304 while nothing changed.
+    """
+    body = await run_db(snapshot_service.get_body, user_id)
+    etag = compute_etag(body)
+    # private: per-user data; no-cache: always revalidate, the 304 makes it cheap
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,31 @@
+import uuid
+from decimal import Decimal
+
+from pydantic import BaseModel, Field
+
+from src.domains.gifts.enums import GiftStatusEnum
+
+
+class SnapshotGift(BaseModel):
+    id: uuid.UUID
+    name: str
+    url: str | None
+    price: Decimal | None
+    status: GiftStatusEnum
+    quantity: int
+
+
+class SnapshotRecipient(BaseModel):
+    id: uuid.UUID
+    name: str
+    notes: str | None
+
+
+class SnapshotResponse(BaseModel):
+    """
+    Every gift and recipient of the user, oldest first.
+    Links are listed once, as [gift_id, recipient_id] pairs, instead of id lists on both sides.
+    """
+    gifts: list[SnapshotGift]
+    recipients: list[SnapshotRecipient]
+    links: list[tuple[uuid.UUID, uuid.UUID]] = Field(description="[gift_id, recipient_id] pairs")
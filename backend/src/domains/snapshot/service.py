@@ -0,0 +1,38 @@
+import json
+from typing import Annotated
+import uuid
+
+from fastapi import Depends
+
+from .repository import SnapshotRepository
+
+
+class SnapshotService:
+    def __init__(self, repo: Annotated[SnapshotRepository, Depends()]):
+        self.repo = repo
+
+    def get_body(self, user_id: uuid.UUID) -> bytes:
+        """
+        The serialized SnapshotResponse of a user.
+        Rows go straight to JSON (same encoding as the API: UUIDs and prices as strings),
+        without building one pydantic model per row.
+        """
+        snapshot = {
+            "gifts": [
+                {
+                    "id": str(gift_id),
+                    "name": name,
+                    "url": url,
+                    "price": str(price) if price is not None else None,
+                    "status": status.value,
+                    "quantity": quantity,
+                }
+                for gift_id, name, url, price, status, quantity in self.repo.get_gifts(user_id)
+            ],
+            "recipients": [
+                {"id": str(recipient_id), "name": name, "notes": notes}
+                for recipient_id, name, notes in self.repo.get_recipients(user_id)
+            ],
+            "links": [[str(gift_id), str(recipient_id)] for gift_id, recipient_id in self.repo.get_links(user_id)],
+        }
+        return json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -38,6 +38,15 @@ class User(Base):
         Numeric(10, 2),
     )
 
+    # Sum of price * quantity over the gifts that are no longer ideas, kept up to date by
+    # GiftRepository in the same transaction as the gift writes (see reconcile_spent to check it).
+    spent: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2),
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+
     is_verified: Mapped[bool] = mapped_column(
         Boolean,
         nullable=False,
@@ -0,0 +1,147 @@
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.config.settings import get_settings
+from src.infrastructure.database.routing import is_replica_session
+
+settings = get_settings()
+
+# Keys of Session.info (one session per request)
+_MEMO_KEY = "user_principals"
+_INVALIDATED_KEY = "invalidated_user_ids"
+
+
+@dataclass(frozen=True, slots=True)
+class UserPrincipal:
+    """The authenticated user as most requests need it: an immutable copy, safe to share between threads."""
+    id: uuid.UUID
+    email: str
+    name: str | None
+    budget: Decimal | None
+    spent: Decimal
+    is_verified: bool
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            budget=user.budget,
+            spent=user.spent,
+            is_verified=user.is_verified,
+        )
+
+
+class PrincipalCache:
+    """
+    Per-process cache of UserPrincipal, keyed by user id.
+
+    Same versioning as CountCache: every write to a user bumps its version, and a principal is stored
+    with the version read *before* it was loaded, so a load racing with a write is never served.
+    Versions share the bounded LRU of the entries; eviction never takes one back (see CountCache).
+    Other workers only see a write once their entry expires: budget / spent may lag by the TTL there.
+    ttl_seconds=0 disables the cache.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation = itertools.count(1)
+        self._evicted_version = 0
+        # user id -> (version, principal, expires_at); an invalidated user keeps its version with no principal
+        self._entries: OrderedDict[uuid.UUID, tuple[int, UserPrincipal | None, float]] = OrderedDict()
+
+    def get_or_load(
+        self, user_id: uuid.UUID, load: Callable[[], UserPrincipal | None], store: bool = True,
+    ) -> UserPrincipal | None:
+        """The cached principal of `user_id`, or load(). store=False serves the cache but never fills it."""
+        if self.ttl_seconds <= 0:
+            return load()
+        now = time.monotonic()
+        with self._lock:
+            version = self._version(user_id)
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+
+        principal = load()
+        if principal is None or not store:
+            return principal
+
+        with self._lock:
+            if self._version(user_id) == version:
+                self._put(user_id, (version, principal, now + self.ttl_seconds))
+        return principal
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._put(user_id, (next(self._generation), None, 0.0))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._evicted_version = next(self._generation)
+
+    def _version(self, user_id: uuid.UUID) -> int:
+        entry = self._entries.get(user_id)
+        return entry[0] if entry is not None else self._evicted_version
+
+    def _put(self, user_id: uuid.UUID, entry: tuple[int, UserPrincipal | None, float]) -> None:
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            _, (version, _, _) = self._entries.popitem(last=False)
+            self._evicted_version = max(self._evicted_version, version)
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.USER_PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def get_principal(db: Session, user_id: uuid.UUID, load: Callable[[], UserPrincipal | None]) -> UserPrincipal | None:
+    """
+    The principal of user_id, loaded at most once per transaction (memoized on the session),
+    and at most once per TTL in this process. A session bound to a replica may load a row that lags
+    behind the last write: it is served, never stored in the process cache.
+    """
+    memo = db.info.setdefault(_MEMO_KEY, {})
+    if user_id not in memo:
+        memo[user_id] = principal_cache.get_or_load(user_id, load, store=not is_replica_session(db))
+    return memo[user_id]
+
+
+def invalidate_principal(db: Session, user_id: uuid.UUID) -> None:
+    """
+    Call on every write to a user row. The cached principal is dropped now, and again once the
+    transaction commits: a concurrent request could have read (and cached) the row before the commit.
+    """
+    db.info.get(_MEMO_KEY, {}).pop(user_id, None)
+    db.info.setdefault(_INVALIDATED_KEY, set()).add(user_id)
+    principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_INVALIDATED_KEY, ()):
+        principal_cache.invalidate(user_id)
+    session.info.pop(_MEMO_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_INVALIDATED_KEY, None)
+    session.info.pop(_MEMO_KEY, None)
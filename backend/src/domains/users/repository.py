@@ -1,87 +1,131 @@
-from typing import Annotated
 import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from fastapi import Depends
-from sqlalchemy import select, update, func
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select, update, func
 
-from src.infrastructure.database.session import get_db
+from src.infrastructure.database.session import DbSession
 from src.domains.auth.password_handler import get_password_hash
 from src.domains.gifts.models import Gift
-from src.domains.gifts.enums import GiftStatusEnum
+from src.domains.gifts.enums import GiftStatus, GiftStatusEnum
 from .models import User
+from .principal_cache import UserPrincipal, get_principal, invalidate_principal
+
+
+def _spent_sum(user_id):
+    """SUM(price * quantity) over the gifts of user_id (a value or a correlated column) that count as spent."""
+    return (
+        select(func.coalesce(func.sum(Gift.price * Gift.quantity), 0))
+        .where(Gift.user_id == user_id)
+        # Rendered inline, not bound: the planner can only pick the partial index
+        # idx_gifts_user_spent when it sees the value.
+        .where(Gift.status != bindparam("idea_status", GiftStatusEnum.idee, type_=GiftStatus, literal_execute=True))
+        .where(Gift.price.is_not(None))
+    )
+
+
+# Lookups run by every authenticated request or login: built once, only the value is bound per call
+_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_BY_VERIFICATION_FINGERPRINT = select(User).where(
+    User.verification_token_fingerprint == bindparam("fingerprint"),
+    User.is_verified == False,
+)
+
 
 class UserRepository:
-    def __init__(self, db: Annotated[Session, Depends(get_db)]):
+    def __init__(self, db: DbSession):
         self.db = db
             
     def get_by_email(self, email: str) -> User | None:
-        stmt = select(User).where(User.email == email)
-        return self.db.execute(stmt).scalar_one_or_none()
+        return self.db.execute(_BY_EMAIL, {"email": email}).scalar_one_or_none()
     
     def get_by_id(self, user_id: uuid.UUID) -> User | None:
-        stmt = select(User).where(User.id == user_id)
-        return self.db.execute(stmt).scalar_one_or_none()
+        return self.db.execute(_BY_ID, {"user_id": user_id}).scalar_one_or_none()
+
+    def get_principal(self, user_id: uuid.UUID) -> UserPrincipal | None:
+        """The user as the API shows it (no secrets), from the principal cache (see principal_cache)."""
+        def _load() -> UserPrincipal | None:
+            user = self.get_by_id(user_id)
+            return UserPrincipal.from_user(user) if user is not None else None
+
+        return get_principal(self.db, user_id, _load)
     
+    def _update_returning(self, user_id: uuid.UUID, **values) -> User | None:
+        """
+        UPDATE ... RETURNING the whole row: the updated user comes back in the same statement.
+        populate_existing makes the identity-map copy take the stored values (e.g. NUMERIC scale).
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        invalidate_principal(self.db, user_id)
+        return self.db.execute(stmt).scalar_one_or_none()
+
     def get_by_verification_token(self, raw_token: str) -> User | None:
-        """Get user by fingerprint lookup, then verify the Argon2 hash."""
+        """Get user by fingerprint lookup, then verify the token hash."""
         from src.domains.auth.verification_token_handler import get_verification_token_fingerprint, verify_verification_token
         
         fingerprint = get_verification_token_fingerprint(raw_token)
-        stmt = select(User).where(
-            User.verification_token_fingerprint == fingerprint,
-            User.is_verified == False
-        )
-        user = self.db.execute(stmt).scalar_one_or_none()
+        user = self.db.execute(_BY_VERIFICATION_FINGERPRINT, {"fingerprint": fingerprint}).scalar_one_or_none()
         
         if user and user.verification_token_hash and verify_verification_token(raw_token, user.verification_token_hash):
             return user
         return None
     
     def create(self, user: User) -> User:
+        # The flush is a single INSERT ... RETURNING created_at (eager server defaults)
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
     
     def set_password(self, user_id: uuid.UUID, new_plain_password: str) -> None:
         new_hashed_password = get_password_hash(new_plain_password)
         stmt = update(User).where(User.id == user_id).values(password_hash=new_hashed_password)
         self.db.execute(stmt)
-        self.db.commit()
+        invalidate_principal(self.db, user_id)
 
-    def set_budget(self, user_id: uuid.UUID, budget: Decimal | None) -> User:
-        stmt = update(User).where(User.id == user_id).values(budget=budget)
-        self.db.execute(stmt)
-        self.db.commit()
-        return self.get_by_id(user_id)
+    def set_password_hash(self, user_id: uuid.UUID, password_hash: str) -> None:
+        """Store an already computed hash (rehash at login with the current Argon2 parameters)."""
+        self.db.execute(update(User).where(User.id == user_id).values(password_hash=password_hash))
+        invalidate_principal(self.db, user_id)
+
+    def set_budget(self, user_id: uuid.UUID, budget: Decimal | None) -> User | None:
+        return self._update_returning(user_id, budget=budget)
 
     def get_spent_amount(self, user_id: uuid.UUID) -> Decimal:
-        """Calculate total spent from gifts that are no longer just ideas."""
-        stmt = (
-            select(func.coalesce(func.sum(Gift.price * Gift.quantity), 0))
-            .where(Gift.user_id == user_id)
-            .where(Gift.status != GiftStatusEnum.idee)
-            .where(Gift.price.is_not(None))
-        )
-        result = self.db.execute(stmt).scalar_one()
+        """
+        Calculate total spent from gifts that are no longer just ideas.
+        Reference value for users.spent, which is what the API reads (see get_spent_drift).
+        """
+        result = self.db.execute(_spent_sum(user_id)).scalar_one()
         return Decimal(str(result))
 
-    def update_name(self, user_id: uuid.UUID, name: str) -> User:
-        """Update the user's display name."""
-        stmt = update(User).where(User.id == user_id).values(name=name)
+    def get_spent_drift(self) -> list[tuple[uuid.UUID, Decimal, Decimal]]:
+        """Return (user_id, stored spent, actual spent) for every user whose users.spent is off."""
+        actual = _spent_sum(User.id).correlate(User).scalar_subquery()
+        stmt = select(User.id, User.spent, actual).where(User.spent != actual).order_by(User.id)
+        return [(user_id, Decimal(str(stored)), Decimal(str(computed))) for user_id, stored, computed in self.db.execute(stmt)]
+
+    def reconcile_spent(self, user_ids: list[uuid.UUID]) -> None:
+        """Recompute users.spent from the gifts for the given users."""
+        actual = _spent_sum(User.id).correlate(User).scalar_subquery()
+        stmt = update(User).where(User.id.in_(user_ids)).values(spent=actual).execution_options(synchronize_session=False)
         self.db.execute(stmt)
-        self.db.commit()
-        return self.get_by_id(user_id)
+        for user_id in user_ids:
+            invalidate_principal(self.db, user_id)
+
+    def update_name(self, user_id: uuid.UUID, name: str) -> User | None:
+        """Update the user's display name."""
+        return self._update_returning(user_id, name=name)
 
-    def delete_name(self, user_id: uuid.UUID) -> User:
+    def delete_name(self, user_id: uuid.UUID) -> User | None:
         """Remove the user's display name (set to null)."""
-        stmt = update(User).where(User.id == user_id).values(name=None)
-        self.db.execute(stmt)
-        self.db.commit()
-        return self.get_by_id(user_id)
+        return self._update_returning(user_id, name=None)
 
     def set_verification_token(self, user_id: uuid.UUID, token_fingerprint: str, token_hash: str, expires_at: datetime) -> None:
         """Set email verification token for a user."""
@@ -91,16 +135,40 @@ class UserRepository:
             verification_token_expires_at=expires_at
         )
         self.db.execute(stmt)
-        self.db.commit()
 
-    def verify_email(self, user_id: uuid.UUID) -> None:
-        """Mark user's email as verified."""
-        stmt = update(User).where(User.id == user_id).values(
+    def clear_expired_verification_tokens(self, expired_before: datetime, limit: int) -> int:
+        """
+        Null the verification columns of up to `limit` users whose token expired before `expired_before`
+        (the user stays unverified and can ask for a new email). Returns the number of users cleared.
+        """
+        ids = (
+            select(User.id)
+            .where(User.verification_token_expires_at < expired_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        batch = list(self.db.execute(ids).scalars().all())
+        if not batch:
+            return 0
+        cleared = self.db.execute(
+            update(User)
+            .where(User.id.in_(batch))
+            .values(
+                verification_token_fingerprint=None,
+                verification_token_hash=None,
+                verification_token_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return cleared.rowcount
+
+    def verify_email(self, user_id: uuid.UUID) -> User | None:
+        """Mark user's email as verified. Returns the updated user."""
+        return self._update_returning(
+            user_id,
             is_verified=True,
             verification_token_fingerprint=None,
             verification_token_hash=None,
             verification_token_expires_at=None
         )
-        self.db.execute(stmt)
-        self.db.commit()
 
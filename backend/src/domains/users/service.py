@@ -4,6 +4,8 @@ from decimal import Decimal
 
 from fastapi import Depends, HTTPException, status
 
+from .models import User
+from .principal_cache import UserPrincipal
 from .repository import UserRepository
 from .schemas import UserRead
 
@@ -12,13 +14,12 @@ class UserService:
     def __init__(self, user_repo: Annotated[UserRepository, Depends()]):
         self.user_repo = user_repo
 
-    def _build_user_read(self, user_id: uuid.UUID) -> UserRead | None:
-        """Build UserRead with computed spent and remaining."""
-        user = self.user_repo.get_by_id(user_id)
+    def _build_user_read(self, user: User | UserPrincipal | None) -> UserRead | None:
+        """Build UserRead with spent (maintained on users.spent) and remaining."""
         if not user:
             return None
         
-        spent = self.user_repo.get_spent_amount(user_id)
+        spent = user.spent
         remaining = user.budget - spent if user.budget is not None else None
         
         return UserRead(
@@ -31,26 +32,22 @@ class UserService:
         )
 
     def update_budget(self, user_id: uuid.UUID, budget: Decimal) -> UserRead:
-        self.user_repo.set_budget(user_id, budget)
-        return self._build_user_read(user_id)
+        return self._build_user_read(self.user_repo.set_budget(user_id, budget))
 
     def delete_budget(self, user_id: uuid.UUID) -> UserRead:
-        self.user_repo.set_budget(user_id, None)
-        return self._build_user_read(user_id)
+        return self._build_user_read(self.user_repo.set_budget(user_id, None))
 
     def get_current_user(self, user_id: uuid.UUID) -> UserRead:
         """Get current user with computed budget fields."""
-        return self._build_user_read(user_id)
+        return self._build_user_read(self.user_repo.get_principal(user_id))
 
     def update_name(self, user_id: uuid.UUID, name: str) -> UserRead:
         """Update user's display name."""
-        self.user_repo.update_name(user_id, name)
-        return self._build_user_read(user_id)
+        return self._build_user_read(self.user_repo.update_name(user_id, name))
 
     def delete_name(self, user_id: uuid.UUID) -> UserRead:
         """Remove user's display name."""
-        self.user_repo.delete_name(user_id)
-        return self._build_user_read(user_id)
+        return self._build_user_read(self.user_repo.delete_name(user_id))
 
     def update_password(self, user_id: uuid.UUID, current_password: str, new_password: str) -> None:
         """Update user's password after verifying current password."""
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger("api.db.pool")
+
+
+class PoolWaitStats:
+    """
+    Thread-safe histogram of the time spent waiting for a pooled connection.
+    Buckets are upper bounds in milliseconds; the last bucket catches everything above.
+    """
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._timeouts = 0
+
+    def observe(self, wait_ms: float) -> None:
+        index = bisect_left(self.BUCKETS_MS, wait_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._total_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            count = sum(self._counts)
+            labels = [f"le_{bound}ms" for bound in self.BUCKETS_MS] + ["inf"]
+            return {
+                "count": count,
+                "timeouts": self._timeouts,
+                "avg_ms": round(self._total_ms / count, 3) if count else 0.0,
+                "max_ms": round(self._max_ms, 3),
+                "histogram": dict(zip(labels, self._counts)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every connection checkout. Overrides Pool._do_get, the hook pool subclasses implement."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record_timeout()
+            logger.warning("Timed out waiting for a database connection", extra={"extra_data": pool_status(self)})
+            raise
+        self.wait_stats.observe((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(pool) -> dict:
+    """Live view of a pool: sizing, current usage and checkout wait times."""
+    status = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status["wait"] = wait_stats.snapshot()
+    return status
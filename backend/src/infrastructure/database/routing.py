@@ -0,0 +1,47 @@
+import itertools
+import time
+from typing import Sequence, TypeVar
+
+from fastapi import Request
+from sqlalchemy.orm import Session
+
+# Requests that never write: served by a replica when some are configured
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Set after a successful write (see ReadYourWritesMiddleware): unix time until which the client reads from the primary
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+
+# Key of Session.info: set on the sessions bound to a replica, whose reads may lag behind the primary
+REPLICA_INFO_KEY = "replica"
+
+E = TypeVar("E")
+
+_next_replica = itertools.count()
+
+
+def reads_from_replica(request: Request) -> bool:
+    """
+    Whether a request can be served by a replica: a safe method from a client
+    that did not write within the read-your-writes window.
+    """
+    if request.method not in SAFE_METHODS:
+        return False
+    primary_until = request.cookies.get(PRIMARY_UNTIL_COOKIE)
+    if not primary_until:
+        return True
+    try:
+        return float(primary_until) <= time.time()
+    except ValueError:
+        return True
+
+
+def choose_replica(engines: Sequence[E]) -> E | None:
+    """Next replica engine, round robin, or None when there is none."""
+    if not engines:
+        return None
+    return engines[next(_next_replica) % len(engines)]
+
+
+def is_replica_session(db: Session) -> bool:
+    """Whether `db` reads from a replica: what it loads must not fill the per-process caches."""
+    return db.info.get(REPLICA_INFO_KEY, False)
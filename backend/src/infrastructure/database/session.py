@@ -1,12 +1,165 @@
-from typing import Generator
+import logging
+from typing import Annotated, Any, AsyncGenerator, AsyncIterator, Callable, Generator, Iterator, TypeVar
 
-from src.config.database import SessionLocal
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from src.config.database import (
+    SessionLocal,
+    AsyncSessionLocal,
+    engine,
+    async_engine,
+    replica_engines,
+    async_replica_engines,
+)
+from src.config.settings import get_settings
+from src.infrastructure.database.pool_metrics import pool_status
+from src.infrastructure.database.routing import REPLICA_INFO_KEY, choose_replica, reads_from_replica
 
-def get_db() -> Generator:
-    """FastAPI dependcy: yield a session for each request."""
-    db = SessionLocal()
+logger = logging.getLogger("api.db")
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+def get_sync_db(request: Request) -> Generator:
+    """
+    FastAPI dependcy: yield a session for each request, which is also its unit of work.
+    Repositories only flush; the transaction is committed once, when the endpoint returned,
+    and rolled back if it raised.
+    With read replicas, safe-method requests get a session bound to one of them (see routing.py),
+    marked in its info so the per-process caches are not filled from a lagging replica.
+    """
+    replica = choose_replica(replica_engines) if reads_from_replica(request) else None
+    db = SessionLocal(bind=replica, info={REPLICA_INFO_KEY: True}) if replica is not None else SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db(request: Request) -> AsyncGenerator:
+    """
+    FastAPI dependency (async mode): open an AsyncSession and hand its sync facade to the repositories.
+    Repositories keep their sync API; the IO is awaited on the event loop when called through run_db().
+    Same unit of work and replica routing as get_sync_db(): one commit at the end of the request, rollback on error.
+    """
+    replica = choose_replica(async_replica_engines) if reads_from_replica(request) else None
+    async with (
+        AsyncSessionLocal(bind=replica, info={REPLICA_INFO_KEY: True}) if replica is not None else AsyncSessionLocal()
+    ) as session:
+        try:
+            yield session.sync_session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+# Dependency used by every repository. The backend is chosen once, at startup, from settings.
+get_db = get_async_db if settings.DATABASE_ASYNC else get_sync_db
+
+# scope="function": the commit runs as soon as the endpoint returns, before the response is sent,
+# so a client never sees a success for a transaction that then fails to commit.
+DbSession = Annotated[Session, Depends(get_db, scope="function")]
+
+# scope="request": the session stays open until the response has been sent, for streamed bodies
+# (exports) that keep reading rows after the endpoint returned. Read-only: the final commit has nothing to write.
+StreamingDbSession = Annotated[Session, Depends(get_db, scope="request")]
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a service/repository call from an async route.
+    - sync mode: in the AnyIO threadpool (same behavior as a plain `def` route).
+    - async mode: in a greenlet, every DB round trip is awaited on the AsyncEngine,
+      so no thread is held while Postgres answers.
+    """
+    if settings.DATABASE_ASYNC:
+        from sqlalchemy.util import greenlet_spawn
+
+        return await greenlet_spawn(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, *args, **kwargs)
+
+
+async def iterate_db(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Consume a DB-backed iterator (e.g. a streamed result) from an async route, for a StreamingResponse.
+    Every step goes through run_db(), so the event loop is never blocked while rows are fetched:
+    iterators should yield batches, not single rows.
+    """
+    done = object()
+    while True:
+        item = await run_db(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
+def get_pool_status() -> dict:
+    """Pool statistics of the engine currently serving requests."""
+    active_engine = async_engine if settings.DATABASE_ASYNC else engine
+    active_replicas = async_replica_engines if settings.DATABASE_ASYNC else replica_engines
+    status = {
+        "mode": "async" if settings.DATABASE_ASYNC else "sync",
+        **pool_status(active_engine.pool),
+    }
+    if active_replicas:
+        status["replicas"] = [pool_status(replica.pool) for replica in active_replicas]
+    return status
+
+
+async def warm_up_pool(connections: int) -> None:
+    """
+    Open `connections` connections at once, then give them back to the pool,
+    so the first requests after a deploy don't pay the TCP + TLS + auth handshake.
+    Best effort: a database that is not reachable yet must not prevent startup.
+    """
+    if connections <= 0:
+        return
+    try:
+        if settings.DATABASE_ASYNC:
+            opened = []
+            try:
+                for _ in range(connections):
+                    connection = await async_engine.connect()
+                    opened.append(connection)
+                    await connection.execute(text("SELECT 1"))
+            finally:
+                for connection in opened:
+                    await connection.close()
+        else:
+            def _warm_up() -> None:
+                opened = []
+                try:
+                    for _ in range(connections):
+                        connection = engine.connect()
+                        opened.append(connection)
+                        connection.execute(text("SELECT 1"))
+                finally:
+                    for connection in opened:
+                        connection.close()
+
+            await run_in_threadpool(_warm_up)
+    except Exception:
+        logger.warning("Database pool warm-up failed", exc_info=True)
+        return
+    logger.info("Database pool warmed up with %d connections", connections, extra={"extra_data": get_pool_status()})
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (application shutdown)."""
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in async_replica_engines:
+        await replica.dispose()
+    engine.dispose()
+    for replica in replica_engines:
+        replica.dispose()
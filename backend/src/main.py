@@ -1,27 +1,56 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from starlette.concurrency import run_in_threadpool
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from src.config.settings import get_settings
 from src.config.logging import setup_logging
+from src.config.database import REPLICA_DATABASE_URLS
 from src.core.rate_limit import limiter
 from src.core.middlewares.request_logging import RequestLoggingMiddleware
+from src.core.middlewares.read_your_writes import ReadYourWritesMiddleware
 from src.core.middlewares.exception_handlers import unhandled_exception_handler
+from src.core.internal_router import router as internal_router
+from src.infrastructure.database.session import warm_up_pool, dispose_engines
+from src.commands.purge_tokens import purge_tokens_periodically
+from src.domains.auth.password_handler import warm_up_password_hasher
 from src.domains.auth.router import router as auth_router
 from src.domains.users.router import router as users_router
 from src.domains.recipients.router import router as recipients_router
 from src.domains.gifts.router import router as gifts_router
+from src.domains.search.router import router as search_router
+from src.domains.export.router import router as export_router
+from src.domains.snapshot.router import router as snapshot_router
 
 settings = get_settings()
 
 # ── Logging ──────────────────────────────────────────────
 setup_logging(log_level=settings.LOG_LEVEL, env=settings.ENV)
 
+# ── Lifespan ─────────────────────────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_pool(settings.DATABASE_POOL_WARMUP_CONNECTIONS)
+    await run_in_threadpool(warm_up_password_hasher)
+    purge_task = None
+    if settings.TOKEN_PURGE_INTERVAL_MINUTES > 0:
+        purge_task = asyncio.create_task(purge_tokens_periodically(settings.TOKEN_PURGE_INTERVAL_MINUTES * 60))
+    yield
+    if purge_task is not None:
+        purge_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await purge_task
+    await dispose_engines()
+
 # ── App ──────────────────────────────────────────────────
 app = FastAPI(
     debug=settings.DEBUG,
+    lifespan=lifespan,
     docs_url=settings.SWAGGER_URL,
     redoc_url=settings.REDOC_URL,
     openapi_url=settings.OPENAPI_URL,
@@ -40,7 +69,8 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["Authorization", "Content-Type"]
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag"],
 )
 
 # 2. Trusted Host — reject requests with unexpected Host headers
@@ -48,7 +78,11 @@ allowed_hosts = [h.strip() for h in settings.ALLOWED_HOSTS.split(",") if h.strip
 if allowed_hosts:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=allowed_hosts)
 
-# 3. Request logging + request ID generation
+# 3. Read-your-writes cookie, only needed when reads can go to a replica
+if REPLICA_DATABASE_URLS:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# 4. Request logging + request ID generation
 app.add_middleware(RequestLoggingMiddleware)
 
 # ── Exception Handlers ───────────────────────────────────
@@ -59,3 +93,8 @@ app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(recipients_router)
 app.include_router(gifts_router)
+app.include_router(search_router)
+app.include_router(export_router)
+app.include_router(snapshot_router)
+if settings.ENABLE_POOL_STATS:
+    app.include_router(internal_router)
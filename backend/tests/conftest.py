@@ -1,6 +1,7 @@
 import pytest
+from contextlib import contextmanager
 from typing import Generator
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
@@ -28,7 +29,7 @@ def db_engine():
 
 @pytest.fixture(scope="function")
 def db_session(db_engine) -> Generator[Session, None, None]:
-    TestingSessionLocal = sessionmaker(bind=db_engine, autoflush=False, autocommit=False)
+    TestingSessionLocal = sessionmaker(bind=db_engine, autoflush=False, autocommit=False, expire_on_commit=False)
     session = TestingSessionLocal()
     try:
         yield session
@@ -37,13 +38,35 @@ def db_session(db_engine) -> Generator[Session, None, None]:
         session.close()
 
 
+@pytest.fixture
+def count_queries(db_engine):
+    """Context manager counting the SQL statements executed inside it: `with count_queries() as queries: ...`"""
+    @contextmanager
+    def _count():
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, "before_cursor_execute", _record)
+
+    return _count
+
+
 @pytest.fixture(scope="function")
 def client(db_session: Session) -> Generator[TestClient, None, None]:
     def override_get_db():
+        # Same unit of work as get_db: one commit at the end of the request, rollback on error
         try:
             yield db_session
-        finally:
-            pass
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
     
     app.dependency_overrides[get_db] = override_get_db
     limiter.enabled = False
@@ -52,6 +52,15 @@ class TestBudgetEndpoints:
         assert data["budget"] == "500.00"
         assert data["id"] == str(registered_user.id)
 
+    def test_set_budget_is_a_single_update_returning(self, client, auth_headers, count_queries):
+        with count_queries() as queries:
+            response = client.patch("/users/me/budget", json={"budget": 42.50}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["budget"] == "42.50"
+        assert len(queries) == 1
+        assert queries[0].startswith("UPDATE users") and "RETURNING" in queries[0]
+
     def test_update_budget_replaces_existing(self, client, auth_headers):
         client.patch("/users/me/budget", json={"budget": 100.00}, headers=auth_headers)
 
@@ -139,3 +148,82 @@ class TestBudgetEndpoints:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json()["budget"] is None
+
+
+class TestSpentTracking:
+    """users.spent follows every gift write and /users/me reads it without touching the gifts."""
+
+    @pytest.fixture
+    def headers(self, authenticated_user):
+        _, headers = authenticated_user
+        return headers
+
+    def _spent(self, client, headers) -> str:
+        response = client.get("/users/me", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()["spent"]
+
+    def _create(self, client, headers, **data) -> dict:
+        response = client.post("/gifts", json={"name": "Gift", **data}, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()
+
+    def test_ideas_do_not_count(self, client, headers):
+        self._create(client, headers, price=50, quantity=2, status="idee")
+
+        assert self._spent(client, headers) == "0.00"
+
+    def test_create_adds_price_times_quantity(self, client, headers):
+        self._create(client, headers, price=12.5, quantity=2, status="achete")
+        self._create(client, headers, status="achete")
+
+        assert self._spent(client, headers) == "25.00"
+
+    def test_status_change_moves_gift_in_and_out(self, client, headers):
+        gift = self._create(client, headers, price=30, quantity=1, status="idee")
+
+        client.patch(f"/gifts/{gift['id']}", json={"status": "commande"}, headers=headers)
+        assert self._spent(client, headers) == "30.00"
+
+        client.patch(f"/gifts/{gift['id']}", json={"status": "idee"}, headers=headers)
+        assert self._spent(client, headers) == "0.00"
+
+    def test_price_and_quantity_updates_apply_the_delta(self, client, headers):
+        gift = self._create(client, headers, price=10, quantity=1, status="livre")
+        self._create(client, headers, price=5, quantity=1, status="offert")
+
+        client.patch(f"/gifts/{gift['id']}", json={"price": 20, "quantity": 3}, headers=headers)
+
+        assert self._spent(client, headers) == "65.00"
+
+    def test_delete_subtracts(self, client, headers):
+        gift = self._create(client, headers, price=10, quantity=2, status="emballe")
+        self._create(client, headers, price=1, quantity=1, status="emballe")
+
+        client.delete(f"/gifts/{gift['id']}", headers=headers)
+
+        assert self._spent(client, headers) == "1.00"
+
+    def test_batch_operations_are_tracked(self, client, headers):
+        kept = self._create(client, headers, price=10, quantity=1, status="achete")
+        dropped = self._create(client, headers, price=100, quantity=1, status="achete")
+
+        response = client.post("/gifts/batch", json={"operations": [
+            {"op": "create", "data": {"name": "New", "price": 7, "quantity": 2, "status": "achete"}},
+            {"op": "update", "id": kept["id"], "data": {"quantity": 3}},
+            {"op": "delete", "id": dropped["id"]},
+        ]}, headers=headers)
+        assert response.json()["committed"] is True
+
+        assert self._spent(client, headers) == "44.00"
+
+    def test_me_is_a_single_primary_key_lookup(self, client, headers, count_queries):
+        self._create(client, headers, price=3, quantity=1, status="achete")
+
+        with count_queries() as queries:
+            response = client.get("/users/me", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 1
+        assert "gifts" not in queries[0]
+        assert "WHERE users.id" in queries[0]
@@ -0,0 +1,76 @@
+"""Integration tests for the streamed /export endpoint."""
+import csv
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def catalog(client, authenticated_user):
+    """Two recipients and three gifts, one linked to both recipients and one to none."""
+    _, headers = authenticated_user
+    alice = client.post("/recipients", json={"name": "Alice", "notes": "Likes tea"}, headers=headers).json()
+    bob = client.post("/recipients", json={"name": "=Bob"}, headers=headers).json()
+    gifts = [
+        {"name": "Teapot", "price": 30, "status": "achete", "recipient_ids": [bob["id"], alice["id"]]},
+        {"name": "Book", "url": "https://example.com/book", "status": "idee"},
+        {"name": "Scarf", "price": 25, "quantity": 2, "status": "offert", "recipient_ids": [alice["id"]]},
+    ]
+    for gift in gifts:
+        assert client.post("/gifts", json=gift, headers=headers).status_code == 201
+    return headers
+
+
+class TestExportEndpoint:
+
+    def test_ndjson_lists_recipients_then_gifts_with_recipient_names(self, client, catalog):
+        response = client.get("/export", headers=catalog)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="gift-planner-export.ndjson"' in response.headers["content-disposition"]
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["type"] for r in records] == ["recipient"] * 2 + ["gift"] * 3
+        by_name = {r["name"]: r for r in records}
+        assert by_name["Alice"]["notes"] == "Likes tea"
+        assert by_name["Teapot"]["recipients"] == ["=Bob", "Alice"]
+        assert by_name["Book"]["recipients"] == []
+        assert by_name["Book"]["price"] is None and by_name["Book"]["url"] == "https://example.com/book"
+        scarf = by_name["Scarf"]
+        assert (scarf["price"], scarf["quantity"], scarf["status"], scarf["recipients"]) == ("25.00", 2, "offert", ["Alice"])
+
+    def test_csv_has_one_row_per_record_and_neutralizes_formulas(self, client, catalog):
+        response = client.get("/export?format=csv", headers=catalog)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        rows = {row["name"]: row for row in csv.DictReader(io.StringIO(response.text))}
+        assert set(rows) == {"Alice", "'=Bob", "Teapot", "Book", "Scarf"}
+        assert rows["Teapot"]["recipients"] == "'=Bob; Alice"
+        assert rows["Scarf"]["quantity"] == "2" and rows["Scarf"]["type"] == "gift"
+
+    def test_query_count_does_not_depend_on_size(self, client, catalog, count_queries):
+        for i in range(20):
+            client.post("/gifts", json={"name": f"Extra {i}", "status": "idee"}, headers=catalog)
+
+        with count_queries() as queries:
+            response = client.get("/export", headers=catalog)
+
+        assert len(response.text.splitlines()) == 25
+        assert len([q for q in queries if q.lstrip().upper().startswith("SELECT")]) == 2
+
+    def test_exports_only_user_data(self, client, authenticated_user, other_user_with_gifts, other_user_with_recipients):
+        _, headers = authenticated_user
+
+        response = client.get("/export", headers=headers)
+
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_invalid_format_returns_422(self, client, authenticated_user):
+        _, headers = authenticated_user
+        assert client.get("/export?format=xml", headers=headers).status_code == 422
+
+    def test_requires_authentication(self, client):
+        assert client.get("/export").status_code == 401
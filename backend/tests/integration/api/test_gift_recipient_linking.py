@@ -404,3 +404,108 @@ class TestBidirectionalLinking:
         # Gift should no longer list the recipient
         gift = client.get(f"/gifts/{gid}", headers=headers).json()
         assert rid not in gift["recipient_ids"]
+
+
+class TestGiftRecipientsLinkEndpoints:
+    """Tests for POST/DELETE /gifts/{id}/recipients (incremental linking)."""
+
+    def _recipients(self, client, headers, *names):
+        return [client.post("/recipients", json={"name": name}, headers=headers).json()["id"] for name in names]
+
+    def test_add_recipients_keeps_existing_links(self, client, authenticated_user):
+        user, headers = authenticated_user
+        mom, dad, sis = self._recipients(client, headers, "Mom", "Dad", "Sis")
+        gid = client.post("/gifts", json={"name": "Scarf", "recipient_ids": [mom]}, headers=headers).json()["id"]
+
+        response = client.post(f"/gifts/{gid}/recipients", json={"recipient_ids": [dad, sis, mom]}, headers=headers)
+
+        assert response.status_code == 200
+        assert set(response.json()["recipient_ids"]) == {mom, dad, sis}
+        recipient = client.get(f"/recipients/{dad}", headers=headers).json()
+        assert gid in recipient["gift_ids"]
+
+    def test_add_recipients_reports_every_missing_id(self, client, authenticated_user, other_user_with_recipients):
+        user, headers = authenticated_user
+        other_user, other_recipients = other_user_with_recipients
+        (mom,) = self._recipients(client, headers, "Mom")
+        gid = client.post("/gifts", json={"name": "Scarf"}, headers=headers).json()["id"]
+        unknown = str(uuid.uuid4())
+        foreign = other_recipients[0]["id"]
+
+        response = client.post(
+            f"/gifts/{gid}/recipients", json={"recipient_ids": [mom, unknown, foreign]}, headers=headers
+        )
+
+        assert response.status_code == 404
+        assert unknown in response.json()["detail"]
+        assert foreign in response.json()["detail"]
+        # Nothing was linked
+        assert client.get(f"/gifts/{gid}", headers=headers).json()["recipient_ids"] == []
+
+    def test_add_recipients_to_unknown_gift_returns_404(self, client, authenticated_user):
+        user, headers = authenticated_user
+        (mom,) = self._recipients(client, headers, "Mom")
+
+        response = client.post(f"/gifts/{uuid.uuid4()}/recipients", json={"recipient_ids": [mom]}, headers=headers)
+
+        assert response.status_code == 404
+
+    def test_add_recipients_requires_ids(self, client, authenticated_user):
+        user, headers = authenticated_user
+        gid = client.post("/gifts", json={"name": "Scarf"}, headers=headers).json()["id"]
+
+        response = client.post(f"/gifts/{gid}/recipients", json={"recipient_ids": []}, headers=headers)
+
+        assert response.status_code == 422
+
+    def test_remove_recipients(self, client, authenticated_user):
+        user, headers = authenticated_user
+        mom, dad = self._recipients(client, headers, "Mom", "Dad")
+        gid = client.post("/gifts", json={"name": "Scarf", "recipient_ids": [mom, dad]}, headers=headers).json()["id"]
+
+        response = client.delete(
+            f"/gifts/{gid}/recipients", params={"recipient_ids": [dad, str(uuid.uuid4())]}, headers=headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["recipient_ids"] == [mom]
+        assert gid not in client.get(f"/recipients/{dad}", headers=headers).json()["gift_ids"]
+
+    def test_remove_recipients_from_other_users_gift_returns_404(
+        self, client, authenticated_user, other_user_with_gifts
+    ):
+        user, headers = authenticated_user
+        other_user, other_gifts = other_user_with_gifts
+
+        response = client.delete(
+            f"/gifts/{other_gifts[0]['id']}/recipients", params={"recipient_ids": [str(uuid.uuid4())]}, headers=headers
+        )
+
+        assert response.status_code == 404
+
+    def test_link_cost_does_not_grow_with_recipient_count(self, client, authenticated_user, count_queries):
+        user, headers = authenticated_user
+        few = self._recipients(client, headers, "A", "B")
+        many = self._recipients(client, headers, *[f"R{i}" for i in range(20)])
+
+        with count_queries() as queries_few:
+            client.post("/gifts", json={"name": "Few", "recipient_ids": few}, headers=headers)
+        with count_queries() as queries_many:
+            client.post("/gifts", json={"name": "Many", "recipient_ids": many}, headers=headers)
+
+        assert len(queries_many) == len(queries_few)
+
+    def test_update_only_writes_the_difference(self, client, authenticated_user, count_queries):
+        user, headers = authenticated_user
+        recipient_ids = self._recipients(client, headers, *[f"R{i}" for i in range(10)])
+        gid = client.post("/gifts", json={"name": "Gift", "recipient_ids": recipient_ids}, headers=headers).json()["id"]
+
+        with count_queries() as queries:
+            response = client.patch(
+                f"/gifts/{gid}", json={"recipient_ids": recipient_ids[1:]}, headers=headers
+            )
+
+        assert set(response.json()["recipient_ids"]) == set(recipient_ids[1:])
+        link_writes = [q for q in queries if "gift_recipients" in q and q.lstrip().upper().startswith(("INSERT", "DELETE"))]
+        assert len(link_writes) == 1
+        assert link_writes[0].lstrip().upper().startswith("DELETE")
@@ -2,6 +2,8 @@ import pytest
 import uuid
 from fastapi.testclient import TestClient
 
+from src.domains.gifts.models import Gift
+
 
 class TestCreateGiftEndpoint:
 
@@ -304,11 +306,287 @@ class TestGetGiftsEndpoint:
         scarf = next(g for g in data["items"] if g["name"] == "Scarf")
         assert scarf["recipient_ids"] == [rid]
 
+    def test_get_gifts_query_count_does_not_depend_on_page_size(self, client, authenticated_user, count_queries):
+        user, headers = authenticated_user
+
+        rids = [client.post("/recipients", json={"name": f"R{i}"}, headers=headers).json()["id"] for i in range(2)]
+        for i in range(12):
+            client.post("/gifts", json={"name": f"Gift {i}", "recipient_ids": rids}, headers=headers)
+
+        with count_queries() as small_page:
+            response = client.get("/gifts?limit=2", headers=headers)
+            assert response.status_code == 200
+        with count_queries() as full_page:
+            response = client.get("/gifts?limit=100", headers=headers)
+            assert response.status_code == 200
+
+        assert len(response.json()["items"]) == 12
+        assert all(sorted(item["recipient_ids"]) == sorted(rids) for item in response.json()["items"])
+        assert len(full_page) == len(small_page)
+
     def test_get_gifts_requires_authentication(self, client):
         response = client.get("/gifts")
         assert response.status_code == 401
 
 
+class TestGetGiftsCursorPagination:
+
+    def _create(self, client, headers, names):
+        for name in names:
+            assert client.post("/gifts", json={"name": name}, headers=headers).status_code == 201
+
+    def test_cursor_first_page(self, client, authenticated_user):
+        user, headers = authenticated_user
+        self._create(client, headers, ["C", "A", "B"])
+
+        response = client.get("/gifts?sort=asc&limit=2&cursor=", headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [g["name"] for g in data["items"]] == ["A", "B"]
+        assert data["meta"]["hasNext"] is True
+        assert data["meta"]["hasPrev"] is False
+        assert data["meta"]["nextCursor"]
+        assert data["meta"]["prevCursor"] is None
+        assert "total" not in data["meta"]
+
+    def test_cursor_walks_forward_and_back(self, client, authenticated_user):
+        user, headers = authenticated_user
+        self._create(client, headers, ["E", "D", "C", "B", "A"])
+
+        page1 = client.get("/gifts?sort=asc&limit=2&cursor=", headers=headers).json()
+        page2 = client.get(f"/gifts?sort=asc&limit=2&cursor={page1['meta']['nextCursor']}", headers=headers).json()
+        page3 = client.get(f"/gifts?sort=asc&limit=2&cursor={page2['meta']['nextCursor']}", headers=headers).json()
+        back = client.get(f"/gifts?sort=asc&limit=2&cursor={page3['meta']['prevCursor']}", headers=headers).json()
+
+        assert [g["name"] for g in page2["items"]] == ["C", "D"]
+        assert [g["name"] for g in page3["items"]] == ["E"]
+        assert page3["meta"]["hasNext"] is False
+        assert [g["name"] for g in back["items"]] == ["C", "D"]
+        assert back["meta"]["hasNext"] is True
+
+    def test_cursor_is_stable_when_gifts_are_inserted(self, client, authenticated_user):
+        user, headers = authenticated_user
+        self._create(client, headers, ["B", "D", "F"])
+
+        page1 = client.get("/gifts?sort=asc&limit=2&cursor=", headers=headers).json()
+        self._create(client, headers, ["A", "C"])
+        page2 = client.get(f"/gifts?sort=asc&limit=2&cursor={page1['meta']['nextCursor']}", headers=headers).json()
+
+        assert [g["name"] for g in page1["items"]] == ["B", "D"]
+        assert [g["name"] for g in page2["items"]] == ["F"]
+
+    def test_cursor_invalid_returns_400(self, client, authenticated_user):
+        user, headers = authenticated_user
+
+        response = client.get("/gifts?cursor=not-a-cursor", headers=headers)
+
+        assert response.status_code == 400
+
+    def test_cursor_from_other_sort_returns_400(self, client, authenticated_user):
+        user, headers = authenticated_user
+        self._create(client, headers, ["A", "B"])
+
+        page1 = client.get("/gifts?sort=asc&limit=1&cursor=", headers=headers).json()
+        response = client.get(f"/gifts?sort=desc&limit=1&cursor={page1['meta']['nextCursor']}", headers=headers)
+
+        assert response.status_code == 400
+
+
+class TestGetGiftsCountStrategies:
+
+    def test_count_none_returns_no_total(self, client, authenticated_user_with_gifts):
+        user, headers, gifts = authenticated_user_with_gifts
+
+        response = client.get("/gifts?limit=2&count=none", headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["meta"]["total"] is None
+        assert data["meta"]["totalPages"] is None
+        assert data["meta"]["hasNext"] is True
+
+    def test_count_none_last_page_has_no_next(self, client, authenticated_user_with_gifts):
+        user, headers, gifts = authenticated_user_with_gifts
+
+        data = client.get("/gifts?limit=2&page=3&count=none", headers=headers).json()
+
+        assert len(data["items"]) == 1
+        assert data["meta"]["hasNext"] is False
+        assert data["meta"]["hasPrev"] is True
+
+    def test_count_window_matches_exact(self, client, authenticated_user_with_gifts):
+        user, headers, gifts = authenticated_user_with_gifts
+
+        exact = client.get("/gifts?limit=2&page=2&sort=asc", headers=headers).json()
+        window = client.get("/gifts?limit=2&page=2&sort=asc&count=window", headers=headers).json()
+
+        assert window["meta"] == exact["meta"]
+        assert window["items"] == exact["items"]
+
+    def test_count_window_past_last_page(self, client, authenticated_user_with_gifts):
+        user, headers, gifts = authenticated_user_with_gifts
+
+        data = client.get("/gifts?limit=2&page=10&count=window", headers=headers).json()
+
+        assert data["items"] == []
+        assert data["meta"]["total"] == 5
+
+    def test_count_window_skips_count_query(self, client, authenticated_user_with_gifts, count_queries):
+        user, headers, gifts = authenticated_user_with_gifts
+
+        with count_queries() as exact:
+            client.get("/gifts?limit=2", headers=headers)
+        with count_queries() as window:
+            client.get("/gifts?limit=2&count=window", headers=headers)
+
+        assert len(window) == len(exact) - 1
+
+    def test_count_cached_is_invalidated_on_create_and_delete(self, client, authenticated_user_with_gifts):
+        user, headers, gifts = authenticated_user_with_gifts
+
+        assert client.get("/gifts?count=cached", headers=headers).json()["meta"]["total"] == 5
+
+        client.post("/gifts", json={"name": "New"}, headers=headers)
+        assert client.get("/gifts?count=cached", headers=headers).json()["meta"]["total"] == 6
+
+        client.delete(f"/gifts/{gifts[0]['id']}", headers=headers)
+        assert client.get("/gifts?count=cached", headers=headers).json()["meta"]["total"] == 5
+
+    def test_count_cached_skips_count_query_when_warm(self, client, authenticated_user_with_gifts, count_queries):
+        user, headers, gifts = authenticated_user_with_gifts
+
+        with count_queries() as cold:
+            client.get("/gifts?count=cached", headers=headers)
+        with count_queries() as warm:
+            client.get("/gifts?count=cached", headers=headers)
+
+        assert len(warm) == len(cold) - 1
+
+    def test_count_invalid_strategy_returns_422(self, client, authenticated_user):
+        user, headers = authenticated_user
+
+        response = client.get("/gifts?count=approximate", headers=headers)
+
+        assert response.status_code == 422
+
+
+class TestGetGiftsFilters:
+
+    @pytest.fixture
+    def catalog(self, client, authenticated_user):
+        """Six gifts covering statuses, prices, URLs and one recipient link."""
+        user, headers = authenticated_user
+        recipient = client.post("/recipients", json={"name": "Alice"}, headers=headers).json()
+        specs = [
+            {"name": "Book", "price": 15, "status": "idee", "url": "https://example.com/book"},
+            {"name": "Lamp", "price": 40, "status": "achete"},
+            {"name": "Scarf", "price": 25, "status": "achete", "recipient_ids": [recipient["id"]]},
+            {"name": "Watch", "price": 250, "status": "livre", "url": "https://example.com/watch"},
+            {"name": "Card", "status": "idee"},
+            {"name": "Mug", "price": 8, "status": "offert", "recipient_ids": [recipient["id"]]},
+        ]
+        for spec in specs:
+            assert client.post("/gifts", json=spec, headers=headers).status_code == 201
+        return headers, recipient["id"]
+
+    def _names(self, client, headers, **params) -> list[str]:
+        response = client.get("/gifts", params={"sort": "asc", **params}, headers=headers)
+        assert response.status_code == 200
+        return [item["name"] for item in response.json()["items"]]
+
+    def test_single_status(self, client, catalog):
+        headers, _ = catalog
+        assert self._names(client, headers, status="achete") == ["Lamp", "Scarf"]
+
+    def test_several_statuses(self, client, catalog):
+        headers, _ = catalog
+        assert self._names(client, headers, status=["idee", "livre"]) == ["Book", "Card", "Watch"]
+
+    def test_invalid_status_returns_422(self, client, catalog):
+        headers, _ = catalog
+        response = client.get("/gifts", params={"status": "lost"}, headers=headers)
+        assert response.status_code == 422
+
+    def test_price_range_is_inclusive_and_skips_unpriced_gifts(self, client, catalog):
+        headers, _ = catalog
+        assert self._names(client, headers, min_price=15, max_price=40) == ["Book", "Lamp", "Scarf"]
+        assert self._names(client, headers, max_price=10) == ["Mug"]
+
+    def test_inverted_price_range_returns_422(self, client, catalog):
+        headers, _ = catalog
+        response = client.get("/gifts", params={"min_price": 50, "max_price": 10}, headers=headers)
+        assert response.status_code == 422
+
+    def test_recipient(self, client, catalog):
+        headers, recipient_id = catalog
+        assert self._names(client, headers, recipient_id=recipient_id) == ["Mug", "Scarf"]
+
+    def test_has_url(self, client, catalog):
+        headers, _ = catalog
+        assert self._names(client, headers, has_url="true") == ["Book", "Watch"]
+        assert self._names(client, headers, has_url="false") == ["Card", "Lamp", "Mug", "Scarf"]
+
+    def test_text_search_over_name_and_url(self, client, catalog):
+        headers, _ = catalog
+        assert self._names(client, headers, q="WATCH") == ["Watch"]
+        assert self._names(client, headers, q="example.com", status="idee") == ["Book"]
+        assert self._names(client, headers, q="ar") == ["Card", "Scarf"]
+
+    def test_filters_combine_and_drive_the_total(self, client, catalog):
+        headers, recipient_id = catalog
+        response = client.get(
+            "/gifts",
+            params={"status": ["achete", "offert"], "min_price": 10, "recipient_id": recipient_id, "limit": 1},
+            headers=headers,
+        )
+        data = response.json()
+        assert [item["name"] for item in data["items"]] == ["Scarf"]
+        assert data["meta"]["total"] == 1
+
+    @pytest.mark.parametrize("count", ["exact", "window", "cached"])
+    def test_total_follows_filters_for_every_count_strategy(self, client, catalog, count):
+        headers, _ = catalog
+        client.get("/gifts", params={"count": "cached"}, headers=headers)  # warm the unfiltered cached total
+
+        response = client.get("/gifts", params={"status": "idee", "count": count}, headers=headers)
+
+        assert response.json()["meta"]["total"] == 2
+
+    def test_filters_apply_to_cursor_pages(self, client, catalog):
+        headers, _ = catalog
+        first = client.get("/gifts", params={"cursor": "", "sort": "asc", "limit": 1, "status": "achete"}, headers=headers).json()
+        second = client.get(
+            "/gifts", params={"cursor": first["meta"]["nextCursor"], "sort": "asc", "limit": 1, "status": "achete"}, headers=headers,
+        ).json()
+
+        assert [item["name"] for item in first["items"] + second["items"]] == ["Lamp", "Scarf"]
+        assert second["meta"]["hasNext"] is False
+
+    def test_no_facets_unless_requested(self, client, catalog):
+        headers, _ = catalog
+        assert client.get("/gifts", headers=headers).json()["facets"] is None
+
+    def test_status_facets_ignore_the_status_filter_but_follow_the_others(self, client, catalog):
+        headers, _ = catalog
+        response = client.get("/gifts", params={"facets": "status", "status": "achete", "min_price": 10}, headers=headers)
+
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["facets"]["status"] == {
+            "idee": 1, "achete": 2, "commande": 0, "en_cours_livraison": 0,
+            "livre": 1, "recupere": 0, "emballe": 0, "offert": 0,
+        }
+
+    def test_filters_do_not_leak_other_users_gifts(self, client, catalog, other_user_with_gifts):
+        headers, _ = catalog
+        response = client.get("/gifts", params={"status": "idee", "facets": "status"}, headers=headers)
+
+        assert sorted(item["name"] for item in response.json()["items"]) == ["Book", "Card"]
+        assert response.json()["facets"]["status"]["idee"] == 2
+
+
 class TestGetGiftByIdEndpoint:
 
     def test_get_gift_by_id_success(self, client, authenticated_user):
@@ -664,3 +942,105 @@ class TestDeleteGiftEndpoint:
         # Second delete - should return 404
         response2 = client.delete(f"/gifts/{gift_id}", headers=headers)
         assert response2.status_code == 404
+
+
+class TestGiftsBatchEndpoint:
+
+    def test_batch_create_update_delete(self, client, authenticated_user_with_gifts):
+        user, headers, gifts = authenticated_user_with_gifts
+        recipient_id = client.post("/recipients", json={"name": "Mom"}, headers=headers).json()["id"]
+
+        response = client.post("/gifts/batch", json={"operations": [
+            {"op": "create", "data": {"name": "New A", "price": "10.00", "recipient_ids": [recipient_id]}},
+            {"op": "create", "data": {"name": "New B"}},
+            {"op": "update", "id": gifts[0]["id"], "data": {"status": "achete", "recipient_ids": [recipient_id]}},
+            {"op": "update", "id": gifts[1]["id"], "data": {"name": "Renamed"}},
+            {"op": "delete", "id": gifts[2]["id"]},
+        ]}, headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["committed"] is True
+        assert data["succeeded"] == 5
+        assert data["failed"] == 0
+        results = data["results"]
+        assert [r["status"] for r in results] == [201, 201, 200, 200, 204]
+        assert results[0]["item"]["name"] == "New A"
+        assert results[0]["item"]["recipient_ids"] == [recipient_id]
+        assert results[2]["item"]["status"] == "achete"
+        assert results[2]["item"]["recipient_ids"] == [recipient_id]
+        assert results[3]["item"]["name"] == "Renamed"
+        assert results[4]["item"] is None
+
+        assert client.get(f"/gifts/{results[1]['id']}", headers=headers).json()["name"] == "New B"
+        assert client.get(f"/gifts/{gifts[2]['id']}", headers=headers).status_code == 404
+        assert set(client.get(f"/recipients/{recipient_id}", headers=headers).json()["gift_ids"]) == {
+            results[0]["id"], gifts[0]["id"]
+        }
+
+    def test_batch_atomic_rolls_back_everything(self, client, authenticated_user_with_gifts):
+        user, headers, gifts = authenticated_user_with_gifts
+        unknown = str(uuid.uuid4())
+
+        response = client.post("/gifts/batch", json={"operations": [
+            {"op": "create", "data": {"name": "Never"}},
+            {"op": "delete", "id": gifts[0]["id"]},
+            {"op": "update", "id": unknown, "data": {"name": "X"}},
+        ]}, headers=headers)
+
+        data = response.json()
+        assert data["committed"] is False
+        assert [r["status"] for r in data["results"]] == [424, 424, 404]
+        assert data["results"][2]["id"] == unknown
+        assert client.get("/gifts", headers=headers).json()["meta"]["total"] == 5
+
+    def test_batch_best_effort_applies_valid_operations(
+        self, client, db_session, authenticated_user_with_gifts, other_user_with_gifts
+    ):
+        user, headers, gifts = authenticated_user_with_gifts
+        other_user, other_gifts = other_user_with_gifts
+        unknown_recipient = str(uuid.uuid4())
+
+        response = client.post("/gifts/batch", json={"mode": "best_effort", "operations": [
+            {"op": "create", "data": {"name": "Kept"}},
+            {"op": "create", "data": {"name": "Bad link", "recipient_ids": [unknown_recipient]}},
+            {"op": "delete", "id": other_gifts[0]["id"]},
+            {"op": "delete", "id": gifts[0]["id"]},
+            {"op": "update", "id": gifts[0]["id"], "data": {"name": "Twice"}},
+        ]}, headers=headers)
+
+        data = response.json()
+        assert data["committed"] is True
+        assert data["succeeded"] == 2
+        assert data["failed"] == 3
+        assert [r["status"] for r in data["results"]] == [201, 404, 404, 204, 409]
+        assert unknown_recipient in data["results"][1]["error"]
+        assert client.get("/gifts", headers=headers).json()["meta"]["total"] == 5
+        # The other user's gift is untouched
+        assert db_session.get(Gift, uuid.UUID(other_gifts[0]["id"])) is not None
+
+    def test_batch_query_count_does_not_grow_with_size(self, client, authenticated_user, count_queries):
+        user, headers = authenticated_user
+
+        def batch(size):
+            with count_queries() as queries:
+                client.post("/gifts/batch", json={"operations": [
+                    {"op": "create", "data": {"name": f"Gift {i}"}} for i in range(size)
+                ]}, headers=headers)
+            return len(queries)
+
+        assert batch(2) == batch(20)
+
+    def test_batch_validation(self, client, authenticated_user):
+        user, headers = authenticated_user
+
+        assert client.post("/gifts/batch", json={"operations": []}, headers=headers).status_code == 422
+        assert client.post("/gifts/batch", json={"operations": [{"op": "upsert"}]}, headers=headers).status_code == 422
+        assert client.post(
+            "/gifts/batch", json={"operations": [{"op": "create", "data": {"name": "x", "quantity": 0}}]}, headers=headers
+        ).status_code == 422
+
+    def test_batch_requires_authentication(self, client):
+        response = client.post("/gifts/batch", json={"operations": [{"op": "create", "data": {"name": "x"}}]})
+
+        assert response.status_code == 401
@@ -186,11 +186,56 @@ class TestGetRecipientsEndpoint:
         assert items[1]["name"] == "Bob"
         assert items[2]["name"] == "Alice"
     
+    def test_get_recipients_query_count_does_not_depend_on_page_size(self, client, authenticated_user, count_queries):
+        user, headers = authenticated_user
+
+        gids = [client.post("/gifts", json={"name": f"G{i}"}, headers=headers).json()["id"] for i in range(2)]
+        for i in range(12):
+            client.post("/recipients", json={"name": f"Recipient {i}", "gift_ids": gids}, headers=headers)
+
+        with count_queries() as small_page:
+            response = client.get("/recipients?limit=2", headers=headers)
+            assert response.status_code == 200
+        with count_queries() as full_page:
+            response = client.get("/recipients?limit=100", headers=headers)
+            assert response.status_code == 200
+
+        assert len(response.json()["items"]) == 12
+        assert all(sorted(item["gift_ids"]) == sorted(gids) for item in response.json()["items"])
+        assert len(full_page) == len(small_page)
+
+    def test_get_recipients_search(self, client, authenticated_user_with_recipients, other_user_with_recipients):
+        _, headers, recipients = authenticated_user_with_recipients
+
+        by_name = client.get("/recipients?q=recipient 3", headers=headers).json()
+        by_notes = client.get("/recipients?q=NOTES FOR", headers=headers).json()
+
+        assert [r["id"] for r in by_name["items"]] == [recipients[3]["id"]]
+        assert by_name["meta"]["total"] == 1
+        assert by_notes["meta"]["total"] == 5
+
     def test_get_recipients_requires_authentication(self, client):
         response = client.get("/recipients")
         assert response.status_code == 401
 
 
+class TestGetRecipientsCursorPagination:
+
+    def test_cursor_walks_all_recipients_once(self, client, authenticated_user):
+        user, headers = authenticated_user
+        for name in ["D", "B", "A", "C", "E"]:
+            client.post("/recipients", json={"name": name}, headers=headers)
+
+        names = []
+        cursor = ""
+        while cursor is not None:
+            data = client.get(f"/recipients?sort=desc&limit=2&cursor={cursor}", headers=headers).json()
+            names.extend(r["name"] for r in data["items"])
+            cursor = data["meta"]["nextCursor"]
+
+        assert names == ["E", "D", "C", "B", "A"]
+
+
 class TestGetRecipientByIdEndpoint:
     
     def test_get_recipient_by_id_success(self, client, authenticated_user):
@@ -419,3 +464,55 @@ class TestDeleteRecipientEndpoint:
         # Second delete - should return 404
         response2 = client.delete(f"/recipients/{recipient_id}", headers=headers)
         assert response2.status_code == 404
+
+
+class TestRecipientsBatchEndpoint:
+
+    def test_batch_create_update_delete(self, client, authenticated_user_with_recipients):
+        user, headers, recipients = authenticated_user_with_recipients
+        gift_id = client.post("/gifts", json={"name": "Scarf"}, headers=headers).json()["id"]
+
+        response = client.post("/recipients/batch", json={"operations": [
+            {"op": "create", "data": {"name": "Aunt", "gift_ids": [gift_id]}},
+            {"op": "update", "id": recipients[0]["id"], "data": {"notes": "Likes tea", "gift_ids": [gift_id]}},
+            {"op": "delete", "id": recipients[1]["id"]},
+        ]}, headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["committed"] is True
+        assert [r["status"] for r in data["results"]] == [201, 200, 204]
+        assert data["results"][0]["item"]["gift_ids"] == [gift_id]
+        assert data["results"][1]["item"]["notes"] == "Likes tea"
+        assert set(client.get(f"/gifts/{gift_id}", headers=headers).json()["recipient_ids"]) == {
+            data["results"][0]["id"], recipients[0]["id"]
+        }
+        assert client.get(f"/recipients/{recipients[1]['id']}", headers=headers).status_code == 404
+
+    def test_batch_atomic_reports_missing_gifts(self, client, authenticated_user_with_recipients):
+        user, headers, recipients = authenticated_user_with_recipients
+        unknown = str(uuid.uuid4())
+
+        response = client.post("/recipients/batch", json={"operations": [
+            {"op": "delete", "id": recipients[0]["id"]},
+            {"op": "create", "data": {"name": "Aunt", "gift_ids": [unknown]}},
+        ]}, headers=headers)
+
+        data = response.json()
+        assert data["committed"] is False
+        assert [r["status"] for r in data["results"]] == [424, 404]
+        assert unknown in data["results"][1]["error"]
+        assert client.get(f"/recipients/{recipients[0]['id']}", headers=headers).status_code == 200
+
+    def test_batch_best_effort(self, client, authenticated_user_with_recipients):
+        user, headers, recipients = authenticated_user_with_recipients
+
+        response = client.post("/recipients/batch", json={"mode": "best_effort", "operations": [
+            {"op": "update", "id": str(uuid.uuid4()), "data": {"name": "Ghost"}},
+            {"op": "update", "id": recipients[0]["id"], "data": {"name": "Renamed"}},
+        ]}, headers=headers)
+
+        data = response.json()
+        assert data["committed"] is True
+        assert [r["status"] for r in data["results"]] == [404, 200]
+        assert client.get(f"/recipients/{recipients[0]['id']}", headers=headers).json()["name"] == "Renamed"
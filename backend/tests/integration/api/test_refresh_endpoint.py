@@ -67,6 +67,17 @@ class TestRefreshEndpoint:
         assert new_refresh_token is not None
         assert new_refresh_token != old_refresh_token
     
+    def test_refresh_is_three_statements(self, client, registered_user, logged_in_user_with_refresh_cookie, count_queries):
+        with count_queries() as queries:
+            response = client.post("/auth/refresh", cookies={"refresh_token": logged_in_user_with_refresh_cookie})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["user"]["email"] == "john@example.com"
+        assert len(queries) == 3
+        assert queries[0].startswith("SELECT") and "JOIN users" in queries[0]
+        assert queries[1].startswith("INSERT INTO refresh_tokens") and "RETURNING" in queries[1]
+        assert queries[2].startswith("UPDATE refresh_tokens") and "revoked_at IS NULL" in queries[2]
+
     def test_refresh_revokes_old_token(self, client, db_session, registered_user, logged_in_user_with_refresh_cookie):
         old_refresh_token = logged_in_user_with_refresh_cookie
         old_fingerprint = get_refresh_token_fingerprint(old_refresh_token)
@@ -222,7 +233,8 @@ class TestRefreshEndpoint:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Not authenticated" in response.json()["detail"]
     
-    def test_refresh_reuse_after_first_rotation(self, client, db_session, registered_user, logged_in_user_with_refresh_cookie):
+    def test_refresh_reuse_after_first_rotation(self, client, db_session, registered_user, logged_in_user_with_refresh_cookie, monkeypatch):
+        monkeypatch.setattr("src.domains.auth.service.settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS", 0)
         token1 = logged_in_user_with_refresh_cookie
         
         response1 = client.post("/auth/refresh", cookies={"refresh_token": token1})
@@ -235,6 +247,29 @@ class TestRefreshEndpoint:
         remaining_tokens = db_session.execute(stmt).scalars().all()
         assert len(remaining_tokens) == 0
     
+    def test_refresh_within_grace_returns_the_same_successor(self, client, db_session, registered_user, logged_in_user_with_refresh_cookie):
+        token1 = logged_in_user_with_refresh_cookie
+
+        response1 = client.post("/auth/refresh", cookies={"refresh_token": token1})
+        response2 = client.post("/auth/refresh", cookies={"refresh_token": token1})
+
+        assert response1.status_code == status.HTTP_200_OK
+        assert response2.status_code == status.HTTP_200_OK
+        assert response2.cookies.get("refresh_token") == response1.cookies.get("refresh_token")
+        stmt = select(RefreshToken).where(RefreshToken.user_id == registered_user.id, RefreshToken.revoked_at.is_(None))
+        assert len(db_session.execute(stmt).scalars().all()) == 1
+
+    def test_refresh_within_grace_after_successor_rotated_is_reuse(self, client, db_session, registered_user, logged_in_user_with_refresh_cookie):
+        token1 = logged_in_user_with_refresh_cookie
+        token2 = client.post("/auth/refresh", cookies={"refresh_token": token1}).cookies.get("refresh_token")
+        assert client.post("/auth/refresh", cookies={"refresh_token": token2}).status_code == status.HTTP_200_OK
+
+        response = client.post("/auth/refresh", cookies={"refresh_token": token1})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        stmt = select(RefreshToken).where(RefreshToken.user_id == registered_user.id)
+        assert db_session.execute(stmt).scalars().all() == []
+
     def test_refresh_different_users_get_different_tokens(self, client, db_session):
         user1 = User(email="user1@example.com", password_hash=get_password_hash("Pass1!"), name="User 1", is_verified=True)
         user2 = User(email="user2@example.com", password_hash=get_password_hash("Pass2!"), name="User 2", is_verified=True)
@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timezone, timedelta
 from fastapi import status
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 from src.domains.users.models import User
 from src.domains.auth.models import PasswordResetToken, RefreshToken
@@ -237,3 +237,37 @@ class TestResetPasswordEndpoint:
         )
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestResetPasswordUnitOfWork:
+
+    def test_reset_password_commits_once(self, client, db_session):
+        user = User(email="uow@example.com", password_hash=get_password_hash("OldPassword123!"), name="Uow")
+        db_session.add(user)
+        db_session.flush()
+        raw_token = "unit_of_work_reset_token"
+        db_session.add(PasswordResetToken(
+            user_id=user.id,
+            token_fingerprint=get_reset_password_token_fingerprint(raw_token),
+            token_hash=hash_reset_token(raw_token),
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        ))
+        db_session.commit()
+
+        commits = []
+
+        def _record(session):
+            commits.append(session)
+
+        event.listen(db_session, "after_commit", _record)
+        try:
+            response = client.post(
+                f"/auth/reset-password?token={raw_token}",
+                json={"password": "NewPassword123!", "confirmed_password": "NewPassword123!"},
+            )
+        finally:
+            event.remove(db_session, "after_commit", _record)
+
+        assert response.status_code == status.HTTP_200_OK
+        # password, reset token and refresh tokens are written in a single transaction
+        assert len(commits) == 1
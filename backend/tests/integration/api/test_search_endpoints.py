@@ -0,0 +1,82 @@
+"""Integration tests for /search (sqlite: LIKE matching and CASE ranking)."""
+
+
+def _create(client, headers, path, **data):
+    response = client.post(path, json=data, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestSearchEndpoint:
+
+    def test_ranks_exact_then_prefix_then_contained_then_other_fields(self, client, authenticated_user):
+        _, headers = authenticated_user
+        contained = _create(client, headers, "/gifts", name="Big lego box", status="idee", quantity=1)
+        in_notes = _create(client, headers, "/recipients", name="Alice", notes="Loves lego")
+        exact = _create(client, headers, "/recipients", name="Lego", notes=None)
+        prefix = _create(client, headers, "/gifts", name="Lego castle", status="idee", quantity=1)
+        _create(client, headers, "/gifts", name="Puzzle", status="idee", quantity=1)
+
+        response = client.get("/search?q=LEGO", headers=headers)
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["id"] for item in items] == [exact["id"], prefix["id"], contained["id"], in_notes["id"]]
+        assert [item["type"] for item in items] == ["recipient", "gift", "gift", "recipient"]
+        assert items[0]["rank"] > items[1]["rank"] > items[2]["rank"] > items[3]["rank"]
+
+    def test_highlights_are_escaped_and_marked(self, client, authenticated_user):
+        _, headers = authenticated_user
+        _create(client, headers, "/recipients", name="<Bob>", notes="Wants a <b>drone</b>")
+
+        response = client.get("/search?q=drone", headers=headers)
+
+        hit, = response.json()["items"]
+        assert hit["highlights"] == {"notes": "Wants a &lt;b&gt;<mark>drone</mark>&lt;/b&gt;"}
+        assert hit["name"] == "<Bob>"
+
+    def test_wildcards_are_taken_literally(self, client, authenticated_user):
+        _, headers = authenticated_user
+        _create(client, headers, "/gifts", name="50% off voucher", status="idee", quantity=1)
+        _create(client, headers, "/gifts", name="500 pieces puzzle", status="idee", quantity=1)
+
+        response = client.get("/search", params={"q": "50%"}, headers=headers)
+
+        assert [item["name"] for item in response.json()["items"]] == ["50% off voucher"]
+
+    def test_pagination(self, client, authenticated_user_with_gifts, authenticated_user_with_recipients):
+        _, headers, _ = authenticated_user_with_gifts
+
+        first = client.get("/search?q=i&limit=4", headers=headers).json()
+        last = client.get("/search?q=i&limit=4&page=3", headers=headers).json()
+
+        assert first["meta"] == {
+            "page": 1, "limit": 4, "total": 10, "totalPages": 3, "hasPrev": False, "hasNext": True,
+        }
+        assert len(last["items"]) == 2
+        assert not last["meta"]["hasNext"]
+
+    def test_returns_only_user_data(self, client, authenticated_user, other_user_with_gifts, other_user_with_recipients):
+        _, headers = authenticated_user
+
+        response = client.get("/search?q=other", headers=headers)
+
+        assert response.json()["items"] == []
+        assert response.json()["meta"]["total"] == 0
+
+    def test_empty_query_returns_422(self, client, authenticated_user):
+        _, headers = authenticated_user
+
+        assert client.get("/search?q=", headers=headers).status_code == 422
+        assert client.get("/search", headers=headers).status_code == 422
+
+    def test_blank_query_returns_422(self, client, authenticated_user):
+        _, headers = authenticated_user
+
+        response = client.get("/search", params={"q": "   "}, headers=headers)
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "q cannot be blank"
+
+    def test_requires_authentication(self, client):
+        assert client.get("/search?q=lego").status_code == 401
@@ -0,0 +1,75 @@
+"""Integration tests for /snapshot."""
+import pytest
+
+
+@pytest.fixture
+def linked_catalog(client, authenticated_user):
+    """Two recipients and two gifts: one gift linked to both recipients, the other to none."""
+    _, headers = authenticated_user
+    alice = client.post("/recipients", json={"name": "Alice", "notes": "Tea"}, headers=headers).json()
+    bob = client.post("/recipients", json={"name": "Bob"}, headers=headers).json()
+    teapot = client.post(
+        "/gifts",
+        json={"name": "Teapot", "price": 30, "status": "achete", "recipient_ids": [alice["id"], bob["id"]]},
+        headers=headers,
+    ).json()
+    book = client.post("/gifts", json={"name": "Book", "status": "idee"}, headers=headers).json()
+    return headers, {"alice": alice, "bob": bob, "teapot": teapot, "book": book}
+
+
+class TestSnapshotEndpoint:
+
+    def test_returns_everything_with_links_once(self, client, linked_catalog):
+        headers, rows = linked_catalog
+
+        response = client.get("/snapshot", headers=headers)
+
+        assert response.status_code == 200
+        body = response.json()
+        gifts = {gift["id"]: gift for gift in body["gifts"]}
+        assert gifts[rows["teapot"]["id"]] == {
+            "id": rows["teapot"]["id"], "name": "Teapot", "url": None, "price": "30.00", "status": "achete", "quantity": 1,
+        }
+        assert set(gifts) == {rows["teapot"]["id"], rows["book"]["id"]}
+        assert {r["id"]: r["notes"] for r in body["recipients"]} == {rows["alice"]["id"]: "Tea", rows["bob"]["id"]: None}
+        assert sorted(map(tuple, body["links"])) == sorted([
+            (rows["teapot"]["id"], rows["alice"]["id"]),
+            (rows["teapot"]["id"], rows["bob"]["id"]),
+        ])
+
+    def test_three_queries_whatever_the_size(self, client, linked_catalog, count_queries):
+        headers, _ = linked_catalog
+        for i in range(10):
+            client.post("/gifts", json={"name": f"Extra {i}", "status": "idee"}, headers=headers)
+
+        with count_queries() as queries:
+            response = client.get("/snapshot", headers=headers)
+
+        assert len(response.json()["gifts"]) == 12
+        assert len([q for q in queries if q.lstrip().upper().startswith("SELECT")]) == 3
+
+    def test_etag_revalidation(self, client, linked_catalog):
+        headers, rows = linked_catalog
+        first = client.get("/snapshot", headers=headers)
+        etag = first.headers["etag"]
+
+        unchanged = client.get("/snapshot", headers={**headers, "If-None-Match": etag})
+        client.patch(f"/gifts/{rows['book']['id']}", json={"status": "achete"}, headers=headers)
+        changed = client.get("/snapshot", headers={**headers, "If-None-Match": etag})
+
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert unchanged.headers["etag"] == etag
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_returns_only_user_data(self, client, authenticated_user, other_user_with_gifts, other_user_with_recipients):
+        _, headers = authenticated_user
+
+        response = client.get("/snapshot", headers=headers)
+
+        assert response.json() == {"gifts": [], "recipients": [], "links": []}
+
+    def test_requires_authentication(self, client):
+        assert client.get("/snapshot").status_code == 401
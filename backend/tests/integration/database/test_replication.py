@@ -0,0 +1,79 @@
+"""
+Read replica checks.
+
+Verifies that TEST_POSTGRES_REPLICA_URL is a hot standby of TEST_POSTGRES_URL and that it replays a write
+within DATABASE_READ_YOUR_WRITES_SECONDS, the window during which a client keeps reading from the primary.
+
+Needs the streaming replication environment (make replication-start):
+    TEST_POSTGRES_URL=<primary URL> TEST_POSTGRES_REPLICA_URL=<replica URL> pytest tests/integration/database
+Skipped when either URL is not set or the servers are unreachable.
+"""
+import os
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from src.config.settings import get_settings
+
+SCHEMA = "replication_check"
+
+
+@pytest.fixture(scope="module")
+def engines():
+    primary_url = os.environ.get("TEST_POSTGRES_URL")
+    replica_url = os.environ.get("TEST_POSTGRES_REPLICA_URL")
+    if not primary_url or not replica_url:
+        pytest.skip("TEST_POSTGRES_URL and TEST_POSTGRES_REPLICA_URL are not set")
+
+    primary = create_engine(primary_url)
+    replica = create_engine(replica_url)
+    try:
+        with primary.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.marks (id uuid PRIMARY KEY)"))
+        with replica.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except OperationalError:
+        primary.dispose()
+        replica.dispose()
+        pytest.skip("PostgreSQL primary or replica is not reachable")
+
+    yield primary, replica
+
+    with primary.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    primary.dispose()
+    replica.dispose()
+
+
+def test_replica_is_a_read_only_standby(engines):
+    _, replica = engines
+
+    with replica.connect() as conn:
+        assert conn.execute(text("SELECT pg_is_in_recovery()")).scalar_one() is True
+        with pytest.raises(DBAPIError):
+            conn.execute(text(f"INSERT INTO {SCHEMA}.marks VALUES (gen_random_uuid())"))
+
+
+def test_replica_replays_a_write_within_the_read_your_writes_window(engines):
+    primary, replica = engines
+    mark = uuid.uuid4()
+    window = get_settings().DATABASE_READ_YOUR_WRITES_SECONDS
+
+    with primary.begin() as conn:
+        conn.execute(text(f"INSERT INTO {SCHEMA}.marks VALUES (:id)"), {"id": mark})
+    written_at = time.monotonic()
+
+    with replica.connect() as conn:
+        while True:
+            found = conn.execute(text(f"SELECT 1 FROM {SCHEMA}.marks WHERE id = :id"), {"id": mark}).first()
+            conn.rollback()
+            if found or time.monotonic() - written_at > window:
+                break
+            time.sleep(0.05)
+
+    assert found, f"the replica did not replay the write within {window}s"
@@ -0,0 +1,41 @@
+import pytest
+
+from src.commands import calibrate_argon2
+from src.commands.calibrate_argon2 import Measure, calibrate, format_report, measure_argon2
+
+
+@pytest.fixture
+def fake_host(monkeypatch):
+    """One hash costs 1 ms per MiB and per pass, instead of running Argon2."""
+    def _measure(time_cost, memory_cost_kib, parallelism, rounds=5):
+        latency = time_cost * memory_cost_kib / 1024
+        return Measure(time_cost, memory_cost_kib, parallelism, latency_ms=latency, cpu_ms=latency)
+
+    monkeypatch.setattr(calibrate_argon2, "measure_argon2", _measure)
+
+
+def test_keeps_the_largest_memory_within_budget(fake_host):
+    chosen, _ = calibrate(target_ms=200, parallelism=1)
+
+    assert (chosen.memory_cost_kib, chosen.time_cost) == (64 * 1024, 3)
+
+
+def test_skips_memory_costs_that_fit_less_than_two_passes(fake_host):
+    chosen, measures = calibrate(target_ms=150, parallelism=1)
+
+    assert (chosen.memory_cost_kib, chosen.time_cost) == (64 * 1024, 2)
+    assert any(m.memory_cost_kib == 128 * 1024 and m.time_cost == 1 for m in measures)
+
+
+def test_no_parameters_fit_a_tiny_budget(fake_host):
+    chosen, _ = calibrate(target_ms=10, parallelism=1)
+
+    assert chosen is None
+
+
+def test_real_measure_and_report():
+    measure = measure_argon2(time_cost=1, memory_cost_kib=8192, parallelism=1, rounds=1)
+
+    assert measure.latency_ms > 0
+    assert measure.hashes_per_second_per_core > 0
+    assert "8 MiB" in format_report([measure])
@@ -0,0 +1,173 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from src.commands.purge_tokens import purge_tokens
+from src.domains.auth.models import PasswordResetToken, RefreshToken
+from src.domains.auth.refresh_token_handler import get_refresh_token_fingerprint, hash_token
+from src.domains.auth.repository import RefreshTokenRepository, ResetPasswordRepository
+from src.domains.auth.service import AuthService
+from src.domains.users.models import User
+from src.domains.users.repository import UserRepository
+
+NOW = datetime.now(timezone.utc)
+
+
+def _user(db_session, email="purge@example.com", **kwargs) -> User:
+    user = User(email=email, password_hash="hash", name="Purge", **kwargs)
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+def _refresh_token(db_session, user, name, expires_in, revoked_ago=None, replaced_by=None) -> RefreshToken:
+    token = RefreshToken(
+        user_id=user.id,
+        token_hash=f"hash-{name}",
+        token_fingerprint=f"fingerprint-{name}",
+        expires_at=NOW + expires_in,
+        revoked_at=NOW - revoked_ago if revoked_ago is not None else None,
+        replaced_by_id=replaced_by.id if replaced_by is not None else None,
+    )
+    db_session.add(token)
+    db_session.flush()
+    return token
+
+
+def _remaining(db_session) -> dict[str, RefreshToken]:
+    db_session.expire_all()
+    return {t.token_fingerprint.removeprefix("fingerprint-"): t for t in db_session.scalars(select(RefreshToken))}
+
+
+def _rotation_chain(db_session, user):
+    """Three rotations: two tokens revoked long ago and expired, one revoked yesterday, the current one active."""
+    active = _refresh_token(db_session, user, "active", timedelta(days=5))
+    recent = _refresh_token(db_session, user, "recent", timedelta(days=4), timedelta(days=1), replaced_by=active)
+    old = _refresh_token(db_session, user, "old", timedelta(days=-2), timedelta(days=10), replaced_by=recent)
+    _refresh_token(db_session, user, "oldest", timedelta(days=-3), timedelta(days=11), replaced_by=old)
+    db_session.commit()
+
+
+def test_deletes_expired_refresh_tokens_only(db_session):
+    user = _user(db_session)
+    _rotation_chain(db_session, user)
+    _refresh_token(db_session, user, "expired", timedelta(days=-2))
+    _refresh_token(db_session, user, "just_expired", timedelta(hours=-1))
+    _refresh_token(db_session, user, "revoked_unexpired", timedelta(days=1), timedelta(days=8))
+    db_session.commit()
+
+    report = purge_tokens(db_session, now=NOW)
+
+    remaining = _remaining(db_session)
+    assert set(remaining) == {"active", "recent", "just_expired", "revoked_unexpired"}
+    assert remaining["recent"].replaced_by_id == remaining["active"].id
+    assert report["refresh_tokens"] == 3
+
+
+def test_revoked_unexpired_token_still_triggers_reuse_detection(db_session):
+    user = _user(db_session, is_verified=True)
+    raw_token = uuid.uuid4().hex
+    db_session.add(RefreshToken(
+        user_id=user.id,
+        token_hash=hash_token(raw_token),
+        token_fingerprint=get_refresh_token_fingerprint(raw_token),
+        expires_at=NOW + timedelta(days=20),
+        revoked_at=NOW - timedelta(days=10),
+    ))
+    _refresh_token(db_session, user, "active", timedelta(days=20))
+    db_session.commit()
+
+    purge_tokens(db_session, now=NOW)
+    service = AuthService(UserRepository(db_session), RefreshTokenRepository(db_session), ResetPasswordRepository(db_session))
+    with pytest.raises(ValueError, match="refresh_reuse"):
+        service.rotate(raw_token)
+
+    assert _remaining(db_session) == {}
+
+
+def test_unlinks_tokens_pointing_at_deleted_rows(db_session):
+    user = _user(db_session)
+    successor = _refresh_token(db_session, user, "successor", timedelta(days=-2), timedelta(days=10))
+    _refresh_token(db_session, user, "kept", timedelta(days=3), timedelta(hours=1), replaced_by=successor)
+    db_session.commit()
+
+    purge_tokens(db_session, now=NOW)
+
+    remaining = _remaining(db_session)
+    assert set(remaining) == {"kept"}
+    assert remaining["kept"].replaced_by_id is None
+    assert remaining["kept"].revoked_at is not None
+
+
+def test_small_batches_delete_a_whole_chain(db_session):
+    user = _user(db_session)
+    _rotation_chain(db_session, user)
+    for n in range(5):
+        _refresh_token(db_session, user, f"expired-{n}", timedelta(days=-3))
+    db_session.commit()
+
+    report = purge_tokens(db_session, batch_size=2, now=NOW)
+
+    remaining = _remaining(db_session)
+    assert set(remaining) == {"active", "recent"}
+    assert report["refresh_tokens"] == 7
+    ids = {token.id for token in remaining.values()}
+    assert all(token.replaced_by_id in ids | {None} for token in remaining.values())
+
+
+def test_deletes_used_and_expired_reset_tokens(db_session):
+    user = _user(db_session)
+    tokens = {
+        "pending": dict(expires_at=NOW + timedelta(minutes=20)),
+        "used": dict(expires_at=NOW + timedelta(minutes=20), used_at=NOW - timedelta(minutes=5)),
+        "just_expired": dict(expires_at=NOW - timedelta(hours=1)),
+        "expired": dict(expires_at=NOW - timedelta(days=2)),
+    }
+    for name, columns in tokens.items():
+        db_session.add(PasswordResetToken(
+            user_id=user.id, token_hash=f"hash-{name}", token_fingerprint=f"fingerprint-{name}", **columns,
+        ))
+    db_session.commit()
+
+    report = purge_tokens(db_session, now=NOW)
+
+    db_session.expire_all()
+    remaining = {t.token_fingerprint for t in db_session.scalars(select(PasswordResetToken))}
+    assert remaining == {"fingerprint-pending", "fingerprint-just_expired"}
+    assert report["password_reset_tokens"] == 2
+
+
+def test_clears_expired_verification_tokens(db_session):
+    def _unverified(email, expires_in):
+        return _user(
+            db_session,
+            email=email,
+            verification_token_fingerprint=f"fingerprint-{email}",
+            verification_token_hash="hash",
+            verification_token_expires_at=NOW + expires_in,
+        )
+
+    stale = _unverified("stale@example.com", timedelta(days=-2))
+    pending = _unverified("pending@example.com", timedelta(minutes=30))
+    db_session.commit()
+
+    report = purge_tokens(db_session, now=NOW)
+
+    db_session.refresh(stale)
+    db_session.refresh(pending)
+    assert stale.verification_token_fingerprint is None
+    assert stale.verification_token_hash is None
+    assert stale.verification_token_expires_at is None
+    assert stale.is_verified is False
+    assert pending.verification_token_fingerprint == "fingerprint-pending@example.com"
+    assert report["verification_tokens"] == 1
+
+
+def test_nothing_to_purge(db_session):
+    assert purge_tokens(db_session, now=NOW) == {
+        "refresh_tokens": 0,
+        "password_reset_tokens": 0,
+        "verification_tokens": 0,
+    }
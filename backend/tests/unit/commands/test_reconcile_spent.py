@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+from src.commands.reconcile_spent import reconcile_spent
+from src.domains.gifts.enums import GiftStatusEnum
+from src.domains.gifts.models import Gift
+from src.domains.users.models import User
+
+
+def _drifted_user(db_session) -> User:
+    user = User(email="drift@example.com", password_hash="hash", name="Drift")
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(Gift(user_id=user.id, name="Gift", price=Decimal("4.50"), quantity=2, status=GiftStatusEnum.offert))
+    db_session.commit()
+    return user
+
+
+def test_reports_drift_without_fixing(db_session):
+    user = _drifted_user(db_session)
+
+    drift = reconcile_spent(db_session)
+
+    assert drift == [(user.id, Decimal("0.00"), Decimal("9.00"))]
+    db_session.refresh(user)
+    assert user.spent == Decimal("0.00")
+
+
+def test_fix_rewrites_drifting_users(db_session):
+    user = _drifted_user(db_session)
+
+    reconcile_spent(db_session, fix=True)
+
+    db_session.refresh(user)
+    assert user.spent == Decimal("9.00")
+    assert reconcile_spent(db_session) == []
@@ -0,0 +1,55 @@
+import uuid
+
+from src.core.batch import BatchItemError, batch_response
+from src.domains.gifts.schemas import GiftBatchRequest
+
+
+def _operations(*operations):
+    return GiftBatchRequest.model_validate({"operations": list(operations)}).operations
+
+
+class TestBatchResponse:
+
+    def test_successful_operations(self):
+        gift_id = uuid.uuid4()
+        created_id = uuid.uuid4()
+        operations = _operations(
+            {"op": "create", "data": {"name": "A"}},
+            {"op": "delete", "id": str(gift_id)},
+        )
+
+        response = batch_response("atomic", operations, {}, {0: created_id, 1: gift_id}, {created_id: "item"})
+
+        assert response["committed"] is True
+        assert (response["succeeded"], response["failed"]) == (2, 0)
+        assert response["results"][0] == {"index": 0, "op": "create", "status": 201, "id": created_id, "item": "item"}
+        assert response["results"][1]["status"] == 204
+        assert response["results"][1]["item"] is None
+
+    def test_atomic_failure_marks_other_operations_not_applied(self):
+        operations = _operations(
+            {"op": "create", "data": {"name": "A"}},
+            {"op": "update", "id": str(uuid.uuid4()), "data": {"name": "B"}},
+        )
+
+        response = batch_response("atomic", operations, {1: BatchItemError(404, "Gift not found")}, {}, {})
+
+        assert response["committed"] is False
+        assert (response["succeeded"], response["failed"]) == (0, 2)
+        assert [r["status"] for r in response["results"]] == [424, 404]
+        assert response["results"][1]["error"] == "Gift not found"
+
+    def test_best_effort_failure_keeps_other_operations(self):
+        created_id = uuid.uuid4()
+        operations = _operations(
+            {"op": "create", "data": {"name": "A"}},
+            {"op": "delete", "id": str(uuid.uuid4())},
+        )
+
+        response = batch_response(
+            "best_effort", operations, {1: BatchItemError(404, "Gift not found")}, {0: created_id}, {}
+        )
+
+        assert response["committed"] is True
+        assert (response["succeeded"], response["failed"]) == (1, 1)
+        assert [r["status"] for r in response["results"]] == [201, 404]
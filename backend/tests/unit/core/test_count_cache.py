@@ -0,0 +1,142 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.count_cache import CountCache, cached_count, count_cache
+from src.domains.gifts.models import Gift
+from src.domains.gifts.repository import GiftRepository
+from src.domains.users.models import User
+from src.infrastructure.database.routing import REPLICA_INFO_KEY
+
+
+class TestCountCache:
+
+    def test_computes_once_then_serves_cached_value(self):
+        cache = CountCache(ttl_seconds=60)
+        compute = Mock(return_value=7)
+
+        assert cache.get_or_compute("k", compute) == 7
+        assert cache.get_or_compute("k", compute) == 7
+        compute.assert_called_once()
+
+    def test_bump_invalidates(self):
+        cache = CountCache(ttl_seconds=60)
+        cache.get_or_compute("k", lambda: 1)
+
+        cache.bump("k")
+
+        assert cache.get_or_compute("k", lambda: 2) == 2
+
+    def test_count_racing_with_a_write_is_not_served(self):
+        cache = CountCache(ttl_seconds=60)
+
+        def compute_during_write():
+            cache.bump("k")  # a write lands while the count is running
+            return 1
+
+        cache.get_or_compute("k", compute_during_write)
+
+        assert cache.get_or_compute("k", lambda: 2) == 2
+
+    def test_entries_expire(self):
+        cache = CountCache(ttl_seconds=10)
+        with patch("src.core.count_cache.time.monotonic", return_value=100.0):
+            cache.get_or_compute("k", lambda: 1)
+        with patch("src.core.count_cache.time.monotonic", return_value=111.0):
+            assert cache.get_or_compute("k", lambda: 2) == 2
+
+    def test_size_is_bounded(self):
+        cache = CountCache(ttl_seconds=60, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.get_or_compute(key, lambda: 1)
+
+        compute = Mock(return_value=5)
+        assert cache.get_or_compute("a", compute) == 5
+        compute.assert_called_once()
+
+
+    def test_bumps_are_bounded_too(self):
+        cache = CountCache(ttl_seconds=60, max_entries=2)
+        for key in range(100):
+            cache.bump(key)
+
+        assert len(cache._entries) == 2
+
+    def test_eviction_does_not_reopen_the_race(self):
+        cache = CountCache(ttl_seconds=60, max_entries=2)
+
+        def compute_during_write():
+            cache.bump("k")  # a write lands while the count is running...
+            for key in ("a", "b"):  # ...and its version is evicted before the count is stored
+                cache.get_or_compute(key, lambda: 0)
+            return 1
+
+        cache.get_or_compute("k", compute_during_write)
+
+        assert cache.get_or_compute("k", lambda: 2) == 2
+
+    def test_store_false_serves_but_never_fills(self):
+        cache = CountCache(ttl_seconds=60)
+        cache.get_or_compute("k", lambda: 1, store=False)
+        assert cache.get_or_compute("k", lambda: 2) == 2
+
+        assert cache.get_or_compute("k", lambda: 3, store=False) == 2
+
+
+class TestCachedCount:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        count_cache.clear()
+        yield
+        count_cache.clear()
+
+    def test_primary_session_fills_the_cache(self, db_session):
+        cached_count(db_session, "k", lambda: 1)
+
+        assert count_cache.get_or_compute("k", lambda: 2) == 1
+
+    def test_replica_session_does_not_fill_the_cache(self, db_session):
+        db_session.info[REPLICA_INFO_KEY] = True
+        try:
+            assert cached_count(db_session, "k", lambda: 1) == 1
+        finally:
+            db_session.info.pop(REPLICA_INFO_KEY)
+
+        assert count_cache.get_or_compute("k", lambda: 2) == 2
+
+
+class TestBumpCountAfterCommit:
+
+    @pytest.fixture
+    def user(self, db_session):
+        user = User(email="count@example.com", password_hash="hash", name="Count")
+        db_session.add(user)
+        db_session.commit()
+        count_cache.clear()
+        yield user
+        count_cache.clear()
+
+    def test_count_read_between_flush_and_commit_is_not_served(self, db_session, user):
+        repo = GiftRepository(db_session)
+        key = ("gifts", user.id)
+
+        repo.create(Gift(user_id=user.id, name="Flushed"))
+        # Another request counts after the bump but before the commit: it still sees the old total
+        assert count_cache.get_or_compute(key, lambda: 0) == 0
+        db_session.commit()
+
+        assert count_cache.get_or_compute(key, lambda: repo.count(user.id)) == 1
+
+    def test_rollback_forgets_the_bumped_keys(self, db_session, user):
+        repo = GiftRepository(db_session)
+        key = ("gifts", user.id)
+
+        repo.create(Gift(user_id=user.id, name="Rolled back"))
+        db_session.rollback()
+        count_cache.get_or_compute(key, lambda: repo.count(user.id))
+        db_session.commit()
+
+        compute = Mock(return_value=5)
+        assert count_cache.get_or_compute(key, compute) == 0
+        compute.assert_not_called()
@@ -0,0 +1,20 @@
+from src.core.http_cache import compute_etag, etag_matches
+
+
+class TestEtag:
+
+    def test_same_body_same_strong_tag(self):
+        etag = compute_etag(b'{"gifts":[]}')
+
+        assert etag == compute_etag(b'{"gifts":[]}')
+        assert etag != compute_etag(b'{"gifts":[1]}')
+        assert etag.startswith('"') and etag.endswith('"')
+
+    def test_if_none_match(self):
+        etag = compute_etag(b"body")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
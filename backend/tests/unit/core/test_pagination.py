@@ -0,0 +1,41 @@
+import base64
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.pagination import decode_cursor, encode_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+class TestDecodeCursor:
+
+    def test_round_trip(self):
+        row_id = uuid.uuid4()
+
+        decoded = decode_cursor(encode_cursor("asc", "Chess", row_id, "next"), "asc")
+
+        assert decoded == {"key": "Chess", "id": row_id, "direction": "next"}
+
+    @pytest.mark.parametrize("sort, cursor", [
+        ("asc", "%%%"),                                                                  # not base64
+        ("asc", base64.urlsafe_b64encode(b"\xff\xfe").decode()),                          # not utf-8
+        ("asc", base64.urlsafe_b64encode(b"not json").decode()),                          # not JSON
+        ("asc", _raw_cursor([1, 2])),                                                     # not an object
+        ("asc", _raw_cursor({"s": "asc", "k": "a", "d": "next"})),                        # missing id
+        ("asc", _raw_cursor({"s": "asc", "k": "a", "i": "nope", "d": "next"})),           # bad id
+        ("default", _raw_cursor({"s": "default", "k": 12, "i": str(uuid.uuid4()), "d": "next"})),  # bad date type
+        ("default", _raw_cursor({"s": "default", "k": "yesterday", "i": str(uuid.uuid4()), "d": "next"})),  # bad date
+        ("asc", _raw_cursor({"s": "asc", "k": "a", "i": str(uuid.uuid4()), "d": "sideways"})),     # bad direction
+        ("asc", _raw_cursor({"s": "desc", "k": "a", "i": str(uuid.uuid4()), "d": "next"})),        # other sort
+    ])
+    def test_malformed_cursor_is_a_400(self, sort, cursor):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor, sort)
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Invalid cursor"
@@ -0,0 +1,32 @@
+from src.core.search import highlight, like_pattern
+
+
+class TestLikePattern:
+
+    def test_wildcards_are_escaped(self):
+        assert like_pattern("50%_off\\") == "%50\\%\\_off\\\\%"
+
+    def test_prefix(self):
+        assert like_pattern("lego", prefix=True) == "lego%"
+
+
+class TestHighlight:
+
+    def test_marks_every_word_case_insensitively(self):
+        assert highlight("Lego Star Wars set", "star lego") == "<mark>Lego</mark> <mark>Star</mark> Wars set"
+
+    def test_escapes_html(self):
+        assert highlight("<b>Book</b> & co", "book") == "&lt;b&gt;<mark>Book</mark>&lt;/b&gt; &amp; co"
+
+    def test_returns_none_without_match(self):
+        assert highlight("Puzzle", "lego") is None
+        assert highlight(None, "lego") is None
+
+    def test_snippet_around_first_match(self):
+        text = "a" * 100 + " board games " + "b" * 100
+
+        snippet = highlight(text, "games", context=40)
+
+        assert snippet.startswith("…") and snippet.endswith("…")
+        assert "<mark>games</mark>" in snippet
+        assert len(snippet.replace("<mark>", "").replace("</mark>", "")) == 42
@@ -0,0 +1,86 @@
+import uuid
+from unittest.mock import patch
+
+from src.domains.auth.access_token_cache import AccessTokenCache
+
+NOW = 1_000_000.0
+
+
+def _at(seconds: float):
+    return patch("src.domains.auth.access_token_cache.time.time", return_value=seconds)
+
+
+class TestAccessTokenCache:
+
+    def test_serves_a_verified_token(self):
+        cache = AccessTokenCache(ttl_seconds=60)
+        user_id = uuid.uuid4()
+
+        with _at(NOW):
+            assert cache.get("token") is None
+            cache.put("token", user_id, exp=NOW + 600)
+            assert cache.get("token") == user_id
+            assert cache.get("other") is None
+
+    def test_entry_expires_after_ttl(self):
+        cache = AccessTokenCache(ttl_seconds=60)
+        with _at(NOW):
+            cache.put("token", uuid.uuid4(), exp=NOW + 600)
+        with _at(NOW + 61):
+            assert cache.get("token") is None
+
+    def test_entry_never_outlives_the_token(self):
+        cache = AccessTokenCache(ttl_seconds=60)
+        with _at(NOW):
+            cache.put("token", uuid.uuid4(), exp=NOW + 10)
+        with _at(NOW + 10):
+            assert cache.get("token") is None
+
+    def test_tokens_without_exp_or_already_expired_are_not_cached(self):
+        cache = AccessTokenCache(ttl_seconds=60)
+        with _at(NOW):
+            cache.put("no-exp", uuid.uuid4(), exp=None)
+            cache.put("expired", uuid.uuid4(), exp=NOW - 1)
+
+            assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = AccessTokenCache(ttl_seconds=60, max_entries=2)
+        with _at(NOW):
+            for token in ("a", "b"):
+                cache.put(token, uuid.uuid4(), exp=NOW + 600)
+            cache.get("a")
+            cache.put("c", uuid.uuid4(), exp=NOW + 600)
+
+            assert cache.get("a") is not None
+            assert cache.get("b") is None
+            assert cache.get("c") is not None
+
+    def test_stores_a_digest_not_the_token(self):
+        cache = AccessTokenCache(ttl_seconds=60)
+        with _at(NOW):
+            cache.put("secret.jwt.value", uuid.uuid4(), exp=NOW + 600)
+
+        (key,) = cache._entries
+        assert b"secret" not in key
+        assert len(key) == 16
+
+    def test_hit_rate_counters(self):
+        cache = AccessTokenCache(ttl_seconds=60)
+        assert cache.stats()["hit_rate"] is None
+        with _at(NOW):
+            cache.get("token")
+            cache.put("token", uuid.uuid4(), exp=NOW + 600)
+            cache.get("token")
+            cache.get("token")
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.6667)
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = AccessTokenCache(ttl_seconds=60, enabled=False)
+        with _at(NOW):
+            cache.put("token", uuid.uuid4(), exp=NOW + 600)
+
+            assert cache.get("token") is None
+        assert cache.stats()["misses"] == 0
@@ -1,13 +1,16 @@
 import pytest
 import uuid
-from unittest.mock import Mock
+import time
+from decimal import Decimal
+from unittest.mock import Mock, patch
 
 import jwt
 from fastapi import HTTPException
 
+from src.domains.auth.access_token_cache import AccessTokenCache
 from src.domains.auth.dependencies import get_current_user_id, get_current_user, _unauthorized
 from src.domains.users.repository import UserRepository
-from src.domains.users.models import User
+from src.domains.users.principal_cache import UserPrincipal
 from src.config.settings import get_settings
 
 settings = get_settings()
@@ -84,30 +87,76 @@ class TestGetCurrentUserId:
         assert exc_info.value.status_code == 401
 
 
+
+class TestGetCurrentUserIdCache:
+
+    @pytest.fixture
+    def token_cache(self, monkeypatch):
+        cache = AccessTokenCache(ttl_seconds=60)
+        monkeypatch.setattr("src.domains.auth.dependencies.access_token_cache", cache)
+        return cache
+
+    def _token(self, user_id, expires_in=600):
+        exp = int(time.time()) + expires_in
+        return jwt.encode({"sub": str(user_id), "exp": exp}, settings.SECRET_KEY, algorithm="HS256")
+
+    def test_token_is_decoded_once(self, token_cache):
+        user_id = uuid.uuid4()
+        token = self._token(user_id)
+
+        with patch("src.domains.auth.dependencies.jwt.decode", wraps=jwt.decode) as decode:
+            assert get_current_user_id(token) == user_id
+            assert get_current_user_id(token) == user_id
+
+        decode.assert_called_once()
+        assert token_cache.stats()["hits"] == 1
+
+    def test_rejected_token_is_not_cached(self, token_cache):
+        token = jwt.encode({"sub": str(uuid.uuid4()), "exp": int(time.time()) + 600}, "wrong_secret", algorithm="HS256")
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                get_current_user_id(token)
+
+        assert token_cache.stats()["entries"] == 0
+
+    def test_kill_switch_decodes_every_time(self, token_cache):
+        token_cache.enabled = False
+        token = self._token(uuid.uuid4())
+
+        with patch("src.domains.auth.dependencies.jwt.decode", wraps=jwt.decode) as decode:
+            get_current_user_id(token)
+            get_current_user_id(token)
+
+        assert decode.call_count == 2
+
+
 class TestGetCurrentUser:
     
     def test_get_current_user_existing_user(self):
         user_id = uuid.uuid4()
-        user = User(
+        user = UserPrincipal(
             id=user_id,
             email="test@example.com",
-            password_hash="hash",
-            name="Test User"
+            name="Test User",
+            budget=None,
+            spent=Decimal("0"),
+            is_verified=True,
         )
         
         mock_repo = Mock(spec=UserRepository)
-        mock_repo.get_by_id.return_value = user
+        mock_repo.get_principal.return_value = user
         
         result = get_current_user(user_id, mock_repo)
         
         assert result == user
-        mock_repo.get_by_id.assert_called_once_with(user_id)
+        mock_repo.get_principal.assert_called_once_with(user_id)
     
     def test_get_current_user_non_existing_user(self):
         user_id = uuid.uuid4()
         
         mock_repo = Mock(spec=UserRepository)
-        mock_repo.get_by_id.return_value = None
+        mock_repo.get_principal.return_value = None
         
         with pytest.raises(HTTPException) as exc_info:
             get_current_user(user_id, mock_repo)
@@ -117,16 +166,18 @@ class TestGetCurrentUser:
     
     def test_get_current_user_calls_repository(self):
         user_id = uuid.uuid4()
-        user = User(
+        user = UserPrincipal(
             id=user_id,
             email="test@example.com",
-            password_hash="hash",
-            name="Test User"
+            name="Test User",
+            budget=None,
+            spent=Decimal("0"),
+            is_verified=True,
         )
         
         mock_repo = Mock(spec=UserRepository)
-        mock_repo.get_by_id.return_value = user
+        mock_repo.get_principal.return_value = user
         
         get_current_user(user_id, mock_repo)
         
-        mock_repo.get_by_id.assert_called_once_with(user_id)
+        mock_repo.get_principal.assert_called_once_with(user_id)
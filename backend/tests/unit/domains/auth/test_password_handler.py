@@ -1,4 +1,18 @@
-from src.domains.auth.password_handler import get_password_hash, verify_password
+import asyncio
+import os
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.util import greenlet_spawn
+
+from src.domains.auth import password_handler
+from src.domains.auth.password_handler import (
+    get_dummy_password_hash,
+    get_password_hash,
+    verify_password,
+    warm_up_password_hasher,
+)
 
 
 class TestPasswordHashing:
@@ -48,3 +62,57 @@ class TestPasswordVerification:
         password = "P@ssw0rd!#$%"
         hashed = get_password_hash(password)
         assert verify_password(password, hashed) is True
+
+
+class TestPasswordHashPool:
+
+    def test_runs_in_a_worker_process(self):
+        assert password_handler._submit(os.getpid).result() != os.getpid()
+
+    def test_inline_without_workers(self, monkeypatch):
+        monkeypatch.setattr(password_handler.settings, "PASSWORD_HASH_WORKERS", 0)
+        monkeypatch.setattr(password_handler, "_submit", Mock(side_effect=AssertionError("pool used")))
+
+        assert verify_password("Secret123!", get_password_hash("Secret123!")) is True
+
+    def test_pending_count_is_released(self):
+        get_password_hash("Secret123!")
+
+        assert password_handler._pending == 0
+
+    def test_full_queue_is_refused_with_503(self, monkeypatch):
+        monkeypatch.setattr(password_handler, "_pending", password_handler.settings.PASSWORD_HASH_MAX_PENDING)
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_password_hash("Secret123!")
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "1"}
+
+    def test_greenlet_caller_does_not_block_the_event_loop(self):
+        async def scenario():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.001)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            hashed = await greenlet_spawn(get_password_hash, "Secret123!")
+            ticker.cancel()
+            return hashed, ticks
+
+        hashed, ticks = asyncio.run(scenario())
+
+        assert verify_password("Secret123!", hashed) is True
+        assert ticks > 0
+
+    def test_dummy_hash_is_computed_once(self):
+        warm_up_password_hasher()
+        dummy_hash = get_dummy_password_hash()
+        warm_up_password_hasher()
+
+        assert get_dummy_password_hash() is dummy_hash
+        assert verify_password(password_handler.DUMMY_PASSWORD, dummy_hash) is True
@@ -5,6 +5,8 @@ from sqlalchemy import select
 
 from src.domains.auth.repository import RefreshTokenRepository
 from src.domains.auth.models import RefreshToken
+from src.domains.users.models import User
+from src.domains.users.principal_cache import UserPrincipal
 
 
 class TestRefreshTokenRepositoryCreate:
@@ -296,3 +298,51 @@ class TestRefreshTokenRepositoryDeleteAllForUser:
         stmt = select(RefreshToken).where(RefreshToken.user_id == user_id)
         tokens = db_session.execute(stmt).scalars().all()
         assert len(tokens) == 0
+
+
+class TestRefreshTokenRepositoryRotation:
+
+    @pytest.fixture
+    def user(self, db_session):
+        user = User(email="rotation@example.com", password_hash="hash", name="Rotation", is_verified=True)
+        db_session.add(user)
+        db_session.flush()
+        return user
+
+    def test_lock_with_principal_by_fingerprint(self, db_session, user):
+        repo = RefreshTokenRepository(db_session)
+        repo.insert(user.id, "rotation_fp", "rotation_hash", datetime.now(timezone.utc) + timedelta(days=30))
+
+        token, principal = repo.lock_with_principal_by_fingerprint("rotation_fp")
+
+        assert token.token_hash == "rotation_hash"
+        assert principal == UserPrincipal.from_user(user)
+
+    def test_lock_with_principal_by_fingerprint_unknown(self, db_session):
+        repo = RefreshTokenRepository(db_session)
+
+        assert repo.lock_with_principal_by_fingerprint("unknown_fp") is None
+
+    def test_insert_returns_the_new_id(self, db_session, user):
+        repo = RefreshTokenRepository(db_session)
+
+        token_id = repo.insert(user.id, "insert_fp", "insert_hash", datetime.now(timezone.utc) + timedelta(days=30))
+
+        stored = db_session.execute(select(RefreshToken).where(RefreshToken.id == token_id)).scalar_one()
+        assert stored.token_fingerprint == "insert_fp"
+        assert stored.revoked_at is None
+
+    def test_revoke_if_active_revokes_once(self, db_session, user):
+        repo = RefreshTokenRepository(db_session)
+        expires_at = datetime.now(timezone.utc) + timedelta(days=30)
+        old_id = repo.insert(user.id, "old_fp", "old_hash", expires_at)
+        new_id = repo.insert(user.id, "new_fp", "new_hash", expires_at)
+        other_id = repo.insert(user.id, "other_fp", "other_hash", expires_at)
+
+        assert repo.revoke_if_active(old_id, replaced_by_id=new_id) == user.id
+        # A second rotation of the same token matches no row and keeps the first successor
+        assert repo.revoke_if_active(old_id, replaced_by_id=other_id) is None
+
+        stored = db_session.execute(select(RefreshToken).where(RefreshToken.id == old_id)).scalar_one()
+        assert stored.revoked_at is not None
+        assert stored.replaced_by_id == new_id
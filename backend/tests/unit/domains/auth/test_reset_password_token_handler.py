@@ -26,13 +26,13 @@ class TestHashToken:
         
         assert hash1 != hash2
     
-    def test_hash_token_same_input_produces_different_hashes(self):
+    def test_hash_token_same_input_produces_same_hash(self):
         token = "same_token"
         
         hash1 = hash_token(token)
         hash2 = hash_token(token)
         
-        assert hash1 != hash2
+        assert hash1 == hash2
 
 
 class TestVerifyResetPasswordToken:
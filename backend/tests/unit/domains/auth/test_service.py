@@ -1,6 +1,7 @@
 import pytest
 import uuid
 from datetime import datetime, timezone, timedelta
+from decimal import Decimal
 from unittest.mock import Mock, patch
 
 from fastapi import HTTPException
@@ -8,10 +9,12 @@ from fastapi import HTTPException
 from src.domains.auth.service import AuthService
 from src.domains.auth.schemas import UserCreate
 from src.domains.users.models import User
+from src.domains.users.principal_cache import UserPrincipal
 from src.domains.users.repository import UserRepository
 from src.domains.auth.repository import RefreshTokenRepository, ResetPasswordRepository
 from src.domains.auth.models import RefreshToken
 from src.domains.auth.password_handler import get_password_hash
+from src.domains.auth.refresh_token_handler import derive_successor_token, get_refresh_token_fingerprint
 
 
 class TestAuthServiceRegisterUser:
@@ -281,6 +284,23 @@ class TestAuthServiceRegisterUser:
         assert result is None
         mock_user_repo.get_by_email.assert_called_once()
         mock_user_repo.create.assert_not_called()
+    
+    def test_register_user_duplicate_pays_password_hash_time(self, valid_user_data, monkeypatch):
+        mock_user_repo = Mock()
+        mock_user_repo.get_by_email.return_value = User(
+            email=valid_user_data["email"],
+            password_hash="existing_hash",
+            name="Existing",
+            is_verified=True
+        )
+        mock_verify = Mock(return_value=False)
+        monkeypatch.setattr("src.domains.auth.service.verify_password", mock_verify)
+        service = AuthService(mock_user_repo, Mock(), Mock())
+        
+        service.register_user(UserCreate(**valid_user_data))
+        
+        mock_verify.assert_called_once()
+        assert mock_verify.call_args.args[0] == valid_user_data["password"]
 
 
 class TestAuthServiceLogin:
@@ -328,6 +348,30 @@ class TestAuthServiceLogin:
         mock_user_repo.get_by_email.assert_called_once_with("test@example.com")
         mock_refresh_token_repo.create.assert_called_once()
     
+    def test_login_rehashes_password_hashed_with_other_parameters(self, auth_service, mock_user_repo, valid_user):
+        from pwdlib import PasswordHash
+        from pwdlib.hashers.argon2 import Argon2Hasher
+        from src.domains.auth.password_handler import password_hash
+
+        weaker = PasswordHash((Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1),))
+        valid_user.password_hash = weaker.hash("SecurePass123!")
+        mock_user_repo.get_by_email.return_value = valid_user
+
+        auth_service.login("test@example.com", "SecurePass123!")
+
+        mock_user_repo.set_password_hash.assert_called_once()
+        user_id, new_hash = mock_user_repo.set_password_hash.call_args[0]
+        assert user_id == valid_user.id
+        assert password_hash.verify("SecurePass123!", new_hash)
+        assert not password_hash.current_hasher.check_needs_rehash(new_hash)
+
+    def test_login_keeps_hash_with_current_parameters(self, auth_service, mock_user_repo, valid_user):
+        mock_user_repo.get_by_email.return_value = valid_user
+
+        auth_service.login("test@example.com", "SecurePass123!")
+
+        mock_user_repo.set_password_hash.assert_not_called()
+    
     def test_login_invalid_email(self, auth_service, mock_user_repo):
         mock_user_repo.get_by_email.return_value = None
         
@@ -438,6 +482,12 @@ class TestAuthServiceRotate:
     def auth_service(self, mock_user_repo, mock_refresh_token_repo, mock_reset_password_repo):
         return AuthService(mock_user_repo, mock_refresh_token_repo, mock_reset_password_repo)
     
+    @staticmethod
+    def _principal(user_id):
+        return UserPrincipal(
+            id=user_id, email="test@example.com", name="Test", budget=None, spent=Decimal("0"), is_verified=True
+        )
+
     def test_rotate_success(self, auth_service, mock_refresh_token_repo):
         user_id = uuid.uuid4()
         old_raw_token = "old_token_abc123"
@@ -450,35 +500,32 @@ class TestAuthServiceRotate:
             expires_at=datetime.now(timezone.utc) + timedelta(days=30),
             revoked_at=None
         )
+        principal = self._principal(user_id)
         
-        new_token = RefreshToken(
-            id=uuid.uuid4(),
-            user_id=user_id,
-            token_fingerprint="new_fingerprint",
-            token_hash="new_hash",
-            expires_at=datetime.now(timezone.utc) + timedelta(days=30)
-        )
-        
-        mock_refresh_token_repo.get_by_fingerprint.side_effect = [old_token, new_token]
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (old_token, principal)
+        mock_refresh_token_repo.insert.return_value = uuid.uuid4()
+        mock_refresh_token_repo.revoke_if_active.return_value = user_id
         
         with patch('src.domains.auth.service.verify_refresh_token', return_value=True):
-            returned_user_id, new_raw_token = auth_service.rotate(old_raw_token)
+            returned_user, new_raw_token = auth_service.rotate(old_raw_token)
         
-        assert returned_user_id == user_id
+        assert returned_user is principal
         assert isinstance(new_raw_token, str)
         assert len(new_raw_token) == 32
-        mock_refresh_token_repo.revoke.assert_called_once()
+        mock_refresh_token_repo.revoke_if_active.assert_called_once()
+        mock_refresh_token_repo.commit.assert_not_called()
     
     def test_rotate_invalid_token_not_in_db(self, auth_service, mock_refresh_token_repo):
         old_raw_token = "nonexistent_token"
         
-        mock_refresh_token_repo.get_by_fingerprint.return_value = None
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = None
         
         with pytest.raises(ValueError) as exc_info:
             auth_service.rotate(old_raw_token)
         
         assert str(exc_info.value) == "invalid_refresh"
-        mock_refresh_token_repo.revoke.assert_not_called()
+        mock_refresh_token_repo.insert.assert_not_called()
+        mock_refresh_token_repo.revoke_if_active.assert_not_called()
     
     def test_rotate_already_revoked_token_triggers_reuse_detection(self, auth_service, mock_refresh_token_repo):
         user_id = uuid.uuid4()
@@ -493,13 +540,15 @@ class TestAuthServiceRotate:
             revoked_at=datetime.now(timezone.utc) - timedelta(hours=1)
         )
         
-        mock_refresh_token_repo.get_by_fingerprint.return_value = revoked_token
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (revoked_token, self._principal(user_id))
         
         with pytest.raises(ValueError) as exc_info:
             auth_service.rotate(old_raw_token)
         
         assert str(exc_info.value) == "refresh_reuse"
         mock_refresh_token_repo.delete_all_tokens_for_user.assert_called_once_with(user_id)
+        mock_refresh_token_repo.commit.assert_called_once()
+        mock_refresh_token_repo.insert.assert_not_called()
     
     def test_rotate_expired_token_raises_error(self, auth_service, mock_refresh_token_repo):
         user_id = uuid.uuid4()
@@ -514,7 +563,7 @@ class TestAuthServiceRotate:
             revoked_at=None
         )
         
-        mock_refresh_token_repo.get_by_fingerprint.return_value = expired_token
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (expired_token, self._principal(user_id))
         
         with pytest.raises(ValueError) as exc_info:
             auth_service.rotate(old_raw_token)
@@ -534,13 +583,14 @@ class TestAuthServiceRotate:
             revoked_at=None
         )
         
-        mock_refresh_token_repo.get_by_fingerprint.return_value = token
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (token, self._principal(user_id))
         
         with patch('src.domains.auth.service.verify_refresh_token', return_value=False):
             with pytest.raises(ValueError) as exc_info:
                 auth_service.rotate(old_raw_token)
         
         assert str(exc_info.value) == "invalid_refresh"
+        mock_refresh_token_repo.insert.assert_not_called()
     
     def test_rotate_creates_new_token_and_revokes_old(self, auth_service, mock_refresh_token_repo):
         user_id = uuid.uuid4()
@@ -557,21 +607,16 @@ class TestAuthServiceRotate:
         )
         
         new_token_id = uuid.uuid4()
-        new_token = RefreshToken(
-            id=new_token_id,
-            user_id=user_id,
-            token_fingerprint="new_fp",
-            token_hash="new_hash",
-            expires_at=datetime.now(timezone.utc) + timedelta(days=30)
-        )
-        
-        mock_refresh_token_repo.get_by_fingerprint.side_effect = [old_token, new_token]
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (old_token, self._principal(user_id))
+        mock_refresh_token_repo.insert.return_value = new_token_id
+        mock_refresh_token_repo.revoke_if_active.return_value = user_id
         
         with patch('src.domains.auth.service.verify_refresh_token', return_value=True):
             auth_service.rotate(old_raw_token)
         
-        mock_refresh_token_repo.create.assert_called_once()
-        mock_refresh_token_repo.revoke.assert_called_once_with(old_token_id, replaced_by_id=new_token_id)
+        mock_refresh_token_repo.insert.assert_called_once()
+        assert mock_refresh_token_repo.insert.call_args[0][0] == user_id
+        mock_refresh_token_repo.revoke_if_active.assert_called_once_with(old_token_id, replaced_by_id=new_token_id)
     
     def test_rotate_token_expiring_at_exact_moment(self, auth_service, mock_refresh_token_repo):
         user_id = uuid.uuid4()
@@ -587,14 +632,14 @@ class TestAuthServiceRotate:
             revoked_at=None
         )
         
-        mock_refresh_token_repo.get_by_fingerprint.return_value = token
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (token, self._principal(user_id))
         
         with pytest.raises(ValueError) as exc_info:
             auth_service.rotate(old_raw_token)
         
         assert str(exc_info.value) == "invalid_refresh"
     
-    def test_rotate_new_token_not_found_raises_runtime_error(self, auth_service, mock_refresh_token_repo):
+    def test_rotate_losing_a_concurrent_rotation_triggers_reuse_detection(self, auth_service, mock_refresh_token_repo):
         user_id = uuid.uuid4()
         old_raw_token = "old_token"
         
@@ -607,13 +652,106 @@ class TestAuthServiceRotate:
             revoked_at=None
         )
         
-        mock_refresh_token_repo.get_by_fingerprint.side_effect = [old_token, None]
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (old_token, self._principal(user_id))
+        mock_refresh_token_repo.insert.return_value = uuid.uuid4()
+        # Revoked by the other request between the read and the conditional update
+        mock_refresh_token_repo.revoke_if_active.return_value = None
         
         with patch('src.domains.auth.service.verify_refresh_token', return_value=True):
-            with pytest.raises(RuntimeError) as exc_info:
+            with pytest.raises(ValueError) as exc_info:
                 auth_service.rotate(old_raw_token)
         
-        assert str(exc_info.value) == "refresh_rotation_failed"
+        assert str(exc_info.value) == "refresh_reuse"
+        mock_refresh_token_repo.delete_all_tokens_for_user.assert_called_once_with(user_id)
+        mock_refresh_token_repo.commit.assert_called_once()
+
+    def test_rotate_derives_the_successor_from_the_old_token(self, auth_service, mock_refresh_token_repo):
+        user_id = uuid.uuid4()
+        old_token = self._rotated_token(user_id, revoked_ago=None, replaced_by_id=None)
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (old_token, self._principal(user_id))
+        mock_refresh_token_repo.insert.return_value = uuid.uuid4()
+        mock_refresh_token_repo.revoke_if_active.return_value = user_id
+
+        with patch('src.domains.auth.service.verify_refresh_token', return_value=True):
+            _, new_raw_token = auth_service.rotate("old_token")
+
+        assert new_raw_token == derive_successor_token("old_token")
+        assert mock_refresh_token_repo.insert.call_args[0][1] == get_refresh_token_fingerprint(new_raw_token)
+
+    @staticmethod
+    def _rotated_token(user_id, revoked_ago, replaced_by_id):
+        return RefreshToken(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            token_fingerprint="old_fp",
+            token_hash="old_hash",
+            expires_at=datetime.now(timezone.utc) + timedelta(days=30),
+            revoked_at=datetime.now(timezone.utc) - revoked_ago if revoked_ago is not None else None,
+            replaced_by_id=replaced_by_id,
+        )
+
+    def _successor(self, user_id, token_id, revoked_at=None):
+        return RefreshToken(
+            id=token_id,
+            user_id=user_id,
+            token_fingerprint=get_refresh_token_fingerprint(derive_successor_token("old_token")),
+            token_hash="new_hash",
+            expires_at=datetime.now(timezone.utc) + timedelta(days=30),
+            revoked_at=revoked_at,
+        )
+
+    def test_rotate_within_grace_returns_the_issued_successor(self, auth_service, mock_refresh_token_repo):
+        user_id = uuid.uuid4()
+        successor_id = uuid.uuid4()
+        principal = self._principal(user_id)
+        old_token = self._rotated_token(user_id, timedelta(seconds=1), successor_id)
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (old_token, principal)
+        mock_refresh_token_repo.get_by_fingerprint.return_value = self._successor(user_id, successor_id)
+
+        with patch('src.domains.auth.service.verify_refresh_token', return_value=True):
+            returned_user, raw_token = auth_service.rotate("old_token")
+
+        assert returned_user is principal
+        assert raw_token == derive_successor_token("old_token")
+        mock_refresh_token_repo.get_by_fingerprint.assert_called_once_with(get_refresh_token_fingerprint(raw_token))
+        mock_refresh_token_repo.insert.assert_not_called()
+        mock_refresh_token_repo.delete_all_tokens_for_user.assert_not_called()
+
+    @pytest.mark.parametrize("case", ["after_grace", "not_rotated", "successor_revoked", "other_successor", "wrong_token"])
+    def test_rotate_revoked_token_outside_the_grace_cases_is_reuse(self, auth_service, mock_refresh_token_repo, case):
+        user_id = uuid.uuid4()
+        successor_id = uuid.uuid4()
+        revoked_ago = timedelta(minutes=5) if case == "after_grace" else timedelta(seconds=1)
+        old_token = self._rotated_token(user_id, revoked_ago, None if case == "not_rotated" else successor_id)
+        successor = self._successor(
+            user_id,
+            uuid.uuid4() if case == "other_successor" else successor_id,
+            revoked_at=datetime.now(timezone.utc) if case == "successor_revoked" else None,
+        )
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (old_token, self._principal(user_id))
+        mock_refresh_token_repo.get_by_fingerprint.return_value = successor
+
+        with patch('src.domains.auth.service.verify_refresh_token', return_value=case != "wrong_token"):
+            with pytest.raises(ValueError) as exc_info:
+                auth_service.rotate("old_token")
+
+        assert str(exc_info.value) == "refresh_reuse"
+        mock_refresh_token_repo.delete_all_tokens_for_user.assert_called_once_with(user_id)
+
+    def test_rotate_grace_window_disabled(self, auth_service, mock_refresh_token_repo, monkeypatch):
+        user_id = uuid.uuid4()
+        successor_id = uuid.uuid4()
+        old_token = self._rotated_token(user_id, timedelta(seconds=1), successor_id)
+        mock_refresh_token_repo.lock_with_principal_by_fingerprint.return_value = (old_token, self._principal(user_id))
+        mock_refresh_token_repo.get_by_fingerprint.return_value = self._successor(user_id, successor_id)
+
+        monkeypatch.setattr("src.domains.auth.service.settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS", 0)
+
+        with patch('src.domains.auth.service.verify_refresh_token', return_value=True):
+            with pytest.raises(ValueError) as exc_info:
+                auth_service.rotate("old_token")
+
+        assert str(exc_info.value) == "refresh_reuse"
 
 
 class TestAuthServiceGlobalLogout:
@@ -0,0 +1,88 @@
+import pytest
+from pwdlib import PasswordHash
+
+from src.domains.auth import token_hash_handler
+from src.domains.auth.token_hash_handler import _parse_keys, hash_token, verify_token
+
+
+@pytest.fixture
+def rotated_keys(monkeypatch):
+    """Key "2" is current, "1" is the previous one."""
+    monkeypatch.setattr(token_hash_handler, "_KEYS", {"2": b"new-secret", "1": b"old-secret"})
+    monkeypatch.setattr(token_hash_handler, "_CURRENT_KEY_ID", "2")
+
+
+class TestHashToken:
+
+    def test_hash_format(self):
+        scheme, key_id, digest = hash_token("token").split("$")
+
+        assert scheme == "hmac-sha256"
+        assert key_id == "0"
+        assert len(digest) == 64
+
+    def test_hash_depends_on_the_key(self, monkeypatch):
+        before = hash_token("token")
+        monkeypatch.setattr(token_hash_handler, "_KEYS", {"0": b"another-key"})
+
+        assert hash_token("token") != before
+
+    def test_hash_uses_the_current_key(self, rotated_keys):
+        assert hash_token("token").startswith("hmac-sha256$2$")
+
+
+class TestVerifyToken:
+
+    def test_verify_correct_and_wrong_token(self):
+        token_hash = hash_token("token")
+
+        assert verify_token("token", token_hash) is True
+        assert verify_token("other", token_hash) is False
+
+    def test_tampered_digest_is_rejected(self):
+        token_hash = hash_token("token")
+        tampered = token_hash[:-1] + ("0" if token_hash[-1] != "0" else "1")
+
+        assert verify_token("token", tampered) is False
+
+    def test_previous_key_still_verifies(self, monkeypatch):
+        monkeypatch.setattr(token_hash_handler, "_KEYS", {"1": b"old-secret"})
+        monkeypatch.setattr(token_hash_handler, "_CURRENT_KEY_ID", "1")
+        old_hash = hash_token("token")
+        monkeypatch.setattr(token_hash_handler, "_KEYS", {"2": b"new-secret", "1": b"old-secret"})
+        monkeypatch.setattr(token_hash_handler, "_CURRENT_KEY_ID", "2")
+
+        assert verify_token("token", old_hash) is True
+        assert hash_token("token") != old_hash
+
+    def test_unknown_key_id_is_rejected(self, rotated_keys):
+        assert verify_token("token", "hmac-sha256$9$" + "0" * 64) is False
+
+    def test_legacy_argon2_hash_still_verifies(self):
+        legacy_hash = PasswordHash.recommended().hash("token")
+
+        assert verify_token("token", legacy_hash) is True
+        assert verify_token("other", legacy_hash) is False
+
+    def test_unknown_format_is_rejected(self):
+        assert verify_token("token", "not-a-hash") is False
+
+
+class TestParseKeys:
+
+    def test_keys_in_order_first_is_current(self):
+        keys = _parse_keys("2:new-secret, 1:old-secret", "secret")
+
+        assert list(keys) == ["2", "1"]
+        assert keys["1"] == b"old-secret"
+
+    def test_empty_value_derives_a_key_from_secret_key(self):
+        keys = _parse_keys("", "secret")
+
+        assert list(keys) == ["0"]
+        assert keys["0"] != b"secret"
+
+    @pytest.mark.parametrize("value", ["no-separator", ":secret", "1:", "a$b:secret"])
+    def test_malformed_entries_are_refused(self, value):
+        with pytest.raises(ValueError):
+            _parse_keys(value, "secret")
@@ -1,9 +1,12 @@
 import pytest
 import uuid
+from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
 
-from src.domains.gifts.repository import GiftRepository
+from src.core.pagination import decode_cursor, keyset_page
+from src.domains.gifts.repository import _BY_ID_FOR_UPDATE, GiftRepository
 from src.domains.gifts.models import Gift
 from src.domains.gifts.enums import GiftStatusEnum
 from src.domains.users.models import User
@@ -218,6 +221,65 @@ class TestGiftRepositoryGet:
         assert gifts[1].name == "Gift 03"
 
 
+class TestGiftRepositoryGetKeyset:
+
+    def _walk(self, repo, user_id, sort, limit):
+        """Follow nextCursor until the end and return the gifts in order."""
+        pagination = {"sort": sort, "limit": limit, "cursor": {}}
+        walked = []
+        while True:
+            gifts, meta = keyset_page(repo.get_keyset(pagination, user_id), pagination)
+            walked.extend(gifts)
+            if not meta.hasNext:
+                return walked
+            pagination["cursor"] = decode_cursor(meta.nextCursor, sort)
+
+    def test_keyset_default_sort_walks_newest_first(self, db_session):
+        repo = GiftRepository(db_session)
+
+        user = User(email="test@example.com", password_hash="hash", name="Test")
+        db_session.add(user)
+        db_session.commit()
+
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        for i in range(5):
+            db_session.add(Gift(user_id=user.id, name=f"Gift {i}", created_at=base + timedelta(minutes=i)))
+        db_session.commit()
+
+        names = [g.name for g in self._walk(repo, user.id, "default", limit=2)]
+
+        assert names == ["Gift 4", "Gift 3", "Gift 2", "Gift 1", "Gift 0"]
+
+    def test_keyset_breaks_ties_on_id(self, db_session):
+        repo = GiftRepository(db_session)
+
+        user = User(email="test@example.com", password_hash="hash", name="Test")
+        db_session.add(user)
+        db_session.commit()
+
+        for _ in range(5):
+            db_session.add(Gift(user_id=user.id, name="Same name"))
+        db_session.commit()
+
+        seen = [g.id for g in self._walk(repo, user.id, "asc", limit=2)]
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    def test_keyset_filters_by_user_id(self, db_session):
+        repo = GiftRepository(db_session)
+
+        user1 = User(email="user1@example.com", password_hash="hash", name="User 1")
+        user2 = User(email="user2@example.com", password_hash="hash", name="User 2")
+        db_session.add_all([user1, user2])
+        db_session.commit()
+
+        db_session.add_all([Gift(user_id=user1.id, name="Mine"), Gift(user_id=user2.id, name="Theirs")])
+        db_session.commit()
+
+        assert [g.name for g in self._walk(repo, user1.id, "desc", limit=10)] == ["Mine"]
+
+
 class TestGiftRepositoryGetById:
 
     def test_get_by_id_success(self, db_session):
@@ -316,6 +378,100 @@ class TestGiftRepositoryUpdate:
         assert retrieved.name == "Updated"
 
 
+    def test_get_by_id_for_update_locks_the_gift_row(self):
+        sql = str(_BY_ID_FOR_UPDATE.compile(dialect=postgresql.dialect()))
+        assert sql.endswith("FOR UPDATE OF gifts")
+
+    def test_spent_delta_uses_the_stored_values(self, db_session):
+        repo = GiftRepository(db_session)
+
+        user = User(email="test@example.com", password_hash="hash", name="Test")
+        db_session.add(user)
+        db_session.commit()
+        gift = Gift(user_id=user.id, name="Drift", price=Decimal("10.00"), status=GiftStatusEnum.achete, quantity=1)
+        db_session.add(gift)
+        db_session.flush()
+        db_session.execute(update(User).where(User.id == user.id).values(spent=Decimal("10.00")))
+        db_session.commit()
+        # Another request changed the row after this session loaded it
+        db_session.execute(
+            update(Gift).where(Gift.id == gift.id).values(price=Decimal("30.00")).execution_options(synchronize_session=False)
+        )
+        db_session.execute(update(User).where(User.id == user.id).values(spent=Decimal("30.00")))
+        db_session.commit()
+
+        locked = repo.get_by_id_for_update(user.id, gift.id)
+        assert locked.price == Decimal("30.00")
+        locked.quantity = 2
+        repo.update(locked)
+
+        db_session.expire_all()
+        assert db_session.get(User, user.id).spent == Decimal("60.00")
+
+class TestGiftRepositoryRecipientLinks:
+
+    def _setup(self, db_session, recipient_count=3):
+        user = User(email="test@example.com", password_hash="hash", name="Test")
+        db_session.add(user)
+        db_session.commit()
+        recipients = [Recipient(user_id=user.id, name=f"R{i}") for i in range(recipient_count)]
+        db_session.add_all(recipients)
+        db_session.commit()
+        return user, [r.id for r in recipients]
+
+    def test_create_with_recipient_ids(self, db_session):
+        repo = GiftRepository(db_session)
+        user, recipient_ids = self._setup(db_session)
+
+        created = repo.create(Gift(user_id=user.id, name="Gift"), recipient_ids)
+
+        assert {r.id for r in created.recipients} == set(recipient_ids)
+
+    def test_update_replaces_links(self, db_session):
+        repo = GiftRepository(db_session)
+        user, (a, b, c) = self._setup(db_session)
+        gift = repo.create(Gift(user_id=user.id, name="Gift"), [a, b])
+
+        updated = repo.update(gift, [b, c])
+
+        assert {r.id for r in updated.recipients} == {b, c}
+
+    def test_update_without_recipient_ids_keeps_links(self, db_session):
+        repo = GiftRepository(db_session)
+        user, (a, b, c) = self._setup(db_session)
+        gift = repo.create(Gift(user_id=user.id, name="Gift"), [a])
+
+        gift.name = "Renamed"
+        updated = repo.update(gift)
+
+        assert [r.id for r in updated.recipients] == [a]
+
+    def test_add_and_remove_recipients(self, db_session):
+        repo = GiftRepository(db_session)
+        user, (a, b, c) = self._setup(db_session)
+        gift = repo.create(Gift(user_id=user.id, name="Gift"), [a])
+
+        gift = repo.add_recipients(gift, [a, b, c])
+        assert {r.id for r in gift.recipients} == {a, b, c}
+
+        gift = repo.remove_recipients(gift, [a, c, uuid.uuid4()])
+        assert [r.id for r in gift.recipients] == [b]
+
+    def test_get_owned_ids(self, db_session):
+        repo = GiftRepository(db_session)
+        user, _ = self._setup(db_session, recipient_count=0)
+        other = User(email="other@example.com", password_hash="hash", name="Other")
+        db_session.add(other)
+        db_session.commit()
+        mine = repo.create(Gift(user_id=user.id, name="Mine"))
+        theirs = repo.create(Gift(user_id=other.id, name="Theirs"))
+
+        owned = repo.get_owned_ids(user.id, [mine.id, theirs.id, uuid.uuid4()])
+
+        assert owned == {mine.id}
+        assert repo.get_owned_ids(user.id, []) == set()
+
+
 class TestGiftRepositoryDelete:
 
     def test_delete_gift_success(self, db_session):
@@ -1,13 +1,14 @@
 import pytest
 import uuid
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 
 from src.domains.gifts.service import GiftService
 from src.domains.gifts.models import Gift
 from src.domains.gifts.enums import GiftStatusEnum
-from src.domains.gifts.schemas import GiftUpdate
+from src.domains.gifts.schemas import GiftBatchRequest, GiftUpdate
 from src.domains.recipients.models import Recipient
 
 
@@ -63,7 +64,7 @@ class TestGiftServiceCreate:
         user_id = uuid.uuid4()
         rid = uuid.uuid4()
         recipient = _make_recipient(user_id, rid)
-        mock_recipient_repo.get_by_id.return_value = recipient
+        mock_recipient_repo.get_owned_ids.return_value = {rid}
 
         expected = _make_gift(user_id=user_id, name="Gift", recipients=[recipient])
         mock_repo.create.return_value = expected
@@ -75,11 +76,12 @@ class TestGiftServiceCreate:
             price=None,
             status_val=GiftStatusEnum.idee,
             quantity=1,
-            recipient_ids=[rid],
+            recipient_ids=[rid, rid],
         )
 
         assert result.recipient_ids == [rid]
-        mock_recipient_repo.get_by_id.assert_called_once_with(user_id, rid)
+        mock_recipient_repo.get_owned_ids.assert_called_once_with(user_id, [rid])
+        assert mock_repo.create.call_args.args[1] == [rid]
 
     def test_create_gift_with_invalid_recipient_raises_404(self):
         mock_repo = Mock()
@@ -88,7 +90,8 @@ class TestGiftServiceCreate:
 
         user_id = uuid.uuid4()
         rid = uuid.uuid4()
-        mock_recipient_repo.get_by_id.return_value = None
+        missing = [uuid.uuid4(), uuid.uuid4()]
+        mock_recipient_repo.get_owned_ids.return_value = {rid}
 
         with pytest.raises(HTTPException) as exc_info:
             service.create(
@@ -98,10 +101,13 @@ class TestGiftServiceCreate:
                 price=None,
                 status_val=GiftStatusEnum.idee,
                 quantity=1,
-                recipient_ids=[rid],
+                recipient_ids=[rid, *missing],
             )
 
         assert exc_info.value.status_code == 404
+        # Every missing id is reported at once
+        assert all(str(recipient_id) in exc_info.value.detail for recipient_id in missing)
+        assert str(rid) not in exc_info.value.detail
         mock_repo.create.assert_not_called()
 
 
@@ -126,7 +132,26 @@ class TestGiftServiceGet:
         assert len(result.items) == 2
         assert result.meta.total == 2
         assert result.meta.page == 1
-        mock_repo.get.assert_called_once_with(pagination, user_id)
+        mock_repo.get.assert_called_once_with(pagination, user_id, None)
+        mock_repo.count_by_status.assert_not_called()
+
+    def test_get_gifts_with_status_facets(self):
+        mock_repo = Mock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        user_id = uuid.uuid4()
+        pagination = {"sort": "asc", "page": 1, "limit": 10}
+        filters = {"status": ["achete"], "has_url": None, "facets": "status"}
+        counts = {status: 0 for status in GiftStatusEnum} | {GiftStatusEnum.achete: 3}
+        mock_repo.get.return_value = ([], 0)
+        mock_repo.count_by_status.return_value = counts
+
+        result = service.get(pagination, user_id, filters)
+
+        assert result.facets.status == counts
+        mock_repo.get.assert_called_once_with(pagination, user_id, filters)
+        mock_repo.count_by_status.assert_called_once_with(user_id, filters)
 
     def test_get_gifts_empty_list(self):
         mock_repo = Mock()
@@ -215,7 +240,7 @@ class TestGiftServiceUpdate:
         gift_id = uuid.uuid4()
 
         existing = _make_gift(user_id=user_id, gift_id=gift_id, name="Original")
-        mock_repo.get_by_id.return_value = existing
+        mock_repo.get_by_id_for_update.return_value = existing
         mock_repo.update.return_value = existing
 
         update_data = GiftUpdate(name="Updated Name")
@@ -223,7 +248,8 @@ class TestGiftServiceUpdate:
         result = service.update(user_id, gift_id, update_data)
 
         assert result.name == "Updated Name"
-        mock_repo.update.assert_called_once_with(existing)
+        mock_repo.get_by_id_for_update.assert_called_once_with(user_id, gift_id)
+        mock_repo.update.assert_called_once_with(existing, None)
 
     def test_update_gift_status(self):
         mock_repo = Mock()
@@ -234,7 +260,7 @@ class TestGiftServiceUpdate:
         gift_id = uuid.uuid4()
 
         existing = _make_gift(user_id=user_id, gift_id=gift_id, status=GiftStatusEnum.idee)
-        mock_repo.get_by_id.return_value = existing
+        mock_repo.get_by_id_for_update.return_value = existing
         mock_repo.update.return_value = existing
 
         update_data = GiftUpdate(status=GiftStatusEnum.achete)
@@ -253,17 +279,18 @@ class TestGiftServiceUpdate:
         rid = uuid.uuid4()
 
         existing = _make_gift(user_id=user_id, gift_id=gift_id)
-        recipient = _make_recipient(user_id, rid)
-        mock_repo.get_by_id.return_value = existing
-        mock_recipient_repo.get_by_id.return_value = recipient
-        mock_repo.update.return_value = existing
+        updated = _make_gift(user_id=user_id, gift_id=gift_id, recipients=[_make_recipient(user_id, rid)])
+        mock_repo.get_by_id_for_update.return_value = existing
+        mock_recipient_repo.get_owned_ids.return_value = {rid}
+        mock_repo.update.return_value = updated
 
         update_data = GiftUpdate(recipient_ids=[rid])
 
         result = service.update(user_id, gift_id, update_data)
 
         assert result.recipient_ids == [rid]
-        mock_recipient_repo.get_by_id.assert_called_once_with(user_id, rid)
+        mock_recipient_repo.get_owned_ids.assert_called_once_with(user_id, [rid])
+        mock_repo.update.assert_called_once_with(existing, [rid])
 
     def test_update_gift_not_found_raises_404(self):
         mock_repo = Mock()
@@ -273,7 +300,7 @@ class TestGiftServiceUpdate:
         user_id = uuid.uuid4()
         gift_id = uuid.uuid4()
 
-        mock_repo.get_by_id.return_value = None
+        mock_repo.get_by_id_for_update.return_value = None
 
         update_data = GiftUpdate(name="New Name")
 
@@ -293,8 +320,8 @@ class TestGiftServiceUpdate:
         rid = uuid.uuid4()
 
         existing = _make_gift(user_id=user_id, gift_id=gift_id)
-        mock_repo.get_by_id.return_value = existing
-        mock_recipient_repo.get_by_id.return_value = None
+        mock_repo.get_by_id_for_update.return_value = existing
+        mock_recipient_repo.get_owned_ids.return_value = set()
 
         update_data = GiftUpdate(recipient_ids=[rid])
 
@@ -313,7 +340,7 @@ class TestGiftServiceUpdate:
         gift_id = uuid.uuid4()
 
         existing = _make_gift(user_id=user_id, gift_id=gift_id, name="Name", price=Decimal("10.00"))
-        mock_repo.get_by_id.return_value = existing
+        mock_repo.get_by_id_for_update.return_value = existing
         mock_repo.update.return_value = existing
 
         update_data = GiftUpdate()
@@ -324,6 +351,172 @@ class TestGiftServiceUpdate:
         mock_repo.update.assert_called_once()
 
 
+class TestGiftServiceLinkRecipients:
+
+    def test_add_recipients_success(self):
+        mock_repo = Mock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        user_id = uuid.uuid4()
+        gift_id = uuid.uuid4()
+        rid = uuid.uuid4()
+
+        existing = _make_gift(user_id=user_id, gift_id=gift_id)
+        mock_repo.get_by_id.return_value = existing
+        mock_recipient_repo.get_owned_ids.return_value = {rid}
+        mock_repo.add_recipients.return_value = _make_gift(
+            user_id=user_id, gift_id=gift_id, recipients=[_make_recipient(user_id, rid)]
+        )
+
+        result = service.add_recipients(user_id, gift_id, [rid])
+
+        assert result.recipient_ids == [rid]
+        mock_repo.add_recipients.assert_called_once_with(existing, [rid])
+
+    def test_add_recipients_invalid_recipient_raises_404(self):
+        mock_repo = Mock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        user_id = uuid.uuid4()
+        gift_id = uuid.uuid4()
+
+        mock_repo.get_by_id.return_value = _make_gift(user_id=user_id, gift_id=gift_id)
+        mock_recipient_repo.get_owned_ids.return_value = set()
+
+        with pytest.raises(HTTPException) as exc_info:
+            service.add_recipients(user_id, gift_id, [uuid.uuid4()])
+
+        assert exc_info.value.status_code == 404
+        mock_repo.add_recipients.assert_not_called()
+
+    def test_add_recipients_gift_not_found_raises_404(self):
+        mock_repo = Mock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        mock_repo.get_by_id.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            service.add_recipients(uuid.uuid4(), uuid.uuid4(), [uuid.uuid4()])
+
+        assert exc_info.value.status_code == 404
+        mock_recipient_repo.get_owned_ids.assert_not_called()
+
+    def test_remove_recipients_success(self):
+        mock_repo = Mock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        user_id = uuid.uuid4()
+        gift_id = uuid.uuid4()
+        rid = uuid.uuid4()
+
+        existing = _make_gift(user_id=user_id, gift_id=gift_id)
+        mock_repo.get_by_id.return_value = existing
+        mock_repo.remove_recipients.return_value = existing
+
+        result = service.remove_recipients(user_id, gift_id, [rid])
+
+        assert result.recipient_ids == []
+        mock_repo.remove_recipients.assert_called_once_with(existing, [rid])
+        mock_recipient_repo.get_owned_ids.assert_not_called()
+
+
+class TestGiftServiceBatch:
+
+    def _batch(self, mode, *operations):
+        return GiftBatchRequest.model_validate({"mode": mode, "operations": list(operations)})
+
+    def test_batch_validates_with_one_query_per_kind(self):
+        mock_repo = MagicMock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        user_id = uuid.uuid4()
+        gift_ids = [uuid.uuid4() for _ in range(3)]
+        rid = uuid.uuid4()
+        mock_repo.get_owned_ids.return_value = set(gift_ids)
+        mock_recipient_repo.get_owned_ids.return_value = {rid}
+        mock_repo.bulk_create.return_value = [uuid.uuid4()]
+        mock_repo.get_many.return_value = []
+
+        result = service.batch(user_id, self._batch(
+            "atomic",
+            {"op": "create", "data": {"name": "A", "recipient_ids": [str(rid)]}},
+            *[{"op": "delete", "id": str(gift_id)} for gift_id in gift_ids],
+        ))
+
+        assert result.committed is True
+        mock_repo.get_owned_ids.assert_called_once_with(user_id, set(gift_ids))
+        mock_recipient_repo.get_owned_ids.assert_called_once_with(user_id, {rid})
+        mock_repo.bulk_delete.assert_called_once_with(user_id, gift_ids)
+        mock_repo.rollback.assert_not_called()
+
+    def test_batch_atomic_with_invalid_operation_writes_nothing(self):
+        mock_repo = MagicMock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        mock_repo.get_owned_ids.return_value = set()
+        mock_recipient_repo.get_owned_ids.return_value = set()
+
+        result = service.batch(uuid.uuid4(), self._batch(
+            "atomic",
+            {"op": "create", "data": {"name": "A"}},
+            {"op": "delete", "id": str(uuid.uuid4())},
+        ))
+
+        assert result.committed is False
+        mock_repo.bulk_create.assert_not_called()
+        mock_repo.rollback.assert_not_called()
+
+    def test_batch_best_effort_replays_operations_after_database_error(self):
+        mock_repo = MagicMock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        user_id = uuid.uuid4()
+        good_id = uuid.uuid4()
+        mock_repo.get_owned_ids.return_value = set()
+        mock_recipient_repo.get_owned_ids.return_value = set()
+        database_error = IntegrityError("INSERT", {}, Exception("violation"))
+
+        def bulk_create(user_id, rows, recipient_ids):
+            if any(row["name"] == "Bad" for row in rows):
+                raise database_error
+            return [good_id]
+        mock_repo.bulk_create.side_effect = bulk_create
+        mock_repo.get_many.return_value = [_make_gift(user_id=user_id, gift_id=good_id, name="Good")]
+
+        result = service.batch(user_id, self._batch(
+            "best_effort",
+            {"op": "create", "data": {"name": "Good"}},
+            {"op": "create", "data": {"name": "Bad"}},
+        ))
+
+        assert [r.status for r in result.results] == [201, 409]
+        assert result.results[0].item.name == "Good"
+        mock_repo.rollback.assert_called_once()
+        assert mock_repo.savepoint.call_count == 2
+
+    def test_batch_atomic_rolls_back_after_database_error(self):
+        mock_repo = MagicMock()
+        mock_recipient_repo = Mock()
+        service = GiftService(mock_repo, mock_recipient_repo)
+
+        mock_repo.get_owned_ids.return_value = set()
+        mock_recipient_repo.get_owned_ids.return_value = set()
+        mock_repo.bulk_create.side_effect = IntegrityError("INSERT", {}, Exception("violation"))
+
+        result = service.batch(uuid.uuid4(), self._batch("atomic", {"op": "create", "data": {"name": "A"}}))
+
+        assert result.committed is False
+        assert result.results[0].status == 409
+        assert mock_repo.rollback.call_count == 2
+
+
 class TestGiftServiceDelete:
 
     def test_delete_gift_success(self):
@@ -85,11 +85,13 @@ class TestRecipientServiceCreate:
         created_mock.gifts = [mock_gift]
         mock_repo.create.return_value = created_mock
 
-        with patch.object(service, '_resolve_gifts', return_value=[mock_gift]) as mock_resolve:
-            result = service.create(user_id, "Mom", None, gift_ids=[gift_id])
+        mock_gift_repo.get_owned_ids.return_value = {gift_id}
 
-            assert result.gift_ids == [gift_id]
-            mock_resolve.assert_called_once_with(user_id, [gift_id])
+        result = service.create(user_id, "Mom", None, gift_ids=[gift_id, gift_id])
+
+        assert result.gift_ids == [gift_id]
+        mock_gift_repo.get_owned_ids.assert_called_once_with(user_id, [gift_id])
+        mock_repo.create.assert_called_once_with(mock_recipient_instance, [gift_id])
 
     def test_create_recipient_with_invalid_gift_raises_404(self):
         mock_repo = Mock()
@@ -97,13 +99,17 @@ class TestRecipientServiceCreate:
         service = RecipientService(mock_repo, mock_gift_repo)
 
         user_id = uuid.uuid4()
-        fake_gift_id = uuid.uuid4()
-        mock_gift_repo.get_by_id.return_value = None
+        gift_id = uuid.uuid4()
+        fake_gift_ids = [uuid.uuid4(), uuid.uuid4()]
+        mock_gift_repo.get_owned_ids.return_value = {gift_id}
 
         with pytest.raises(HTTPException) as exc_info:
-            service.create(user_id, "Mom", None, gift_ids=[fake_gift_id])
+            service.create(user_id, "Mom", None, gift_ids=[gift_id, *fake_gift_ids])
 
         assert exc_info.value.status_code == 404
+        # Every missing id is reported at once
+        assert all(str(fake_id) in exc_info.value.detail for fake_id in fake_gift_ids)
+        assert str(gift_id) not in exc_info.value.detail
         mock_repo.create.assert_not_called()
 
 
@@ -128,7 +134,7 @@ class TestRecipientServiceGet:
         assert len(result.items) == 2
         assert result.meta.total == 2
         assert result.meta.page == 1
-        mock_repo.get.assert_called_once_with(pagination, user_id)
+        mock_repo.get.assert_called_once_with(pagination, user_id, None)
     
     def test_get_recipients_empty_list(self):
         mock_repo = Mock()
@@ -232,7 +238,7 @@ class TestRecipientServiceUpdate:
         
         assert result.name == "Updated Name"
         assert result.notes == "Original Notes"  # Unchanged
-        mock_repo.update.assert_called_once_with(existing_recipient)
+        mock_repo.update.assert_called_once_with(existing_recipient, None)
     
     def test_update_recipient_notes_only(self):
         mock_repo = Mock()
@@ -350,16 +356,19 @@ class TestRecipientServiceUpdate:
         existing_recipient.gifts = []
         mock_repo.get_by_id.return_value = existing_recipient
 
-        with patch.object(service, '_resolve_gifts', return_value=[mock_gift]) as mock_resolve:
-            def update_side_effect(r):
-                return r
-            mock_repo.update.side_effect = update_side_effect
+        mock_gift_repo.get_owned_ids.return_value = {gift_id}
 
-            update_data = RecipientUpdate(gift_ids=[gift_id])
-            result = service.update(user_id, recipient_id, update_data)
+        def update_side_effect(r, gift_ids):
+            r.gifts = [mock_gift]
+            return r
+        mock_repo.update.side_effect = update_side_effect
+
+        update_data = RecipientUpdate(gift_ids=[gift_id])
+        result = service.update(user_id, recipient_id, update_data)
 
-            assert result.gift_ids == [gift_id]
-            mock_resolve.assert_called_once_with(user_id, [gift_id])
+        assert result.gift_ids == [gift_id]
+        mock_gift_repo.get_owned_ids.assert_called_once_with(user_id, [gift_id])
+        mock_repo.update.assert_called_once_with(existing_recipient, [gift_id])
 
     def test_update_recipient_invalid_gift_raises_404(self):
         mock_repo = Mock()
@@ -377,7 +386,7 @@ class TestRecipientServiceUpdate:
         )
         existing_recipient.gifts = []
         mock_repo.get_by_id.return_value = existing_recipient
-        mock_gift_repo.get_by_id.return_value = None
+        mock_gift_repo.get_owned_ids.return_value = set()
 
         update_data = RecipientUpdate(gift_ids=[uuid.uuid4()])
 
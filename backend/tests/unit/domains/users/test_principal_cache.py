@@ -0,0 +1,172 @@
+import uuid
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.domains.gifts.enums import GiftStatusEnum
+from src.domains.gifts.models import Gift
+from src.domains.gifts.repository import GiftRepository
+from src.domains.users.models import User
+from src.domains.users.principal_cache import PrincipalCache, UserPrincipal, principal_cache
+from src.domains.users.repository import UserRepository
+from src.infrastructure.database.routing import REPLICA_INFO_KEY
+
+
+def _principal(user_id, budget=None) -> UserPrincipal:
+    return UserPrincipal(id=user_id, email="p@example.com", name=None, budget=budget, spent=Decimal("0"), is_verified=True)
+
+
+class TestPrincipalCache:
+
+    def test_loads_once_then_serves_cached_value(self):
+        cache = PrincipalCache(ttl_seconds=60)
+        user_id = uuid.uuid4()
+        load = Mock(return_value=_principal(user_id))
+
+        assert cache.get_or_load(user_id, load) == cache.get_or_load(user_id, load)
+        load.assert_called_once()
+
+    def test_invalidate_drops_the_entry(self):
+        cache = PrincipalCache(ttl_seconds=60)
+        user_id = uuid.uuid4()
+        cache.get_or_load(user_id, lambda: _principal(user_id))
+
+        cache.invalidate(user_id)
+
+        assert cache.get_or_load(user_id, lambda: _principal(user_id, Decimal("5"))).budget == Decimal("5")
+
+    def test_load_racing_with_a_write_is_not_served(self):
+        cache = PrincipalCache(ttl_seconds=60)
+        user_id = uuid.uuid4()
+
+        def load_during_write():
+            cache.invalidate(user_id)  # a write lands while the row is being read
+            return _principal(user_id)
+
+        cache.get_or_load(user_id, load_during_write)
+
+        assert cache.get_or_load(user_id, lambda: _principal(user_id, Decimal("5"))).budget == Decimal("5")
+
+    def test_entries_expire(self):
+        cache = PrincipalCache(ttl_seconds=10)
+        user_id = uuid.uuid4()
+        with patch("src.domains.users.principal_cache.time.monotonic", return_value=100.0):
+            cache.get_or_load(user_id, lambda: _principal(user_id))
+        with patch("src.domains.users.principal_cache.time.monotonic", return_value=111.0):
+            assert cache.get_or_load(user_id, lambda: _principal(user_id, Decimal("5"))).budget == Decimal("5")
+
+    def test_missing_user_is_not_cached(self):
+        cache = PrincipalCache(ttl_seconds=60)
+        user_id = uuid.uuid4()
+        cache.get_or_load(user_id, lambda: None)
+
+        assert cache.get_or_load(user_id, lambda: _principal(user_id)) is not None
+
+    def test_zero_ttl_disables_the_cache(self):
+        cache = PrincipalCache(ttl_seconds=0)
+        user_id = uuid.uuid4()
+        load = Mock(return_value=_principal(user_id))
+
+        cache.get_or_load(user_id, load)
+        cache.get_or_load(user_id, load)
+
+        assert load.call_count == 2
+
+
+    def test_invalidations_are_bounded_too(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+        for _ in range(100):
+            cache.invalidate(uuid.uuid4())
+
+        assert len(cache._entries) == 2
+
+    def test_eviction_does_not_reopen_the_race(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+        user_id = uuid.uuid4()
+
+        def load_during_write():
+            cache.invalidate(user_id)  # a write lands while the row is being read...
+            for other_id in (uuid.uuid4(), uuid.uuid4()):  # ...and its version is evicted before the row is stored
+                cache.get_or_load(other_id, lambda: _principal(other_id))
+            return _principal(user_id)
+
+        cache.get_or_load(user_id, load_during_write)
+
+        assert cache.get_or_load(user_id, lambda: _principal(user_id, Decimal("5"))).budget == Decimal("5")
+
+
+class TestUserRepositoryPrincipal:
+
+    @pytest.fixture
+    def user(self, db_session) -> User:
+        user = User(email="principal@example.com", password_hash="hash", name="Principal", is_verified=True)
+        db_session.add(user)
+        db_session.commit()
+        return user
+
+    @pytest.fixture
+    def other_session(self, db_engine):
+        """A second request on the same process."""
+        session = sessionmaker(bind=db_engine, expire_on_commit=False)()
+        yield session
+        session.close()
+
+    def test_one_load_per_transaction(self, db_session, user, count_queries):
+        repo = UserRepository(db_session)
+
+        with count_queries() as queries:
+            first = repo.get_principal(user.id)
+            second = repo.get_principal(user.id)
+
+        assert first is second
+        assert first.email == "principal@example.com"
+        assert len(queries) <= 1
+
+    def test_other_requests_are_served_from_the_process_cache(self, db_session, other_session, user, count_queries):
+        UserRepository(db_session).get_principal(user.id)
+        db_session.commit()
+
+        with count_queries() as queries:
+            principal = UserRepository(other_session).get_principal(user.id)
+
+        assert principal.id == user.id
+        assert queries == []
+
+    def test_user_write_invalidates(self, db_session, other_session, user):
+        UserRepository(other_session).get_principal(user.id)
+        other_session.commit()
+
+        repo = UserRepository(db_session)
+        repo.set_budget(user.id, Decimal("100"))
+        assert repo.get_principal(user.id).budget == Decimal("100")
+        db_session.commit()
+
+        assert UserRepository(other_session).get_principal(user.id).budget == Decimal("100")
+
+    def test_gift_spent_shift_invalidates(self, db_session, user):
+        repo = UserRepository(db_session)
+        repo.get_principal(user.id)
+        db_session.commit()
+
+        GiftRepository(db_session).create(Gift(
+            user_id=user.id, name="Gift", price=Decimal("4.50"), quantity=2, status=GiftStatusEnum.offert,
+        ))
+        db_session.commit()
+
+        assert repo.get_principal(user.id).spent == Decimal("9.00")
+
+    def test_replica_session_does_not_fill_the_process_cache(self, db_session, other_session, user):
+        other_session.info[REPLICA_INFO_KEY] = True
+        UserRepository(other_session).get_principal(user.id)
+        other_session.commit()
+
+        load = Mock(return_value=_principal(user.id, Decimal("5")))
+        assert principal_cache.get_or_load(user.id, load).budget == Decimal("5")
+        load.assert_called_once()
+
+    def test_principal_holds_no_secret(self, db_session, user):
+        principal = UserRepository(db_session).get_principal(user.id)
+
+        assert not hasattr(principal, "password_hash")
@@ -1,3 +1,8 @@
+import pytest
+from decimal import Decimal
+
+from src.domains.gifts.enums import GiftStatusEnum
+from src.domains.gifts.models import Gift
 from src.domains.users.repository import UserRepository
 from src.domains.users.models import User
 
@@ -202,3 +207,36 @@ class TestUserRepositorySetPassword:
         hash2 = created_user.password_hash
         
         assert hash1 != hash2
+
+
+class TestUserRepositorySpentReconciliation:
+
+    @pytest.fixture
+    def user_with_gifts(self, db_session):
+        user = User(email="spent@example.com", password_hash="hash", name="Spent User")
+        db_session.add(user)
+        db_session.flush()
+        db_session.add_all([
+            Gift(user_id=user.id, name="Bought", price=Decimal("10.00"), quantity=2, status=GiftStatusEnum.achete),
+            Gift(user_id=user.id, name="Idea", price=Decimal("99.00"), quantity=1, status=GiftStatusEnum.idee),
+            Gift(user_id=user.id, name="No price", quantity=1, status=GiftStatusEnum.livre),
+        ])
+        db_session.commit()
+        return user
+
+    def test_get_spent_drift_reports_users_written_around_the_repository(self, db_session, user_with_gifts):
+        drift = UserRepository(db_session).get_spent_drift()
+
+        assert drift == [(user_with_gifts.id, Decimal("0.00"), Decimal("20.00"))]
+
+    def test_get_spent_drift_is_empty_when_consistent(self, db_session, sample_user):
+        assert UserRepository(db_session).get_spent_drift() == []
+
+    def test_reconcile_spent_rewrites_the_stored_value(self, db_session, user_with_gifts):
+        repo = UserRepository(db_session)
+
+        repo.reconcile_spent([user_with_gifts.id])
+
+        db_session.refresh(user_with_gifts)
+        assert user_with_gifts.spent == Decimal("20.00")
+        assert repo.get_spent_drift() == []
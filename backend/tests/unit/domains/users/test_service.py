@@ -15,6 +15,7 @@ def _make_user(user_id=None, email="test@example.com", budget=None):
         name="Test User",
     )
     user.budget = budget
+    user.spent = Decimal("0.00")
     return user
 
 
@@ -26,8 +27,8 @@ class TestUserServiceUpdateBudget:
 
         user_id = uuid.uuid4()
         expected_user = _make_user(user_id=user_id, budget=Decimal("200.00"))
-        mock_repo.get_by_id.return_value = expected_user
-        mock_repo.get_spent_amount.return_value = Decimal("0.00")
+        mock_repo.set_budget.return_value = expected_user
+        expected_user.spent = Decimal("0.00")
 
         result = service.update_budget(user_id, Decimal("200.00"))
 
@@ -35,6 +36,7 @@ class TestUserServiceUpdateBudget:
         assert result.spent == Decimal("0.00")
         assert result.remaining == Decimal("200.00")
         mock_repo.set_budget.assert_called_once_with(user_id, Decimal("200.00"))
+        mock_repo.get_by_id.assert_not_called()
 
     def test_update_budget_replaces_existing(self):
         mock_repo = Mock()
@@ -42,8 +44,8 @@ class TestUserServiceUpdateBudget:
 
         user_id = uuid.uuid4()
         expected_user = _make_user(user_id=user_id, budget=Decimal("300.00"))
-        mock_repo.get_by_id.return_value = expected_user
-        mock_repo.get_spent_amount.return_value = Decimal("50.00")
+        mock_repo.set_budget.return_value = expected_user
+        expected_user.spent = Decimal("50.00")
 
         result = service.update_budget(user_id, Decimal("300.00"))
 
@@ -51,6 +53,7 @@ class TestUserServiceUpdateBudget:
         assert result.spent == Decimal("50.00")
         assert result.remaining == Decimal("250.00")
         mock_repo.set_budget.assert_called_once_with(user_id, Decimal("300.00"))
+        mock_repo.get_spent_amount.assert_not_called()
 
 
 class TestUserServiceDeleteBudget:
@@ -61,8 +64,8 @@ class TestUserServiceDeleteBudget:
 
         user_id = uuid.uuid4()
         expected_user = _make_user(user_id=user_id, budget=None)
-        mock_repo.get_by_id.return_value = expected_user
-        mock_repo.get_spent_amount.return_value = Decimal("25.00")
+        mock_repo.set_budget.return_value = expected_user
+        expected_user.spent = Decimal("25.00")
 
         result = service.delete_budget(user_id)
 
@@ -70,3 +73,29 @@ class TestUserServiceDeleteBudget:
         assert result.spent == Decimal("25.00")
         assert result.remaining is None
         mock_repo.set_budget.assert_called_once_with(user_id, None)
+
+
+class TestUserServiceName:
+
+    def test_update_name_builds_response_from_returned_row(self):
+        mock_repo = Mock()
+        service = UserService(mock_repo)
+
+        user_id = uuid.uuid4()
+        updated = _make_user(user_id=user_id, budget=Decimal("10.00"))
+        updated.name = "Renamed"
+        mock_repo.update_name.return_value = updated
+
+        result = service.update_name(user_id, "Renamed")
+
+        assert result.name == "Renamed"
+        assert result.remaining == Decimal("10.00")
+        mock_repo.update_name.assert_called_once_with(user_id, "Renamed")
+        mock_repo.get_by_id.assert_not_called()
+
+    def test_delete_name_for_missing_user_returns_none(self):
+        mock_repo = Mock()
+        service = UserService(mock_repo)
+        mock_repo.delete_name.return_value = None
+
+        assert service.delete_name(uuid.uuid4()) is None
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.infrastructure.database.pool_metrics import InstrumentedQueuePool, PoolWaitStats, pool_status
+
+
+@pytest.fixture
+def small_engine():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestPoolWaitStats:
+
+    def test_empty_snapshot(self):
+        snapshot = PoolWaitStats().snapshot()
+
+        assert snapshot["count"] == 0
+        assert snapshot["avg_ms"] == 0.0
+        assert snapshot["timeouts"] == 0
+
+    def test_observe_fills_matching_bucket(self):
+        stats = PoolWaitStats()
+        stats.observe(0.5)
+        stats.observe(7)
+        stats.observe(10_000)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot["count"] == 3
+        assert snapshot["histogram"]["le_1ms"] == 1
+        assert snapshot["histogram"]["le_10ms"] == 1
+        assert snapshot["histogram"]["inf"] == 1
+        assert snapshot["max_ms"] == 10_000
+
+
+class TestInstrumentedQueuePool:
+
+    def test_checkout_is_timed(self, small_engine):
+        with small_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        assert small_engine.pool.wait_stats.snapshot()["count"] == 1
+
+    def test_status_reports_checked_out_connections(self, small_engine):
+        with small_engine.connect():
+            status = pool_status(small_engine.pool)
+
+        assert status["pool_size"] == 1
+        assert status["checked_out"] == 1
+        assert status["overflow"] == 0
+
+    def test_timeout_is_counted(self, small_engine):
+        with small_engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                small_engine.connect()
+
+        assert small_engine.pool.wait_stats.snapshot()["timeouts"] == 1
@@ -0,0 +1,211 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import src.infrastructure.database.session as session_module
+from src.core.middlewares.read_your_writes import ReadYourWritesMiddleware
+from src.infrastructure.database.routing import is_replica_session
+from src.infrastructure.database.session import iterate_db, run_db, get_db, get_sync_db
+from src.infrastructure.database.base import Base
+from src.domains.users.models import User
+from src.domains.users.repository import UserRepository
+
+
+def _request(method: str = "POST", cookies: dict | None = None) -> Mock:
+    return Mock(method=method, cookies=cookies or {})
+
+
+class TestGetDb:
+
+    def test_sync_backend_is_default(self):
+        assert get_db is get_sync_db
+
+    def test_commits_once_when_the_endpoint_returns(self, monkeypatch):
+        db = Mock(spec=Session)
+        monkeypatch.setattr(session_module, "SessionLocal", lambda: db)
+
+        dependency = get_sync_db(_request())
+        assert next(dependency) is db
+        with pytest.raises(StopIteration):
+            next(dependency)
+
+        db.commit.assert_called_once()
+        db.rollback.assert_not_called()
+        db.close.assert_called_once()
+
+    def test_rolls_back_when_the_endpoint_raises(self, monkeypatch):
+        db = Mock(spec=Session)
+        monkeypatch.setattr(session_module, "SessionLocal", lambda: db)
+
+        dependency = get_sync_db(_request())
+        next(dependency)
+        with pytest.raises(ValueError):
+            dependency.throw(ValueError("boom"))
+
+        db.commit.assert_not_called()
+        db.rollback.assert_called_once()
+        db.close.assert_called_once()
+
+
+class TestReplicaRouting:
+
+    @pytest.fixture
+    def opened(self, monkeypatch):
+        """Bind of every session get_sync_db() opens (None = primary)."""
+        binds = []
+
+        def session_local(bind=None, info=None):
+            binds.append(bind)
+            return Mock(spec=Session, info=info or {})
+
+        monkeypatch.setattr(session_module, "SessionLocal", session_local)
+        monkeypatch.setattr(session_module, "replica_engines", ["replica-1", "replica-2"])
+        return binds
+
+    def _open(self, request):
+        dependency = get_sync_db(request)
+        next(dependency)
+        dependency.close()
+
+    def test_safe_methods_read_from_the_replicas_in_turn(self, opened):
+        for _ in range(4):
+            self._open(_request("GET"))
+
+        assert sorted(opened) == ["replica-1", "replica-1", "replica-2", "replica-2"]
+        assert opened[0] != opened[1]
+
+    def test_writes_use_the_primary(self, opened):
+        for method in ("POST", "PATCH", "PUT", "DELETE"):
+            self._open(_request(method))
+
+        assert opened == [None] * 4
+
+    def test_reads_stay_on_the_primary_right_after_a_write(self, opened):
+        self._open(_request("GET", {"db_primary_until": str(time.time() + 5)}))
+        self._open(_request("GET", {"db_primary_until": str(time.time() - 1)}))
+        self._open(_request("GET", {"db_primary_until": "garbage"}))
+
+        assert opened[0] is None
+        assert opened[1] is not None and opened[2] is not None
+
+    def test_replica_sessions_are_marked(self, opened):
+        sessions = []
+        for method in ("GET", "POST"):
+            dependency = get_sync_db(_request(method))
+            sessions.append(next(dependency))
+            dependency.close()
+
+        assert [is_replica_session(db) for db in sessions] == [True, False]
+
+    def test_everything_uses_the_primary_without_replicas(self, opened, monkeypatch):
+        monkeypatch.setattr(session_module, "replica_engines", [])
+
+        self._open(_request("GET"))
+
+        assert opened == [None]
+
+
+class TestReadYourWritesMiddleware:
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_middleware(ReadYourWritesMiddleware)
+
+        @app.get("/items")
+        def read():
+            return {}
+
+        @app.post("/items")
+        def write(fail: bool = False):
+            if fail:
+                raise HTTPException(status_code=422)
+            return {}
+
+        return TestClient(app)
+
+    def test_successful_write_pins_reads_to_the_primary(self, client):
+        before = time.time()
+
+        response = client.post("/items")
+
+        primary_until = float(response.cookies["db_primary_until"])
+        assert before < primary_until <= time.time() + session_module.settings.DATABASE_READ_YOUR_WRITES_SECONDS
+        assert "httponly" in response.headers["set-cookie"].lower()
+
+    def test_reads_and_failed_writes_set_no_cookie(self, client):
+        assert "set-cookie" not in client.get("/items").headers
+        assert "set-cookie" not in client.post("/items?fail=true").headers
+
+
+class TestRunDb:
+
+    @pytest.mark.asyncio
+    async def test_run_db_sync_mode_runs_in_worker_thread(self, monkeypatch):
+        monkeypatch.setattr(session_module.settings, "DATABASE_ASYNC", False)
+        loop_thread = threading.get_ident()
+
+        result = await run_db(threading.get_ident)
+
+        assert result != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_run_db_forwards_args_and_kwargs(self, monkeypatch):
+        monkeypatch.setattr(session_module.settings, "DATABASE_ASYNC", False)
+
+        def add(a, b, *, c):
+            return a + b + c
+
+        assert await run_db(add, 1, 2, c=3) == 6
+
+    @pytest.mark.asyncio
+    async def test_iterate_db_steps_the_iterator_off_the_event_loop(self, monkeypatch):
+        monkeypatch.setattr(session_module.settings, "DATABASE_ASYNC", False)
+        loop_thread = threading.get_ident()
+
+        def batches():
+            for batch in ([1, 2], [3]):
+                yield batch, threading.get_ident()
+
+        steps = [step async for step in iterate_db(batches())]
+
+        assert [batch for batch, _ in steps] == [[1, 2], [3]]
+        assert all(thread != loop_thread for _, thread in steps)
+
+    @pytest.mark.asyncio
+    async def test_run_db_async_mode_drives_sync_repository(self, monkeypatch):
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        monkeypatch.setattr(session_module.settings, "DATABASE_ASYNC", True)
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with async_sessionmaker(engine, expire_on_commit=False)() as async_session:
+            repo = UserRepository(async_session.sync_session)
+            created = await run_db(repo.create, User(email="async@example.com", password_hash="hash"))
+            fetched = await run_db(repo.get_by_email, "async@example.com")
+
+        await engine.dispose()
+        assert fetched.id == created.id
+
+    @pytest.mark.asyncio
+    async def test_sync_session_io_outside_run_db_fails_in_async_mode(self):
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.exc import MissingGreenlet
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with async_sessionmaker(engine)() as async_session:
+            sync_session: Session = async_session.sync_session
+            with pytest.raises(MissingGreenlet):
+                sync_session.execute(select(1))
+
+        await engine.dispose()
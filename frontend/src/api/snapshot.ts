@@ -0,0 +1,84 @@
+import api from ".";
+import type { Gift, GiftStatus } from "@/api/gifts";
+import type { Recipient } from "@/api/recipients";
+
+export interface SnapshotGift {
+  id: string;
+  name: string;
+  url: string | null;
+  price: string | null;
+  status: GiftStatus;
+  quantity: number;
+}
+
+export interface SnapshotRecipient {
+  id: string;
+  name: string;
+  notes: string | null;
+}
+
+export interface Snapshot {
+  gifts: SnapshotGift[];
+  recipients: SnapshotRecipient[];
+  links: [giftId: string, recipientId: string][];
+}
+
+/**
+ * Rebuild full gifts and recipients (with their recipient_ids / gift_ids) from a snapshot,
+ * where each gift-recipient link is sent only once.
+ */
+export function expandSnapshot(
+  snapshot: Snapshot,
+  userId: string,
+): { gifts: Gift[]; recipients: Recipient[] } {
+  const recipientIds = new Map<string, string[]>();
+  const giftIds = new Map<string, string[]>();
+  const append = (map: Map<string, string[]>, key: string, value: string) => {
+    const values = map.get(key);
+    if (values) {
+      values.push(value);
+    } else {
+      map.set(key, [value]);
+    }
+  };
+  for (const [giftId, recipientId] of snapshot.links) {
+    append(recipientIds, giftId, recipientId);
+    append(giftIds, recipientId, giftId);
+  }
+
+  return {
+    gifts: snapshot.gifts.map((gift) => ({
+      ...gift,
+      user_id: userId,
+      recipient_ids: recipientIds.get(gift.id) ?? [],
+    })),
+    recipients: snapshot.recipients.map((recipient) => ({
+      ...recipient,
+      user_id: userId,
+      gift_ids: giftIds.get(recipient.id) ?? [],
+    })),
+  };
+}
+
+// The gifts and recipients stores both load from the snapshot on the same page: they share one request
+let pendingSnapshot: Promise<Snapshot> | null = null;
+
+export const snapshotApi = {
+  /**
+   * Everything the user owns in one request.
+   * The response carries an ETag with `Cache-Control: no-cache`: the browser revalidates it
+   * with If-None-Match and reuses its cached copy on 304.
+   * Calls made while a request is in flight get its result instead of sending another one.
+   */
+  get(): Promise<Snapshot> {
+    if (!pendingSnapshot) {
+      pendingSnapshot = api
+        .get<Snapshot>("/snapshot")
+        .then((response) => response.data)
+        .finally(() => {
+          pendingSnapshot = null;
+        });
+    }
+    return pendingSnapshot;
+  },
+};
@@ -4,6 +4,8 @@ import { defineStore } from "pinia";
 import { type FetchParams } from "@/api";
 import { giftsApi, type Gift, type GiftCreate, type GiftUpdate } from "@/api/gifts";
 import type { PaginationMeta } from "@/api/index";
+import { expandSnapshot, snapshotApi } from "@/api/snapshot";
+import { useAuthStore } from "@/stores/auth";
 
 export const useGiftsStore = defineStore("gifts", () => {
   // State
@@ -23,23 +25,18 @@ export const useGiftsStore = defineStore("gifts", () => {
   }
 
   /**
-   * Fetch every gift by paging through the backend.
+   * Fetch every gift in a single request, from the user's snapshot.
    * Results are stored in `allGifts` (separate from `paginatedGifts`).
    */
   async function fetchAll(): Promise<void> {
-    const pageSize = 100;
-    let page = 1;
-    let all: Gift[] = [];
-    let totalPages = 1;
-
-    do {
-      const response = await giftsApi.getAll({ page, limit: pageSize });
-      all = all.concat(response.items);
-      totalPages = response.meta.totalPages;
-      page++;
-    } while (page <= totalPages);
-
-    allGifts.value = all;
+    // The snapshot is the signed-in user's: nothing to load before the user is known
+    const userId = useAuthStore().user?.id;
+    if (!userId) {
+      allGifts.value = [];
+      return;
+    }
+    const snapshot = await snapshotApi.get();
+    allGifts.value = expandSnapshot(snapshot, userId).gifts;
   }
 
   /**
@@ -8,6 +8,8 @@ import {
   type RecipientCreate,
   type RecipientUpdate,
 } from "@/api/recipients";
+import { expandSnapshot, snapshotApi } from "@/api/snapshot";
+import { useAuthStore } from "@/stores/auth";
 
 export const useRecipientsStore = defineStore("recipients", () => {
   // State
@@ -27,23 +29,18 @@ export const useRecipientsStore = defineStore("recipients", () => {
   }
 
   /**
-   * Fetch every recipient by paging through the backend.
+   * Fetch every recipient in a single request, from the user's snapshot.
    * Results are stored in `allRecipients` (separate from `paginatedRecipients`).
    */
   async function fetchAll(): Promise<void> {
-    const pageSize = 100;
-    let page = 1;
-    let all: Recipient[] = [];
-    let totalPages = 1;
-
-    do {
-      const response = await recipientsApi.getAll({ page, limit: pageSize });
-      all = all.concat(response.items);
-      totalPages = response.meta.totalPages;
-      page++;
-    } while (page <= totalPages);
-
-    allRecipients.value = all;
+    // The snapshot is the signed-in user's: nothing to load before the user is known
+    const userId = useAuthStore().user?.id;
+    if (!userId) {
+      allRecipients.value = [];
+      return;
+    }
+    const snapshot = await snapshotApi.get();
+    allRecipients.value = expandSnapshot(snapshot, userId).recipients;
   }
 
   /**